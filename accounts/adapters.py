@@ -1,4 +1,5 @@
 from allauth.socialaccount.adapter import DefaultSocialAccountAdapter
+from django.db import transaction
 from .models import FreelancerProfile
 
 
@@ -7,21 +8,22 @@ class CustomSocialAccountAdapter(DefaultSocialAccountAdapter):
         """
         Save user and create a default profile
         """
-        user = super().save_user(request, sociallogin, form)
-        
-        # Set default user type as freelancer for Google OAuth users
-        if sociallogin.account.provider == 'google':
-            user.user_type = 'freelancer'
-            user.save()
+        with transaction.atomic():
+            user = super().save_user(request, sociallogin, form)
             
-            # Create freelancer profile if it doesn't exist
-            if not hasattr(user, 'freelancerprofile'):
-                FreelancerProfile.objects.create(
-                    user=user,
-                    skills="",
-                    hourly_rate=0,
-                    experience_years=0
-                )
+            # Set default user type as freelancer for Google OAuth users
+            if sociallogin.account.provider == 'google':
+                user.user_type = 'freelancer'
+                user.save()
+                
+                # Create freelancer profile if it doesn't exist
+                if not hasattr(user, 'freelancer_profile'):
+                    FreelancerProfile.objects.create(
+                        user=user,
+                        skills="",
+                        hourly_rate=0,
+                        experience_years=0
+                    )
         
         return user
     
@@ -17,6 +17,7 @@ class CustomUserAdmin(UserAdmin):
 class FreelancerProfileAdmin(admin.ModelAdmin):
     list_display = ['user', 'hourly_rate', 'experience_years', 'rating', 'completed_projects']
     list_filter = ['experience_years', 'rating']
+    readonly_fields = ['canonical_skills', 'rating', 'rating_sum', 'rating_count', 'completed_projects']
 
 @admin.register(RecruiterProfile)
 class RecruiterProfileAdmin(admin.ModelAdmin):
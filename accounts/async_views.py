@@ -0,0 +1,63 @@
+from rest_framework.response import Response
+from jobs.async_api import AsyncReadView
+from jobs.cache import cache_response
+from jobs.conditional import alist_validators, conditional
+from jobs.pagination import AsyncPageNumberPagination
+from jobs.skills import afilter_by_skills
+from .models import User, FreelancerProfile
+from .serializers import UserSerializer, FreelancerProfileSerializer, RecruiterProfileSerializer
+from .views import freelancer_list_queryset, profile_etag, profile_queryset
+
+
+async def freelancer_queryset(request):
+    queryset = freelancer_list_queryset(request.query_params)
+    skills = request.query_params.get('skills', None)
+    if skills:
+        queryset = await afilter_by_skills(queryset, skills)
+    return queryset
+
+
+async def profile_validators(view, request, *args, **kwargs):
+    profile_row = await profile_queryset(request.user).values_list('pk', 'updated_at').afirst()
+    return profile_etag(request.user, profile_row)
+
+
+async def freelancer_list_validators(view, request, *args, **kwargs):
+    return await alist_validators(request, await freelancer_queryset(request), models=(User,))
+
+class ProfileView(AsyncReadView):
+    """
+    Async ``GET /api/accounts/profile/``, matching accounts.views.ProfileView
+    """
+    authenticated_only = True
+    
+    @conditional(profile_validators)
+    async def get(self, request):
+        user = request.user
+        profile = await profile_queryset(user).afirst()
+        profile_data = None
+        if profile is not None:
+            profile.user = user
+            if isinstance(profile, FreelancerProfile):
+                profile_data = FreelancerProfileSerializer(profile).data
+            else:
+                profile_data = RecruiterProfileSerializer(profile).data
+        
+        return Response({
+            'user': UserSerializer(user).data,
+            'profile': profile_data
+        })
+
+class FreelancerProfileListView(AsyncReadView):
+    """
+    Async ``GET /api/accounts/freelancer-profiles/``, matching
+    FreelancerProfileViewSet.list
+    """
+    
+    @conditional(freelancer_list_validators, use_last_modified=False)
+    @cache_response(FreelancerProfile, User)
+    async def get(self, request):
+        paginator = AsyncPageNumberPagination()
+        page = await paginator.apaginate_queryset(await freelancer_queryset(request), request, view=self)
+        serializer = FreelancerProfileSerializer(page, many=True, context={'request': request})
+        return paginator.get_paginated_response(serializer.data)
@@ -0,0 +1,19 @@
+# Generated by Django 5.2.4 on 2026-10-18 19:26
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('accounts', '0001_initial'),
+        ('jobs', '0003_skill_taxonomy'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='freelancerprofile',
+            name='canonical_skills',
+            field=models.ManyToManyField(blank=True, related_name='freelancers', to='jobs.skill'),
+        ),
+    ]
@@ -0,0 +1,32 @@
+# Generated by Django 5.2.4 on 2026-10-18 19:39
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('accounts', '0003_profile_updated_at'),
+        ('jobs', '0005_job_job_created_id_idx'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='freelancerprofile',
+            name='rating_count',
+            field=models.PositiveIntegerField(default=0),
+        ),
+        migrations.AddField(
+            model_name='freelancerprofile',
+            name='rating_sum',
+            field=models.PositiveIntegerField(default=0),
+        ),
+        migrations.AddIndex(
+            model_name='freelancerprofile',
+            index=models.Index(fields=['-rating', 'id'], name='freelancer_rating_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='freelancerprofile',
+            index=models.Index(fields=['-completed_projects', 'id'], name='freelancer_completed_idx'),
+        ),
+    ]
@@ -11,6 +11,9 @@ class User(AbstractUser):
     user_type = models.CharField(max_length=20, choices=USER_TYPES)
     phone = models.CharField(max_length=15, blank=True)
     profile_picture = models.ImageField(upload_to='profile_pics/', blank=True, null=True)
+    # {size: {format: stored name}} of the picture's thumbnails, written by
+    # the task accounts.thumbnails runs after an upload
+    profile_picture_variants = models.JSONField(default=dict, blank=True, editable=False)
     bio = models.TextField(max_length=500, blank=True)
     location = models.CharField(max_length=100, blank=True)
     website = models.URLField(blank=True)
@@ -20,12 +23,24 @@ class User(AbstractUser):
 class FreelancerProfile(models.Model):
     user = models.OneToOneField(User, on_delete=models.CASCADE, related_name='freelancer_profile')
     skills = models.TextField(help_text="Comma-separated skills")
+    canonical_skills = models.ManyToManyField('jobs.Skill', related_name='freelancers', blank=True)
     hourly_rate = models.DecimalField(max_digits=10, decimal_places=2, null=True, blank=True)
     experience_years = models.IntegerField(default=0)
     portfolio_url = models.URLField(blank=True)
     resume = models.FileField(upload_to='resumes/', blank=True, null=True)
+    # rating, rating_sum, rating_count and completed_projects are maintained
+    # by applications.stats from reviews and completed jobs
     rating = models.DecimalField(max_digits=3, decimal_places=2, default=0.00)
+    rating_sum = models.PositiveIntegerField(default=0)
+    rating_count = models.PositiveIntegerField(default=0)
     completed_projects = models.IntegerField(default=0)
+    updated_at = models.DateTimeField(auto_now=True)
+    
+    class Meta:
+        indexes = [
+            models.Index(fields=['-rating', 'id'], name='freelancer_rating_idx'),
+            models.Index(fields=['-completed_projects', 'id'], name='freelancer_completed_idx'),
+        ]
     
     def __str__(self):
         return f"{self.user.username} - Freelancer"
@@ -37,6 +52,7 @@ class RecruiterProfile(models.Model):
     industry = models.CharField(max_length=100, blank=True)
     company_description = models.TextField(blank=True)
     verified = models.BooleanField(default=False)
+    updated_at = models.DateTimeField(auto_now=True)
     
     def __str__(self):
         return f"{self.user.username} - {self.company_name}"
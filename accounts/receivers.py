@@ -0,0 +1,68 @@
+"""
+Model signal receivers for accounts, connected in ``AccountsConfig.ready()``.
+
+The social login handlers in ``accounts.signals`` are not loaded.
+"""
+from django.db.models.signals import post_delete, post_init, post_save, pre_save
+from django.dispatch import receiver
+from jobs import matching
+from jobs.skills import sync_skills
+from .models import FreelancerProfile, User
+from .tasks import delete_profile_picture_variants, generate_profile_picture_variants
+
+def _picture_name(instance):
+    # Read from __dict__ so a deferred field is not fetched
+    value = instance.__dict__.get('profile_picture')
+    return getattr(value, 'name', value) or ''
+
+@receiver(post_init, sender=User)
+def remember_profile_picture(sender, instance, **kwargs):
+    instance._stored_picture = _picture_name(instance)
+
+@receiver(pre_save, sender=User)
+def remember_replaced_variants(sender, instance, update_fields=None, **kwargs):
+    # The stored map: the variants task may have set it after this copy was read
+    instance._replaced_variants = {}
+    if instance.pk is None or (update_fields and 'profile_picture' not in update_fields):
+        return
+    if _picture_name(instance) != instance._stored_picture:
+        instance._replaced_variants = User.objects.filter(pk=instance.pk).values_list(
+            'profile_picture_variants', flat=True
+        ).first() or {}
+
+@receiver(post_save, sender=User)
+def queue_profile_picture_variants(sender, instance, update_fields=None, **kwargs):
+    """
+    Drop the old thumbnails and render new ones in the background when the
+    picture changes
+    """
+    if update_fields and 'profile_picture' not in update_fields:
+        return
+    name = _picture_name(instance)
+    if name == instance._stored_picture:
+        return
+    instance._stored_picture = name
+    if instance.profile_picture_variants or instance._replaced_variants:
+        instance.profile_picture_variants = {}
+        User.objects.filter(pk=instance.pk).update(profile_picture_variants={})
+    if instance._replaced_variants:
+        delete_profile_picture_variants.delay(variants=instance._replaced_variants)
+    if name:
+        generate_profile_picture_variants.delay(user_id=instance.pk, name=name)
+
+@receiver(post_save, sender=FreelancerProfile)
+def sync_freelancer_skills(sender, instance, update_fields=None, **kwargs):
+    if update_fields and 'skills' not in update_fields:
+        return
+    sync_skills(instance, instance.skills)
+
+@receiver(post_save, sender=FreelancerProfile)
+def refresh_matching_pool(sender, instance, **kwargs):
+    """
+    Runs after sync_freelancer_skills so the pool sees the updated skill links
+    """
+    matching.refresh_profile(instance)
+
+@receiver(post_delete, sender=FreelancerProfile)
+def remove_from_matching_pool(sender, instance, **kwargs):
+    matching.forget_profile(instance.pk)
@@ -1,14 +1,23 @@
 from rest_framework import serializers
 from django.contrib.auth import authenticate
+from django.db import transaction
 from .models import User, FreelancerProfile, RecruiterProfile
+from .thumbnails import variant_urls
 
 class UserSerializer(serializers.ModelSerializer):
+    # Thumbnail URLs by size and format; empty until they have been rendered
+    profile_picture_variants = serializers.SerializerMethodField()
+    
     class Meta:
         model = User
         fields = ['id', 'username', 'email', 'first_name', 'last_name', 'user_type', 
-                 'phone', 'profile_picture', 'bio', 'location', 'website', 'date_joined']
+                 'phone', 'profile_picture', 'profile_picture_variants', 'bio', 'location', 'website',
+                 'date_joined']
         read_only_fields = ['id', 'date_joined']
 
+    def get_profile_picture_variants(self, user):
+        return variant_urls(user.profile_picture_variants, self.context.get('request'))
+
 class RegisterSerializer(serializers.ModelSerializer):
     password = serializers.CharField(write_only=True)
     password_confirm = serializers.CharField(write_only=True)
@@ -26,13 +35,15 @@ class RegisterSerializer(serializers.ModelSerializer):
     def create(self, validated_data):
         validated_data.pop('password_confirm')
         password = validated_data.pop('password')
-        user = User.objects.create_user(password=password, **validated_data)
-        
-        # Create profile based on user type
-        if user.user_type == 'freelancer':
-            FreelancerProfile.objects.create(user=user)
-        elif user.user_type == 'recruiter':
-            RecruiterProfile.objects.create(user=user, company_name='')
+        # The profile commits with the user or not at all
+        with transaction.atomic():
+            user = User.objects.create_user(password=password, **validated_data)
+            
+            # Create profile based on user type
+            if user.user_type == 'freelancer':
+                FreelancerProfile.objects.create(user=user)
+            elif user.user_type == 'recruiter':
+                RecruiterProfile.objects.create(user=user, company_name='')
         
         return user
 
@@ -60,7 +71,17 @@ class FreelancerProfileSerializer(serializers.ModelSerializer):
     
     class Meta:
         model = FreelancerProfile
-        fields = '__all__'
+        exclude = ['canonical_skills', 'rating_sum']
+        # Maintained from reviews and completed jobs (applications.stats)
+        read_only_fields = ['rating', 'rating_count', 'completed_projects']
+    
+    def update(self, instance, validated_data):
+        # Write only the submitted columns: the aggregates are adjusted with
+        # F() updates, which saving this copy's stale values would undo
+        for attr, value in validated_data.items():
+            setattr(instance, attr, value)
+        instance.save(update_fields=[*validated_data, 'updated_at'])
+        return instance
 
 class RecruiterProfileSerializer(serializers.ModelSerializer):
     user = UserSerializer(read_only=True)
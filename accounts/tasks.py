@@ -0,0 +1,34 @@
+from django.core.files.storage import default_storage
+from django.utils import timezone
+from jobs.cache import bump_generation
+from taskqueue.queue import task
+from .models import User
+from .thumbnails import store_variants
+
+
+@task
+def generate_profile_picture_variants(user_id, name):
+    """
+    Thumbnails of an uploaded profile picture, unless it has been replaced since
+    """
+    user = User.objects.filter(pk=user_id, profile_picture=name).first()
+    if user is None:
+        return
+    variants = store_variants(user.profile_picture)
+    User.objects.filter(pk=user_id, profile_picture=name).update(
+        profile_picture_variants=variants, updated_at=timezone.now()
+    )
+    # Signals don't see update(); serialized users embed the variants
+    bump_generation(User)
+
+
+@task
+def delete_profile_picture_variants(variants):
+    """
+    Delete a replaced picture's thumbnails, except those a user's current
+    variants still name: identical pictures share their files
+    """
+    for size, formats in variants.items():
+        for format_name, name in formats.items():
+            if not User.objects.filter(**{f'profile_picture_variants__{size}__{format_name}': name}).exists():
+                default_storage.delete(name)
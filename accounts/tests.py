@@ -1,3 +1,155 @@
-from django.test import TestCase
+import shutil
+import tempfile
+from decimal import Decimal
+from io import BytesIO
+from unittest import mock
+from urllib.parse import urlsplit
 
-# Create your tests here.
+from django.core.files.storage import default_storage
+from django.core.files.uploadedfile import SimpleUploadedFile
+from django.db.models import F
+from django.test import RequestFactory, TestCase, override_settings
+from django.urls import Resolver404, resolve
+from PIL import Image
+from applications.stats import adjust_rating
+from jobs.testing import QueryBudgetMixin
+from taskqueue.models import Task
+from taskqueue.queue import run_pending
+from .models import User, FreelancerProfile, RecruiterProfile
+from .serializers import FreelancerProfileSerializer, RegisterSerializer
+from .thumbnails import VARIANT_DIR
+from .views import profile_picture_variant
+
+
+class ProfileQueryBudgetTests(QueryBudgetMixin, TestCase):
+    @classmethod
+    def setUpTestData(cls):
+        for i in range(25):
+            freelancer = User.objects.create(username=f'freelancer{i}', user_type='freelancer')
+            FreelancerProfile.objects.create(user=freelancer, skills='Python, Django', hourly_rate=50)
+            recruiter = User.objects.create(username=f'recruiter{i}', user_type='recruiter')
+            RecruiterProfile.objects.create(user=recruiter, company_name=f'Company {i}')
+        cls.freelancer = User.objects.get(username='freelancer0')
+
+    def test_freelancer_profile_list(self):
+        self.assertQueryBudget('/api/accounts/freelancer-profiles/', 3, variants=({}, {'page': 2}))
+
+    def test_freelancer_profile_list_filtered_by_skills(self):
+        self.assertQueryBudget('/api/accounts/freelancer-profiles/', 5, params={'skills': 'django'},
+                               variants=({}, {'page': 2}))
+
+    def test_recruiter_profile_list(self):
+        self.assertQueryBudget('/api/accounts/recruiter-profiles/', 3, variants=({}, {'page': 2}))
+
+    def test_profile(self):
+        self.client.force_login(self.freelancer)
+        with self.assertNumQueries(4):
+            response = self.client.get('/api/accounts/profile/')
+        self.assertEqual(response.status_code, 200)
+
+
+def png_upload(name, color):
+    buffer = BytesIO()
+    Image.new('RGBA', (300, 200), color).save(buffer, 'PNG')
+    return SimpleUploadedFile(name, buffer.getvalue(), content_type='image/png')
+
+
+class ProfilePictureVariantTests(TestCase):
+    def setUp(self):
+        self.media_root = tempfile.mkdtemp()
+        self.addCleanup(shutil.rmtree, self.media_root, ignore_errors=True)
+        settings_override = override_settings(MEDIA_ROOT=self.media_root)
+        settings_override.enable()
+        self.addCleanup(settings_override.disable)
+        self.user = User.objects.create(username='pictured', user_type='freelancer')
+
+    def upload(self, name, color):
+        self.user.profile_picture = png_upload(name, color)
+        self.user.save()
+
+    def test_variants_rendered_in_background(self):
+        self.upload('me.png', (200, 0, 0, 128))
+        self.user.refresh_from_db()
+        self.assertEqual(self.user.profile_picture_variants, {})
+        self.assertTrue(Task.objects.filter(name__endswith='generate_profile_picture_variants').exists())
+
+        run_pending()
+        self.client.force_login(self.user)
+        variants = self.client.get('/api/accounts/profile/').json()['user']['profile_picture_variants']
+        self.assertEqual(set(variants), {'small', 'medium', 'large'})
+        self.assertEqual(set(variants['small']), {'webp', 'jpeg'})
+
+        # Served by Django only in development
+        url = urlsplit(variants['small']['jpeg']).path
+        with self.assertRaises(Resolver404):
+            resolve(url)
+        response = profile_picture_variant(RequestFactory().get(url), url.split(f'{VARIANT_DIR}/')[1])
+        self.assertEqual(response.status_code, 200)
+        self.assertIn('immutable', response['Cache-Control'])
+        self.assertIn('max-age=31536000', response['Cache-Control'])
+        with Image.open(BytesIO(b''.join(response.streaming_content))) as image:
+            self.assertEqual((image.format, image.size), ('JPEG', (80, 80)))
+
+    def test_new_picture_replaces_variants(self):
+        self.upload('first.png', (200, 0, 0, 255))
+        run_pending()
+        self.user.refresh_from_db()
+        first = self.user.profile_picture_variants['large']['webp']
+
+        self.upload('second.png', (0, 0, 200, 255))
+        self.user.refresh_from_db()
+        self.assertEqual(self.user.profile_picture_variants, {})
+        run_pending()
+        self.user.refresh_from_db()
+        self.assertNotEqual(self.user.profile_picture_variants['large']['webp'], first)
+        self.assertFalse(default_storage.exists(first))
+
+    def test_shared_variants_outlive_one_owner(self):
+        other = User.objects.create(username='twin', user_type='freelancer')
+        other.profile_picture = png_upload('same.png', (200, 0, 0, 255))
+        other.save()
+        self.upload('first.png', (200, 0, 0, 255))
+        run_pending()
+        other.refresh_from_db()
+        shared = other.profile_picture_variants['large']['webp']
+
+        self.upload('second.png', (0, 0, 200, 255))
+        run_pending()
+        self.assertTrue(default_storage.exists(shared))
+
+
+class RegistrationTests(TestCase):
+    data = {'username': 'newcomer', 'email': 'newcomer@example.com', 'password': 'Sekret-123',
+            'password_confirm': 'Sekret-123', 'user_type': 'freelancer'}
+
+    def test_profile_is_created_with_the_user(self):
+        response = self.client.post('/api/accounts/register/', self.data)
+        self.assertEqual(response.status_code, 201)
+        user = User.objects.get(username='newcomer')
+        self.assertTrue(FreelancerProfile.objects.filter(user=user).exists())
+
+    def test_user_and_profile_commit_together(self):
+        serializer = RegisterSerializer(data=self.data)
+        self.assertTrue(serializer.is_valid())
+        with mock.patch('accounts.models.FreelancerProfile.objects.create', side_effect=RuntimeError):
+            with self.assertRaises(RuntimeError):
+                serializer.save()
+        self.assertFalse(User.objects.filter(username='newcomer').exists())
+
+
+class FreelancerProfileUpdateTests(TestCase):
+    def test_update_keeps_concurrent_aggregate_changes(self):
+        user = User.objects.create(username='freelancer', user_type='freelancer')
+        profile = FreelancerProfile.objects.create(user=user, skills='Python', experience_years=2)
+        serializer = FreelancerProfileSerializer(profile, data={'hourly_rate': '40.00', 'rating': '1.00'},
+                                                 partial=True)
+        self.assertTrue(serializer.is_valid())
+        # A review lands between the request loading the profile and saving it
+        adjust_rating(user.pk, 5, 1)
+        FreelancerProfile.objects.filter(pk=profile.pk).update(completed_projects=F('completed_projects') + 1)
+        serializer.save()
+
+        profile.refresh_from_db()
+        self.assertEqual(profile.hourly_rate, Decimal('40.00'))
+        self.assertEqual((profile.rating_sum, profile.rating_count, profile.rating, profile.completed_projects),
+                         (5, 1, Decimal('5.00'), 1))
@@ -0,0 +1,104 @@
+"""
+Resized profile picture variants.
+
+A background task renders every uploaded profile picture as square WebP
+and JPEG thumbnails in a few sizes, under names derived from a hash of the
+original's bytes (``profile_pics/variants/<hash>-<size>.<format>``). A name
+always holds the same image, so the files can be served with a year-long,
+immutable ``Cache-Control`` (by the web server or storage in production, see
+the README) and never need purging; a new upload simply gets new names,
+and the replaced picture's files are deleted unless another user's picture
+is the same image. ``User.profile_picture_variants`` maps size and format to
+the stored names, and ``UserSerializer`` turns it into URLs.
+"""
+import hashlib
+from io import BytesIO
+
+from django.core.files.base import ContentFile
+from django.core.files.storage import default_storage
+from PIL import Image, ImageOps
+
+VARIANT_DIR = 'profile_pics/variants'
+
+# Square edge in pixels; small fits the 80px avatars, medium is its 2x
+VARIANT_SIZES = {
+    'small': 80,
+    'medium': 160,
+    'large': 320,
+}
+
+# Format, file extension and encoder options
+VARIANT_FORMATS = {
+    'webp': ('WEBP', 'webp', {'quality': 80, 'method': 6}),
+    'jpeg': ('JPEG', 'jpg', {'quality': 85, 'optimize': True, 'progressive': True}),
+}
+
+# Variant files never change under a name, so clients may keep them for a year
+VARIANT_MAX_AGE = 365 * 24 * 60 * 60
+
+
+def content_hash(data):
+    return hashlib.sha256(data).hexdigest()[:16]
+
+
+def _flatten(image):
+    # JPEG has no alpha channel; lay transparent pictures on white
+    if image.mode in ('RGBA', 'LA') or (image.mode == 'P' and 'transparency' in image.info):
+        image = image.convert('RGBA')
+        background = Image.new('RGB', image.size, 'white')
+        background.paste(image, mask=image.getchannel('A'))
+        return background
+    return image.convert('RGB')
+
+
+def render_variants(data):
+    """
+    ``{size: {format: (file name, bytes)}}`` for an image's bytes, named by
+    their hash.
+    """
+    digest = content_hash(data)
+    with Image.open(BytesIO(data)) as original:
+        original.load()
+        image = _flatten(ImageOps.exif_transpose(original))
+    variants = {}
+    for size, edge in VARIANT_SIZES.items():
+        # Centre crop to a square, as avatars are shown
+        thumbnail = ImageOps.fit(image, (edge, edge), Image.LANCZOS)
+        variants[size] = {}
+        for name, (pil_format, extension, options) in VARIANT_FORMATS.items():
+            buffer = BytesIO()
+            thumbnail.save(buffer, pil_format, **options)
+            variants[size][name] = (f'{VARIANT_DIR}/{digest}-{size}.{extension}', buffer.getvalue())
+    return variants
+
+
+def store_variants(picture):
+    """
+    Render and save the variants of an uploaded picture, returning
+    ``{size: {format: stored name}}``. Files already stored under their name
+    are kept as they are.
+    """
+    with picture.open('rb') as f:
+        data = f.read()
+    stored = {}
+    for size, formats in render_variants(data).items():
+        stored[size] = {}
+        for name, (path, content) in formats.items():
+            if not default_storage.exists(path):
+                path = default_storage.save(path, ContentFile(content))
+            stored[size][name] = path
+    return stored
+
+
+def variant_urls(variants, request=None):
+    """
+    The variant map with stored names replaced by URLs, absolute when a
+    request is given.
+    """
+    urls = {}
+    for size, formats in (variants or {}).items():
+        urls[size] = {}
+        for name, path in formats.items():
+            url = default_storage.url(path)
+            urls[size][name] = request.build_absolute_uri(url) if request is not None else url
+    return urls
@@ -1,6 +1,7 @@
+from django.conf import settings
 from django.urls import path, include
 from rest_framework.routers import DefaultRouter
-from . import views
+from . import async_views, views
 
 router = DefaultRouter()
 router.register(r'users', views.UserViewSet)
@@ -14,3 +15,13 @@ urlpatterns = [
     path('logout/', views.LogoutView.as_view(), name='logout'),
     path('profile/', views.ProfileView.as_view(), name='profile'),
 ]
+
+if settings.ASYNC_READ_VIEWS:
+    # Async GETs ahead of the router; other methods reach the same views
+    urlpatterns = [
+        path('freelancer-profiles/', async_views.FreelancerProfileListView.as_view(
+            write_view=views.FreelancerProfileViewSet.as_view({'get': 'list', 'post': 'create'})
+        )),
+        path('profile/', async_views.ProfileView.as_view(write_view=views.ProfileView.as_view()),
+             name='profile'),
+    ] + urlpatterns
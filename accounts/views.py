@@ -1,4 +1,9 @@
+from decimal import Decimal, InvalidOperation
+
+from django.core.files.storage import default_storage
+from django.http import FileResponse, Http404
 from django.shortcuts import render
+from django.utils.cache import patch_cache_control
 from django.contrib.auth import login, logout
 from rest_framework import viewsets, status
 from rest_framework.decorators import action
@@ -10,6 +15,63 @@ from .serializers import (
     UserSerializer, RegisterSerializer, LoginSerializer,
     FreelancerProfileSerializer, RecruiterProfileSerializer
 )
+from .thumbnails import VARIANT_DIR, VARIANT_MAX_AGE
+from jobs.skills import filter_by_skills
+from jobs.cache import cache_response
+from jobs.conditional import conditional, list_validators, make_etag, object_validators
+
+
+# Sort keys for freelancer profile lists; each is backed by an index
+FREELANCER_ORDERINGS = {
+    'rating': ('-rating', 'id'),
+    'completed_projects': ('-completed_projects', 'id'),
+}
+
+
+def profile_queryset(user):
+    """
+    The requesting user's own profile, of whichever kind matches their type
+    """
+    if user.user_type == 'freelancer':
+        return FreelancerProfile.objects.filter(user=user)
+    elif user.user_type == 'recruiter':
+        return RecruiterProfile.objects.filter(user=user)
+    return FreelancerProfile.objects.none()
+
+
+def profile_etag(user, profile_row):
+    timestamps = [user.updated_at] + ([profile_row[1]] if profile_row else [])
+    return make_etag('profile', user.pk, user.updated_at, profile_row), max(timestamps)
+
+
+def profile_validators(view, request, *args, **kwargs):
+    profile_row = profile_queryset(request.user).values_list('pk', 'updated_at').first()
+    return profile_etag(request.user, profile_row)
+
+
+def freelancer_list_queryset(params):
+    """
+    Freelancer profiles ordered and filtered by ``params``, except for the
+    ``skills`` filter, which the sync and async lists each resolve themselves
+    """
+    ordering = FREELANCER_ORDERINGS.get(params.get('ordering'), ('id',))
+    queryset = FreelancerProfile.objects.select_related('user').order_by(*ordering)
+    
+    min_rating = params.get('min_rating', None)
+    if min_rating:
+        try:
+            queryset = queryset.filter(rating__gte=Decimal(min_rating))
+        except InvalidOperation:
+            pass
+    return queryset
+
+
+def profile_detail_validators(view, request, pk=None, **kwargs):
+    return object_validators(view.get_queryset().filter(pk=pk), ('updated_at', 'user__updated_at'))
+
+
+def profile_list_validators(view, request, *args, **kwargs):
+    return list_validators(request, view.filter_queryset(view.get_queryset()), models=(User,))
 
 class RegisterView(APIView):
     permission_classes = [AllowAny]
@@ -48,6 +110,7 @@ class LogoutView(APIView):
 class ProfileView(APIView):
     permission_classes = [IsAuthenticated]
     
+    @conditional(profile_validators)
     def get(self, request):
         user = request.user
         user_data = UserSerializer(user).data
@@ -85,6 +148,15 @@ class FreelancerProfileViewSet(viewsets.ModelViewSet):
     queryset = FreelancerProfile.objects.all()
     serializer_class = FreelancerProfileSerializer
     
+    @conditional(profile_list_validators, use_last_modified=False)
+    @cache_response(FreelancerProfile, User)
+    def list(self, request, *args, **kwargs):
+        return super().list(request, *args, **kwargs)
+    
+    @conditional(profile_detail_validators)
+    def retrieve(self, request, *args, **kwargs):
+        return super().retrieve(request, *args, **kwargs)
+    
     def get_permissions(self):
         """
         Allow read access to everyone, write access only to authenticated users
@@ -97,15 +169,29 @@ class FreelancerProfileViewSet(viewsets.ModelViewSet):
     
     def get_queryset(self):
         if self.action == 'list':
-            return FreelancerProfile.objects.all()
+            queryset = freelancer_list_queryset(self.request.query_params)
+            
+            # Filter by canonical skills (must have all of them)
+            skills = self.request.query_params.get('skills', None)
+            if skills:
+                queryset = filter_by_skills(queryset, skills)
+            return queryset
         if self.request.user.is_authenticated:
-            return FreelancerProfile.objects.filter(user=self.request.user)
+            return FreelancerProfile.objects.filter(user=self.request.user).select_related('user')
         return FreelancerProfile.objects.none()
 
 class RecruiterProfileViewSet(viewsets.ModelViewSet):
     queryset = RecruiterProfile.objects.all()
     serializer_class = RecruiterProfileSerializer
     
+    @conditional(profile_list_validators, use_last_modified=False)
+    def list(self, request, *args, **kwargs):
+        return super().list(request, *args, **kwargs)
+    
+    @conditional(profile_detail_validators)
+    def retrieve(self, request, *args, **kwargs):
+        return super().retrieve(request, *args, **kwargs)
+    
     def get_permissions(self):
         """
         Allow read access to everyone, write access only to authenticated users
@@ -118,7 +204,21 @@ class RecruiterProfileViewSet(viewsets.ModelViewSet):
     
     def get_queryset(self):
         if self.action == 'list':
-            return RecruiterProfile.objects.all()
+            return RecruiterProfile.objects.select_related('user').order_by('id')
         if self.request.user.is_authenticated:
-            return RecruiterProfile.objects.filter(user=self.request.user)
+            return RecruiterProfile.objects.filter(user=self.request.user).select_related('user')
         return RecruiterProfile.objects.none()
+
+
+def profile_picture_variant(request, path):
+    """
+    A profile picture thumbnail from the default storage, for the development
+    server. Names are content hashes, so the response can be cached for good;
+    in production the web server or storage sends the same header.
+    """
+    name = f'{VARIANT_DIR}/{path}'
+    if not default_storage.exists(name):
+        raise Http404(name)
+    response = FileResponse(default_storage.open(name, 'rb'))
+    patch_cache_control(response, public=True, max_age=VARIANT_MAX_AGE, immutable=True)
+    return response
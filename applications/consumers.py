@@ -0,0 +1,50 @@
+from channels.db import database_sync_to_async
+from channels.generic.websocket import AsyncJsonWebsocketConsumer
+from django.db.models import Q
+from .models import Application
+from .realtime import group_name
+
+class ApplicationChatConsumer(AsyncJsonWebsocketConsumer):
+    """
+    Pushes new messages and read receipts for one application to its
+    freelancer and recruiter
+    """
+    group = None
+    
+    async def connect(self):
+        self.application_id = self.scope['url_route']['kwargs']['application_id']
+        user = self.scope.get('user')
+        if user is None or not user.is_authenticated or not await self.is_participant(user):
+            await self.close(code=4403)
+            return
+        
+        self.group = group_name(self.application_id)
+        await self.channel_layer.group_add(self.group, self.channel_name)
+        await self.accept()
+    
+    async def disconnect(self, code):
+        if self.group:
+            await self.channel_layer.group_discard(self.group, self.channel_name)
+    
+    async def receive_json(self, content, **kwargs):
+        # Messages are sent through the REST API; only answer keep-alives here
+        if content.get('type') == 'ping':
+            await self.send_json({'type': 'pong'})
+    
+    @database_sync_to_async
+    def is_participant(self, user):
+        return Application.objects.filter(
+            Q(freelancer=user) | Q(job__recruiter=user),
+            pk=self.application_id,
+        ).exists()
+    
+    async def message_created(self, event):
+        await self.send_json({'type': 'message', 'message': event['message']})
+    
+    async def messages_read(self, event):
+        await self.send_json({
+            'type': 'read',
+            'application': event['application'],
+            'reader': event['reader'],
+            'count': event['count'],
+        })
@@ -0,0 +1,106 @@
+"""
+Per-user dashboard summary.
+
+Status counts are computed with conditional aggregation (one ``COUNT(...)
+FILTER`` per status) so each role needs a single aggregate query over its
+applications, one over its jobs for recruiters, and one for the recent
+activity list. Unread messages come from the inbox counters on Application.
+The result is cached per user for ``DASHBOARD_CACHE_TIMEOUT`` seconds.
+"""
+from django.conf import settings
+from django.core.cache import cache
+from django.db.models import Count, Q, Sum
+from django.db.models.functions import Coalesce
+from rest_framework import serializers
+
+from accounts.models import FreelancerProfile
+from jobs.models import Job
+
+from .models import Application
+
+CACHE_KEY = 'dashboard-summary:%s'
+RECENT_ACTIVITY_SIZE = 5
+
+
+def _status_counts(queryset, choices, **extra):
+    aggregates = {
+        value: Count('pk', filter=Q(status=value)) for value, _ in choices
+    }
+    return queryset.order_by().aggregate(total=Count('pk'), **aggregates, **extra)
+
+
+def _recent_activity(queryset, unread_field):
+    timestamp = serializers.DateTimeField()
+    applications = queryset.select_related('job__recruiter', 'freelancer').order_by(
+        '-last_activity_at', '-id'
+    )[:RECENT_ACTIVITY_SIZE]
+    return [
+        {
+            'id': application.id,
+            'status': application.status,
+            'applied_at': timestamp.to_representation(application.applied_at),
+            'last_activity_at': timestamp.to_representation(application.last_activity_at),
+            'unread_count': getattr(application, unread_field),
+            'job': {
+                'id': application.job_id,
+                'title': application.job.title,
+                'recruiter': application.job.recruiter.username,
+            },
+            'freelancer': {
+                'id': application.freelancer_id,
+                'username': application.freelancer.username,
+                'first_name': application.freelancer.first_name,
+            },
+        }
+        for application in applications
+    ]
+
+
+def freelancer_summary(user):
+    applications = Application.objects.filter(freelancer=user)
+    counts = _status_counts(
+        applications, Application.STATUS_CHOICES,
+        unread_messages=Coalesce(Sum('freelancer_unread_count'), 0),
+    )
+    profile = FreelancerProfile.objects.filter(user=user).values(
+        'hourly_rate', 'rating', 'rating_count', 'completed_projects'
+    ).first()
+    if profile:
+        profile['hourly_rate'] = str(profile['hourly_rate']) if profile['hourly_rate'] is not None else None
+        profile['rating'] = str(profile['rating'])
+    return {
+        'role': 'freelancer',
+        'unread_messages': counts.pop('unread_messages'),
+        'applications': counts,
+        'profile': profile,
+        'recent_activity': _recent_activity(applications, 'freelancer_unread_count'),
+    }
+
+
+def recruiter_summary(user):
+    applications = Application.objects.filter(job__recruiter=user)
+    counts = _status_counts(
+        applications, Application.STATUS_CHOICES,
+        unread_messages=Coalesce(Sum('recruiter_unread_count'), 0),
+    )
+    return {
+        'role': 'recruiter',
+        'unread_messages': counts.pop('unread_messages'),
+        'jobs': _status_counts(Job.objects.filter(recruiter=user), Job.STATUS_CHOICES),
+        'applications': counts,
+        'recent_activity': _recent_activity(applications, 'recruiter_unread_count'),
+    }
+
+
+def dashboard_summary(user):
+    key = CACHE_KEY % user.pk
+    data = cache.get(key)
+    if data is None:
+        if user.user_type == 'freelancer':
+            data = freelancer_summary(user)
+        elif user.user_type == 'recruiter':
+            data = recruiter_summary(user)
+        else:
+            data = {'role': user.user_type or None}
+        cache.set(key, data, settings.DASHBOARD_CACHE_TIMEOUT)
+    return data
@@ -0,0 +1,92 @@
+"""
+Denormalized inbox state on ``Application``.
+
+Each application carries its last message, last activity time and one unread
+counter per party. Counters are adjusted with ``F()`` expressions in the same
+transaction as the message write, so the inbox never has to count ``Message``
+rows. ``rebuild_counters`` (and the ``rebuild_inbox_counters`` command)
+recomputes everything from the messages if the counters drift.
+"""
+from django.db.models import Count, F, IntegerField, OuterRef, Subquery, Value
+from django.db.models.functions import Coalesce, Greatest
+
+from .models import Application, Message
+
+
+def unread_field(application, user):
+    """
+    Name of the counter holding ``user``'s unread messages on ``application``.
+    """
+    if user.pk == application.freelancer_id:
+        return 'freelancer_unread_count'
+    return 'recruiter_unread_count'
+
+
+def record_new_message(message):
+    application = message.application
+    # Unread for whichever party did not send it
+    if message.sender_id == application.freelancer_id:
+        counter = 'recruiter_unread_count'
+    else:
+        counter = 'freelancer_unread_count'
+    updates = {
+        'last_message': message,
+        'last_activity_at': message.timestamp,
+    }
+    if not message.is_read:
+        updates[counter] = F(counter) + 1
+    Application.objects.filter(pk=application.pk).update(**updates)
+
+
+def record_read(application, reader, count):
+    counter = unread_field(application, reader)
+    Application.objects.filter(pk=application.pk).update(
+        **{counter: Greatest(F(counter) - count, Value(0))}
+    )
+
+
+def record_deleted_message(message):
+    application = Application.objects.filter(pk=message.application_id).first()
+    if application is None:
+        # Deleted along with its application
+        return
+    updates = {}
+    if not message.is_read:
+        if message.sender_id == application.freelancer_id:
+            counter = 'recruiter_unread_count'
+        else:
+            counter = 'freelancer_unread_count'
+        updates[counter] = Greatest(F(counter) - 1, Value(0))
+    if application.last_message_id in (None, message.pk):
+        latest = Message.objects.filter(application=application).order_by('-timestamp', '-id').first()
+        updates['last_message'] = latest
+        updates['last_activity_at'] = latest.timestamp if latest else application.applied_at
+    if updates:
+        Application.objects.filter(pk=application.pk).update(**updates)
+
+
+def _unread_count(messages):
+    return Coalesce(
+        Subquery(
+            messages.order_by().values('application').annotate(total=Count('pk')).values('total'),
+            output_field=IntegerField(),
+        ),
+        0,
+    )
+
+
+def rebuild_counters(queryset=None):
+    """
+    Recompute the inbox snapshot of ``queryset`` (all applications by
+    default) from its messages, in a single UPDATE.
+    """
+    if queryset is None:
+        queryset = Application.objects.all()
+    unread = Message.objects.filter(application=OuterRef('pk'), is_read=False)
+    latest = Message.objects.filter(application=OuterRef('pk')).order_by('-timestamp', '-id')
+    return queryset.update(
+        freelancer_unread_count=_unread_count(unread.exclude(sender=OuterRef('freelancer'))),
+        recruiter_unread_count=_unread_count(unread.filter(sender=OuterRef('freelancer'))),
+        last_message=Subquery(latest.values('pk')[:1]),
+        last_activity_at=Coalesce(Subquery(latest.values('timestamp')[:1]), F('applied_at')),
+    )
@@ -0,0 +1,9 @@
+from django.core.management.base import BaseCommand
+from applications.inbox import rebuild_counters
+
+class Command(BaseCommand):
+    help = 'Recompute inbox unread counters and last-message snapshots from messages'
+
+    def handle(self, *args, **options):
+        updated = rebuild_counters()
+        self.stdout.write(self.style.SUCCESS(f'Inbox counters rebuilt for {updated} applications'))
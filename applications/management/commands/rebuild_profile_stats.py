@@ -0,0 +1,9 @@
+from django.core.management.base import BaseCommand
+from applications.stats import rebuild_profile_stats
+
+class Command(BaseCommand):
+    help = 'Recompute freelancer ratings and completed project counts from reviews and jobs'
+
+    def handle(self, *args, **options):
+        updated = rebuild_profile_stats()
+        self.stdout.write(self.style.SUCCESS(f'Stats rebuilt for {updated} freelancer profiles'))
@@ -0,0 +1,72 @@
+# Generated by Django 5.2.4 on 2026-10-18 19:36
+
+import django.db.models.deletion
+import django.utils.timezone
+from django.conf import settings
+from django.db import migrations, models
+from django.db.models import Count, F, IntegerField, OuterRef, Subquery
+from django.db.models.functions import Coalesce
+
+
+def backfill_inbox(apps, schema_editor):
+    Application = apps.get_model('applications', 'Application')
+    Message = apps.get_model('applications', 'Message')
+
+    def unread_count(messages):
+        return Coalesce(
+            Subquery(
+                messages.order_by().values('application').annotate(total=Count('pk')).values('total'),
+                output_field=IntegerField(),
+            ),
+            0,
+        )
+
+    unread = Message.objects.filter(application=OuterRef('pk'), is_read=False)
+    latest = Message.objects.filter(application=OuterRef('pk')).order_by('-timestamp', '-id')
+    Application.objects.update(
+        freelancer_unread_count=unread_count(unread.exclude(sender=OuterRef('freelancer'))),
+        recruiter_unread_count=unread_count(unread.filter(sender=OuterRef('freelancer'))),
+        last_message=Subquery(latest.values('pk')[:1]),
+        last_activity_at=Coalesce(Subquery(latest.values('timestamp')[:1]), F('applied_at')),
+    )
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('applications', '0002_application_application_applied_id_idx'),
+        ('jobs', '0005_job_job_created_id_idx'),
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='application',
+            name='freelancer_unread_count',
+            field=models.PositiveIntegerField(default=0),
+        ),
+        migrations.AddField(
+            model_name='application',
+            name='last_activity_at',
+            field=models.DateTimeField(default=django.utils.timezone.now),
+        ),
+        migrations.AddField(
+            model_name='application',
+            name='last_message',
+            field=models.ForeignKey(blank=True, null=True, on_delete=django.db.models.deletion.SET_NULL, related_name='+', to='applications.message'),
+        ),
+        migrations.AddField(
+            model_name='application',
+            name='recruiter_unread_count',
+            field=models.PositiveIntegerField(default=0),
+        ),
+        migrations.AddIndex(
+            model_name='application',
+            index=models.Index(fields=['freelancer', '-last_activity_at', '-id'], name='application_inbox_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='application',
+            index=models.Index(fields=['-last_activity_at', '-id'], name='application_activity_idx'),
+        ),
+        migrations.RunPython(backfill_inbox, migrations.RunPython.noop),
+    ]
@@ -0,0 +1,38 @@
+# Generated by Django 5.2.4 on 2026-10-18 19:40
+
+from django.db import migrations
+from django.db.models import Count, DecimalField, F, FloatField, IntegerField, OuterRef, Subquery, Sum, Value
+from django.db.models.functions import Cast, Coalesce, Round
+
+
+def backfill_profile_stats(apps, schema_editor):
+    FreelancerProfile = apps.get_model('accounts', 'FreelancerProfile')
+    Application = apps.get_model('applications', 'Application')
+    Review = apps.get_model('applications', 'Review')
+
+    reviews = Review.objects.filter(reviewee=OuterRef('user')).order_by().values('reviewee')
+    completed = Application.objects.filter(
+        freelancer=OuterRef('user'), status='accepted', job__status='completed'
+    ).order_by().values('freelancer').annotate(total=Count('id')).values('total')
+    FreelancerProfile.objects.update(
+        rating_sum=Coalesce(Subquery(reviews.annotate(total=Sum('rating')).values('total')), 0),
+        rating_count=Coalesce(Subquery(reviews.annotate(total=Count('id')).values('total')), 0),
+        rating=Value(0),
+        completed_projects=Coalesce(Subquery(completed, output_field=IntegerField()), 0),
+    )
+    FreelancerProfile.objects.filter(rating_count__gt=0).update(
+        rating=Cast(Round(Cast(F('rating_sum'), FloatField()) / F('rating_count'), 2),
+                    DecimalField(max_digits=3, decimal_places=2)),
+    )
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('accounts', '0004_profile_rating_aggregates'),
+        ('applications', '0004_message_app_timestamp_idx'),
+    ]
+
+    operations = [
+        migrations.RunPython(backfill_profile_stats, migrations.RunPython.noop),
+    ]
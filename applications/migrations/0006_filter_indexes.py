@@ -0,0 +1,27 @@
+# Generated by Django 5.2.4 on 2026-10-18 20:03
+
+from django.conf import settings
+from django.db import migrations, models
+from jobs.operations import AddIndexConcurrently
+
+
+class Migration(migrations.Migration):
+    # CREATE INDEX CONCURRENTLY can't run in a transaction on PostgreSQL
+    atomic = False
+
+    dependencies = [
+        ('applications', '0005_backfill_profile_stats'),
+        ('jobs', '0006_filter_indexes'),
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+    ]
+
+    operations = [
+        AddIndexConcurrently(
+            model_name='application',
+            index=models.Index(fields=['freelancer', '-applied_at', '-id'], name='application_freelancer_idx'),
+        ),
+        AddIndexConcurrently(
+            model_name='message',
+            index=models.Index(condition=models.Q(('is_read', False)), fields=['application', 'sender'], name='message_unread_idx'),
+        ),
+    ]
@@ -20,9 +20,23 @@ class Application(models.Model):
     applied_at = models.DateTimeField(default=timezone.now)
     updated_at = models.DateTimeField(auto_now=True)
     
+    # Inbox snapshot, maintained by applications.inbox as messages are
+    # created and read
+    last_message = models.ForeignKey('Message', on_delete=models.SET_NULL, null=True, blank=True,
+                                     related_name='+')
+    last_activity_at = models.DateTimeField(default=timezone.now)
+    freelancer_unread_count = models.PositiveIntegerField(default=0)
+    recruiter_unread_count = models.PositiveIntegerField(default=0)
+    
     class Meta:
         unique_together = ('job', 'freelancer')
         ordering = ['-applied_at']
+        indexes = [
+            models.Index(fields=['-applied_at', '-id'], name='application_applied_id_idx'),
+            models.Index(fields=['freelancer', '-applied_at', '-id'], name='application_freelancer_idx'),
+            models.Index(fields=['freelancer', '-last_activity_at', '-id'], name='application_inbox_idx'),
+            models.Index(fields=['-last_activity_at', '-id'], name='application_activity_idx'),
+        ]
     
     def __str__(self):
         return f"{self.freelancer.username} - {self.job.title}"
@@ -36,6 +50,12 @@ class Message(models.Model):
     
     class Meta:
         ordering = ['timestamp']
+        indexes = [
+            models.Index(fields=['application', 'timestamp', 'id'], name='message_app_timestamp_idx'),
+            # Unread messages per conversation, for mark_read
+            models.Index(fields=['application', 'sender'], name='message_unread_idx',
+                         condition=models.Q(is_read=False)),
+        ]
     
     def __str__(self):
         return f"Message from {self.sender.username} - {self.timestamp}"
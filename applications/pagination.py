@@ -0,0 +1,81 @@
+from django.db.models import Q
+from rest_framework.exceptions import ValidationError
+from rest_framework.pagination import PageNumberPagination
+from rest_framework.response import Response
+
+from jobs.pagination import KeysetCursorPagination
+
+class ApplicationCursorPagination(KeysetCursorPagination):
+    """
+    Keyset pagination over (applied_at, id), backed by the matching index on
+    Application.
+    """
+    ordering = ('-applied_at', '-id')
+    page_size_query_param = 'page_size'
+    max_page_size = 100
+
+
+class InboxCursorPagination(KeysetCursorPagination):
+    """
+    Keyset pagination over (last_activity_at, id), most recently active
+    conversation first.
+    """
+    ordering = ('-last_activity_at', '-id')
+    page_size_query_param = 'page_size'
+    max_page_size = 100
+
+
+class MessageSyncPagination(PageNumberPagination):
+    """
+    Page numbers for browsing, plus ``?after=<message id>`` / ``?before=<message
+    id>`` windows for chat clients that already hold part of the history.
+
+    A window is a keyset range over the (application, timestamp, id) index,
+    so fetching what is new since the last refresh costs the same however
+    long the conversation is. Windows come back in chronological order with a
+    ``has_more`` flag instead of page links.
+    """
+    page_size_query_param = 'page_size'
+    max_page_size = 100
+    
+    def paginate_queryset(self, queryset, request, view=None):
+        after = request.query_params.get('after')
+        before = request.query_params.get('before')
+        if not after and not before:
+            self.window = False
+            return super().paginate_queryset(queryset, request, view)
+        if after and before:
+            raise ValidationError({'error': 'Use either after or before, not both'})
+        
+        self.window = True
+        size = self.get_page_size(request)
+        anchor_id = after or before
+        try:
+            anchor = queryset.filter(pk=anchor_id).values_list('timestamp', 'id').first()
+        except (TypeError, ValueError):
+            anchor = None
+        if anchor is None:
+            raise ValidationError({'error': 'Unknown message'})
+        timestamp, pk = anchor
+        
+        if after:
+            queryset = queryset.filter(
+                Q(timestamp__gt=timestamp) | Q(timestamp=timestamp, id__gt=pk)
+            ).order_by('timestamp', 'id')
+        else:
+            queryset = queryset.filter(
+                Q(timestamp__lt=timestamp) | Q(timestamp=timestamp, id__lt=pk)
+            ).order_by('-timestamp', '-id')
+        
+        # One extra row tells whether the window was cut short
+        rows = list(queryset[:size + 1])
+        self.has_more = len(rows) > size
+        rows = rows[:size]
+        if before:
+            rows.reverse()
+        return rows
+    
+    def get_paginated_response(self, data):
+        if not self.window:
+            return super().get_paginated_response(data)
+        return Response({'has_more': self.has_more, 'results': data})
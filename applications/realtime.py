@@ -0,0 +1,46 @@
+"""
+Fan-out of application chat events to WebSocket subscribers.
+
+Events go through the Channels layer configured in ``CHANNEL_LAYERS``. The
+default in-memory layer only reaches sockets held by the same process, which
+is enough for a single-node deployment; point ``CHANNEL_LAYER_BACKEND`` at a
+shared layer (e.g. Redis) when running several workers.
+"""
+from asgiref.sync import async_to_sync
+from channels.layers import get_channel_layer
+from django.db import transaction
+
+
+def group_name(application_id):
+    return f'application-{application_id}'
+
+
+def _publish(application_id, event):
+    layer = get_channel_layer()
+    if layer is None:
+        return
+    async_to_sync(layer.group_send)(group_name(application_id), event)
+
+
+def publish_message(message):
+    """
+    Push a newly created message to everyone watching its application,
+    once the surrounding transaction has committed.
+    """
+    from .serializers import MessageSerializer
+
+    event = {
+        'type': 'message.created',
+        'message': MessageSerializer(message).data,
+    }
+    transaction.on_commit(lambda: _publish(message.application_id, event))
+
+
+def publish_read_receipt(application_id, reader_id, count):
+    event = {
+        'type': 'messages.read',
+        'application': int(application_id),
+        'reader': reader_id,
+        'count': count,
+    }
+    transaction.on_commit(lambda: _publish(application_id, event))
@@ -24,12 +24,61 @@ class MessageSerializer(serializers.ModelSerializer):
     class Meta:
         model = Message
         fields = ['id', 'application', 'sender', 'content', 'timestamp', 'is_read']
-        read_only_fields = ['id', 'sender', 'timestamp']
+        # Read state only changes through mark_read, which keeps the inbox
+        # counters in step
+        read_only_fields = ['id', 'sender', 'timestamp', 'is_read']
 
     def create(self, validated_data):
         validated_data['sender'] = self.context['request'].user
         return super().create(validated_data)
 
+class CompactMessageSerializer(MessageSerializer):
+    """
+    MessageSerializer with the sender as a plain id, for chat clients that
+    already know both participants.
+    """
+    sender = serializers.PrimaryKeyRelatedField(read_only=True)
+
+class InboxSerializer(serializers.ModelSerializer):
+    """
+    One conversation in a user's inbox, read entirely from the denormalized
+    columns on Application.
+    """
+    job_id = serializers.IntegerField(read_only=True)
+    job_title = serializers.CharField(source='job.title', read_only=True)
+    counterpart = serializers.SerializerMethodField()
+    unread_count = serializers.SerializerMethodField()
+    last_message = serializers.SerializerMethodField()
+    
+    class Meta:
+        model = Application
+        fields = ['id', 'job_id', 'job_title', 'status', 'counterpart', 'unread_count',
+                 'last_message', 'last_activity_at']
+    
+    def _is_freelancer(self, obj):
+        return self.context['request'].user.pk == obj.freelancer_id
+    
+    def get_counterpart(self, obj):
+        user = obj.job.recruiter if self._is_freelancer(obj) else obj.freelancer
+        return {'id': user.id, 'username': user.username}
+    
+    def get_unread_count(self, obj):
+        if self._is_freelancer(obj):
+            return obj.freelancer_unread_count
+        return obj.recruiter_unread_count
+    
+    def get_last_message(self, obj):
+        message = obj.last_message
+        if message is None:
+            return None
+        return {
+            'id': message.id,
+            'sender': message.sender_id,
+            'content': message.content,
+            'timestamp': serializers.DateTimeField().to_representation(message.timestamp),
+            'is_read': message.is_read,
+        }
+
 class ReviewSerializer(serializers.ModelSerializer):
     reviewer = UserSerializer(read_only=True)
     reviewee = UserSerializer(read_only=True)
@@ -0,0 +1,61 @@
+from django.db.models.signals import post_init, post_save, post_delete
+from django.dispatch import receiver
+from jobs.models import Job
+from .models import Message, Review
+from .realtime import publish_message
+from . import inbox, stats
+
+@receiver(post_save, sender=Message)
+def update_inbox_on_new_message(sender, instance, created, **kwargs):
+    if created:
+        inbox.record_new_message(instance)
+
+@receiver(post_delete, sender=Message)
+def update_inbox_on_deleted_message(sender, instance, **kwargs):
+    inbox.record_deleted_message(instance)
+
+@receiver(post_save, sender=Message)
+def push_new_message(sender, instance, created, **kwargs):
+    if created:
+        publish_message(instance)
+
+@receiver(post_init, sender=Review)
+def remember_review_rating(sender, instance, **kwargs):
+    # What the database holds, so saves and deletes know what to take back.
+    # Read from __dict__ so deferred fields are not fetched.
+    instance._stored_rating = (instance.__dict__.get('reviewee_id'), instance.__dict__.get('rating'))
+
+@receiver(post_save, sender=Review)
+def update_rating_on_save(sender, instance, created, **kwargs):
+    reviewee_id, rating = instance._stored_rating
+    if created:
+        stats.adjust_rating(instance.reviewee_id, instance.rating, 1)
+    elif reviewee_id == instance.reviewee_id:
+        if rating != instance.rating:
+            stats.adjust_rating(reviewee_id, instance.rating - rating, 0)
+    else:
+        stats.adjust_rating(reviewee_id, -rating, -1)
+        stats.adjust_rating(instance.reviewee_id, instance.rating, 1)
+    instance._stored_rating = (instance.reviewee_id, instance.rating)
+
+@receiver(post_delete, sender=Review)
+def update_rating_on_delete(sender, instance, **kwargs):
+    reviewee_id, rating = instance._stored_rating
+    if reviewee_id is None:
+        reviewee_id, rating = instance.reviewee_id, instance.rating
+    stats.adjust_rating(reviewee_id, -rating, -1)
+
+@receiver(post_init, sender=Job)
+def remember_job_status(sender, instance, **kwargs):
+    instance._stored_status = instance.__dict__.get('status')
+
+@receiver(post_save, sender=Job)
+def update_completed_projects(sender, instance, created, update_fields=None, **kwargs):
+    if update_fields and 'status' not in update_fields:
+        return
+    was_completed = instance._stored_status == 'completed'
+    is_completed = instance.status == 'completed'
+    # A job created as completed has nobody accepted on it yet
+    if not created and was_completed != is_completed:
+        stats.adjust_completed_projects(instance, 1 if is_completed else -1)
+    instance._stored_status = instance.status
@@ -0,0 +1,133 @@
+"""
+Freelancer reputation aggregates.
+
+``FreelancerProfile`` stores a running ``rating_sum`` / ``rating_count`` and
+the derived ``rating``, plus ``completed_projects``. They are adjusted with
+``F()`` updates from the Review and Job signals (applications.signals), so the
+callers' transaction covers both the write and the aggregate. Profile lists
+can then sort and filter on the indexed columns instead of aggregating
+reviews per request. ``rebuild_profile_stats`` recomputes everything from
+scratch.
+"""
+from django.conf import settings
+from django.core.cache import cache
+from django.db import transaction
+from django.db.models import (
+    Case, Count, DecimalField, F, FloatField, IntegerField, OuterRef, Subquery, Sum, Value, When,
+)
+from django.db.models.functions import Cast, Coalesce, Round
+from django.utils import timezone
+
+from accounts.models import FreelancerProfile
+from jobs import matching
+from jobs.cache import bump_generation
+
+from .models import Application, Review
+
+HISTOGRAM_KEY = 'rating-histogram:%s'
+
+
+def _rating(total, count):
+    return Cast(Round(Cast(total, FloatField()) / count, 2), DecimalField(max_digits=3, decimal_places=2))
+
+
+def _profiles_changed(user_ids):
+    bump_generation(FreelancerProfile)
+    if matching.pool.loaded_at is not None:
+        for profile in FreelancerProfile.objects.filter(user_id__in=user_ids):
+            matching.refresh_profile(profile)
+
+
+def adjust_rating(reviewee_id, rating_delta, count_delta):
+    """
+    Add ``rating_delta`` stars over ``count_delta`` reviews to a freelancer's
+    running totals and rederive the average, in one UPDATE.
+    """
+    total = F('rating_sum') + rating_delta
+    count = F('rating_count') + count_delta
+    updated = FreelancerProfile.objects.filter(user_id=reviewee_id).update(
+        rating_sum=total,
+        rating_count=count,
+        rating=Case(
+            # Conditions see the values from before this update
+            When(rating_count__gt=-count_delta, then=_rating(total, count)),
+            default=Value(0),
+            output_field=DecimalField(max_digits=3, decimal_places=2),
+        ),
+        updated_at=timezone.now(),
+    )
+    invalidate_histogram(reviewee_id)
+    if updated:
+        _profiles_changed([reviewee_id])
+
+
+def adjust_completed_projects(job, delta):
+    """
+    Credit (or, with a negative ``delta``, take back) a completed project to
+    the freelancers accepted on ``job``.
+    """
+    freelancer_ids = list(Application.objects.filter(
+        job=job, status='accepted'
+    ).values_list('freelancer_id', flat=True))
+    if not freelancer_ids:
+        return
+    FreelancerProfile.objects.filter(user_id__in=freelancer_ids).update(
+        completed_projects=F('completed_projects') + delta,
+        updated_at=timezone.now(),
+    )
+    _profiles_changed(freelancer_ids)
+
+
+def rating_histogram(reviewee_id):
+    """
+    ``{'count', 'average', 'histogram': {1: n, ..., 5: n}}`` for a reviewee,
+    cached until one of their reviews changes.
+    """
+    key = HISTOGRAM_KEY % reviewee_id
+    data = cache.get(key)
+    if data is None:
+        counts = dict(Review.objects.filter(
+            reviewee_id=reviewee_id
+        ).order_by().values_list('rating').annotate(total=Count('id')))
+        histogram = {stars: counts.get(stars, 0) for stars, _ in Review.RATING_CHOICES}
+        count = sum(histogram.values())
+        total = sum(stars * n for stars, n in histogram.items())
+        data = {
+            'count': count,
+            'average': round(total / count, 2) if count else 0,
+            'histogram': histogram,
+        }
+        cache.set(key, data, settings.RESPONSE_CACHE_TIMEOUT)
+    return data
+
+
+def invalidate_histogram(reviewee_id):
+    # After commit, so a concurrent reader cannot cache the old counts again
+    transaction.on_commit(lambda: cache.delete(HISTOGRAM_KEY % reviewee_id))
+
+
+def rebuild_profile_stats(queryset=None):
+    """
+    Recompute the aggregates of ``queryset`` (all freelancer profiles by
+    default) from reviews and completed jobs.
+    """
+    if queryset is None:
+        queryset = FreelancerProfile.objects.all()
+    reviews = Review.objects.filter(reviewee=OuterRef('user')).order_by().values('reviewee')
+    total = Coalesce(Subquery(reviews.annotate(total=Sum('rating')).values('total')), 0)
+    count = Coalesce(Subquery(reviews.annotate(total=Count('id')).values('total')), 0)
+    completed = Application.objects.filter(
+        freelancer=OuterRef('user'), status='accepted', job__status='completed'
+    ).order_by().values('freelancer').annotate(total=Count('id')).values('total')
+    updated = queryset.update(
+        rating_sum=total,
+        rating_count=count,
+        rating=Value(0),
+        completed_projects=Coalesce(Subquery(completed, output_field=IntegerField()), 0),
+    )
+    # The average needs the new totals, which one UPDATE cannot read back
+    queryset.filter(rating_count__gt=0).update(rating=_rating(F('rating_sum'), F('rating_count')))
+    bump_generation(FreelancerProfile)
+    if matching.pool.loaded_at is not None:
+        matching.pool.load()
+    return updated
@@ -0,0 +1,13 @@
+from taskqueue.queue import task
+from jobs.models import Job
+
+
+@task
+def start_job(job_id):
+    """
+    Move a job to in progress once an application to it is accepted
+    """
+    job = Job.objects.get(pk=job_id)
+    if job.status != 'in_progress':
+        job.status = 'in_progress'
+        job.save()
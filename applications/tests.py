@@ -1,3 +1,326 @@
+from asgiref.sync import async_to_sync
+from channels.db import database_sync_to_async
+from channels.routing import URLRouter
+from channels.testing import WebsocketCommunicator
+from django.core.cache import cache
 from django.test import TestCase
+from accounts.models import User
+from jobs.models import Category, Job
+from jobs.testing import QueryBudgetMixin, create_jobs
+from accounts.models import FreelancerProfile
+from .inbox import rebuild_counters
+from .stats import rebuild_profile_stats
+from .models import Application, Message, Review
+from .routing import websocket_urlpatterns
 
-# Create your tests here.
+
+class ApplicationQueryBudgetTests(QueryBudgetMixin, TestCase):
+    @classmethod
+    def setUpTestData(cls):
+        cls.recruiter = User.objects.create(username='recruiter', user_type='recruiter')
+        cls.freelancer = User.objects.create(username='freelancer', user_type='freelancer')
+        categories = [Category.objects.create(name=f'Category {i}') for i in range(3)]
+        jobs = create_jobs(cls.recruiter, categories, 25, attachments=2)
+        cls.applications = [
+            Application.objects.create(job=job, freelancer=cls.freelancer, cover_letter='Hello')
+            for job in jobs
+        ]
+        for i in range(25):
+            Message.objects.create(
+                application=cls.applications[0],
+                sender=cls.freelancer if i % 2 else cls.recruiter,
+                content=f'Message {i}',
+            )
+        for job in jobs:
+            job.status = 'completed'
+            job.save()
+            Review.objects.create(job=job, reviewer=cls.recruiter, reviewee=cls.freelancer, rating=5)
+
+    def test_application_list_as_freelancer(self):
+        self.client.force_login(self.freelancer)
+        self.assertQueryBudget('/api/applications/applications/', 4)
+
+    def test_application_list_as_recruiter(self):
+        self.client.force_login(self.recruiter)
+        self.assertQueryBudget('/api/applications/applications/', 4)
+
+    def test_message_list(self):
+        self.client.force_login(self.recruiter)
+        self.assertQueryBudget('/api/applications/messages/', 5,
+                               params={'application': self.applications[0].pk},
+                               variants=({}, {'page': 2}))
+
+    def test_message_sync_window(self):
+        self.client.force_login(self.recruiter)
+        anchor = Message.objects.filter(application=self.applications[0]).order_by('id')[10]
+        self.assertQueryBudget('/api/applications/messages/', 5,
+                               params={'application': self.applications[0].pk, 'after': anchor.pk},
+                               variants=({'page_size': 2}, {'page_size': 20}, {'compact': 1}))
+
+    def test_inbox(self):
+        self.client.force_login(self.recruiter)
+        self.assertQueryBudget('/api/applications/applications/inbox/', 3)
+
+    def test_review_list(self):
+        self.client.force_login(self.recruiter)
+        self.assertQueryBudget('/api/applications/reviews/', 5, variants=({}, {'page': 2}))
+        self.assertQueryBudget('/api/applications/reviews/', 5,
+                               params={'reviewee': self.freelancer.pk},
+                               variants=({}, {'page': 2}))
+
+
+class ApplicationChatConsumerTests(TestCase):
+    @classmethod
+    def setUpTestData(cls):
+        cls.recruiter = User.objects.create(username='recruiter', user_type='recruiter')
+        cls.freelancer = User.objects.create(username='freelancer', user_type='freelancer')
+        cls.outsider = User.objects.create(username='outsider', user_type='freelancer')
+        job = create_jobs(cls.recruiter, [Category.objects.create(name='Design')], 1)[0]
+        cls.application = Application.objects.create(job=job, freelancer=cls.freelancer, cover_letter='Hi')
+
+    def connect(self, user):
+        communicator = WebsocketCommunicator(
+            URLRouter(websocket_urlpatterns), f'/ws/applications/{self.application.pk}/'
+        )
+        communicator.scope['user'] = user
+        return communicator
+
+    def test_outsider_is_rejected(self):
+        async def run():
+            communicator = self.connect(self.outsider)
+            connected, _ = await communicator.connect()
+            self.assertFalse(connected)
+        async_to_sync(run)()
+
+    def test_participants_receive_messages_and_read_receipts(self):
+        async def run():
+            communicator = self.connect(self.recruiter)
+            connected, _ = await communicator.connect()
+            self.assertTrue(connected)
+
+            await database_sync_to_async(self.send_message)()
+            event = await communicator.receive_json_from()
+            self.assertEqual(event['type'], 'message')
+            self.assertEqual(event['message']['content'], 'Hello')
+
+            await database_sync_to_async(self.mark_read)()
+            event = await communicator.receive_json_from()
+            self.assertEqual(event, {'type': 'read', 'application': self.application.pk,
+                                     'reader': self.recruiter.pk, 'count': 1})
+            await communicator.disconnect()
+        async_to_sync(run)()
+
+    def send_message(self):
+        self.client.force_login(self.freelancer)
+        with self.captureOnCommitCallbacks(execute=True):
+            response = self.client.post('/api/applications/messages/', {
+                'application': self.application.pk, 'content': 'Hello',
+            })
+        self.assertEqual(response.status_code, 201)
+
+    def mark_read(self):
+        self.client.force_login(self.recruiter)
+        with self.captureOnCommitCallbacks(execute=True):
+            response = self.client.post('/api/applications/messages/mark_read/', {
+                'application': self.application.pk,
+            })
+        self.assertEqual(response.status_code, 200)
+
+
+
+class MessageSyncTests(TestCase):
+    @classmethod
+    def setUpTestData(cls):
+        cls.recruiter = User.objects.create(username='recruiter', user_type='recruiter')
+        cls.freelancer = User.objects.create(username='freelancer', user_type='freelancer')
+        job = create_jobs(cls.recruiter, [Category.objects.create(name='Design')], 1)[0]
+        cls.application = Application.objects.create(job=job, freelancer=cls.freelancer, cover_letter='Hi')
+        cls.messages = [
+            Message.objects.create(application=cls.application, sender=cls.freelancer, content=f'Message {i}')
+            for i in range(10)
+        ]
+
+    def window(self, **params):
+        self.client.force_login(self.recruiter)
+        response = self.client.get('/api/applications/messages/', {'application': self.application.pk, **params})
+        return response
+
+    def test_after_returns_newer_messages_in_order(self):
+        data = self.window(after=self.messages[5].pk, page_size=3).json()
+        self.assertEqual([m['id'] for m in data['results']], [m.pk for m in self.messages[6:9]])
+        self.assertTrue(data['has_more'])
+        data = self.window(after=self.messages[8].pk).json()
+        self.assertEqual([m['id'] for m in data['results']], [self.messages[9].pk])
+        self.assertFalse(data['has_more'])
+
+    def test_before_returns_the_preceding_window(self):
+        data = self.window(before=self.messages[5].pk, page_size=3).json()
+        self.assertEqual([m['id'] for m in data['results']], [m.pk for m in self.messages[2:5]])
+        self.assertTrue(data['has_more'])
+
+    def test_compact_mode_and_unknown_anchor(self):
+        data = self.window(after=self.messages[0].pk, compact=1).json()
+        self.assertEqual(data['results'][0]['sender'], self.freelancer.pk)
+        self.assertEqual(self.window(after=999999).status_code, 400)
+
+
+class InboxCounterTests(TestCase):
+    @classmethod
+    def setUpTestData(cls):
+        cls.recruiter = User.objects.create(username='recruiter', user_type='recruiter')
+        cls.freelancer = User.objects.create(username='freelancer', user_type='freelancer')
+        jobs = create_jobs(cls.recruiter, [Category.objects.create(name='Design')], 2)
+        cls.application, cls.other = [
+            Application.objects.create(job=job, freelancer=cls.freelancer, cover_letter='Hi')
+            for job in jobs
+        ]
+
+    def inbox(self, user):
+        self.client.force_login(user)
+        response = self.client.get('/api/applications/applications/inbox/')
+        self.assertEqual(response.status_code, 200)
+        return response.json()['results']
+
+    def test_counters_follow_messages_and_reads(self):
+        for i in range(3):
+            Message.objects.create(application=self.application, sender=self.freelancer, content=f'Hi {i}')
+        Message.objects.create(application=self.application, sender=self.recruiter, content='Reply')
+
+        first = self.inbox(self.recruiter)[0]
+        self.assertEqual(first['id'], self.application.pk)
+        self.assertEqual(first['unread_count'], 3)
+        self.assertEqual(first['counterpart']['id'], self.freelancer.pk)
+        self.assertEqual(first['last_message']['content'], 'Reply')
+        self.assertEqual(self.inbox(self.freelancer)[0]['unread_count'], 1)
+
+        self.client.force_login(self.recruiter)
+        self.client.post('/api/applications/messages/mark_read/', {'application': self.application.pk})
+        self.assertEqual(self.inbox(self.recruiter)[0]['unread_count'], 0)
+        self.assertEqual(self.inbox(self.freelancer)[0]['unread_count'], 1)
+
+    def test_rebuild_matches_incremental_counters(self):
+        for i in range(4):
+            Message.objects.create(application=self.other, sender=self.recruiter, content=f'Hi {i}')
+        Message.objects.filter(application=self.other).last().delete()
+        expected = list(Application.objects.order_by('id').values(
+            'last_message', 'freelancer_unread_count', 'recruiter_unread_count'))
+        Application.objects.update(freelancer_unread_count=99, last_message=None)
+        rebuild_counters()
+        self.assertEqual(list(Application.objects.order_by('id').values(
+            'last_message', 'freelancer_unread_count', 'recruiter_unread_count')), expected)
+        self.assertEqual(Application.objects.get(pk=self.other.pk).freelancer_unread_count, 3)
+
+    def test_outsider_cannot_mark_read(self):
+        outsider = User.objects.create(username='outsider', user_type='freelancer')
+        Message.objects.create(application=self.application, sender=self.freelancer, content='Hi')
+        self.client.force_login(outsider)
+        response = self.client.post('/api/applications/messages/mark_read/', {'application': self.application.pk})
+        self.assertEqual(response.status_code, 403)
+        self.assertEqual(Message.objects.filter(is_read=False).count(), 1)
+
+
+
+class ProfileStatsTests(TestCase):
+    @classmethod
+    def setUpTestData(cls):
+        cls.recruiter = User.objects.create(username='recruiter', user_type='recruiter')
+        cls.freelancer = User.objects.create(username='freelancer', user_type='freelancer')
+        FreelancerProfile.objects.create(user=cls.freelancer, skills='Python')
+        cls.jobs = create_jobs(cls.recruiter, [Category.objects.create(name='Design')], 3)
+        for job in cls.jobs:
+            Application.objects.create(job=job, freelancer=cls.freelancer, cover_letter='Hi', status='accepted')
+
+    def profile(self):
+        return FreelancerProfile.objects.get(user=self.freelancer)
+
+    def test_completed_projects_follow_job_status(self):
+        self.client.force_login(self.recruiter)
+        for job in self.jobs[:2]:
+            self.client.post(f'/api/jobs/jobs/{job.pk}/toggle_status/', {'status': 'completed'})
+        self.assertEqual(self.profile().completed_projects, 2)
+        self.client.post(f'/api/jobs/jobs/{self.jobs[0].pk}/toggle_status/', {'status': 'in_progress'})
+        self.assertEqual(self.profile().completed_projects, 1)
+
+    def test_rating_follows_review_changes(self):
+        reviews = [
+            Review.objects.create(job=job, reviewer=self.recruiter, reviewee=self.freelancer, rating=rating)
+            for job, rating in zip(self.jobs, (5, 4, 4))
+        ]
+        profile = self.profile()
+        self.assertEqual((profile.rating_sum, profile.rating_count, str(profile.rating)), (13, 3, '4.33'))
+
+        reviews[0].rating = 2
+        reviews[0].save()
+        reviews[1].delete()
+        profile = self.profile()
+        self.assertEqual((profile.rating_sum, profile.rating_count, str(profile.rating)), (6, 2, '3.00'))
+
+        FreelancerProfile.objects.update(rating_sum=0, rating_count=0, rating=0)
+        rebuild_profile_stats()
+        self.assertEqual(str(self.profile().rating), '3.00')
+
+    def test_histogram_and_rating_ordering(self):
+        other = User.objects.create(username='other', user_type='freelancer')
+        FreelancerProfile.objects.create(user=other, skills='Go')
+        for job, rating in zip(self.jobs, (5, 3, 3)):
+            Review.objects.create(job=job, reviewer=self.recruiter, reviewee=self.freelancer, rating=rating)
+
+        self.client.force_login(self.recruiter)
+        with self.captureOnCommitCallbacks(execute=True):
+            data = self.client.get('/api/applications/reviews/histogram/',
+                                   {'reviewee': self.freelancer.pk}).json()
+        self.assertEqual(data['histogram'], {'1': 0, '2': 0, '3': 2, '4': 0, '5': 1})
+        self.assertEqual(data['count'], 3)
+
+        response = self.client.get('/api/accounts/freelancer-profiles/', {'ordering': 'rating'})
+        self.assertEqual([p['user']['id'] for p in response.json()['results']], [self.freelancer.pk, other.pk])
+        response = self.client.get('/api/accounts/freelancer-profiles/', {'min_rating': '3.5'})
+        self.assertEqual(response.json()['count'], 1)
+
+
+
+class DashboardSummaryTests(TestCase):
+    @classmethod
+    def setUpTestData(cls):
+        cls.recruiter = User.objects.create(username='recruiter', user_type='recruiter')
+        cls.freelancer = User.objects.create(username='freelancer', user_type='freelancer')
+        FreelancerProfile.objects.create(user=cls.freelancer, skills='Python', hourly_rate=40)
+        jobs = create_jobs(cls.recruiter, [Category.objects.create(name='Design')], 4)
+        for job, status in zip(jobs, ('pending', 'pending', 'accepted', 'rejected')):
+            application = Application.objects.create(
+                job=job, freelancer=cls.freelancer, cover_letter='Hi', status=status
+            )
+        Message.objects.create(application=application, sender=cls.recruiter, content='Sorry')
+        Job.objects.filter(pk=jobs[0].pk).update(status='completed')
+
+    def setUp(self):
+        # Summaries are cached per user id, which other tests reuse
+        cache.clear()
+
+    def test_freelancer_summary(self):
+        self.client.force_login(self.freelancer)
+        data = self.client.get('/api/dashboard/summary/').json()
+        self.assertEqual(data['applications'], {
+            'total': 4, 'pending': 2, 'accepted': 1, 'rejected': 1, 'withdrawn': 0,
+        })
+        self.assertEqual(data['unread_messages'], 1)
+        self.assertEqual(data['profile']['hourly_rate'], '40.00')
+        self.assertEqual(data['recent_activity'][0]['status'], 'rejected')
+
+    def test_recruiter_summary(self):
+        self.client.force_login(self.recruiter)
+        data = self.client.get('/api/dashboard/summary/').json()
+        self.assertEqual(data['jobs']['total'], 4)
+        self.assertEqual(data['jobs']['completed'], 1)
+        self.assertEqual(data['applications']['pending'], 2)
+        self.assertEqual(data['unread_messages'], 0)
+        self.assertEqual(len(data['recent_activity']), 4)
+
+    def test_query_budget(self):
+        self.client.force_login(self.recruiter)
+        # Session and user, then job counts, application counts and activity
+        with self.assertNumQueries(5):
+            self.client.get('/api/dashboard/summary/')
+        # Served from the per-user cache on the next load
+        with self.assertNumQueries(2):
+            self.client.get('/api/dashboard/summary/')
@@ -1,29 +1,62 @@
+from django.db import transaction
 from django.shortcuts import render
 from rest_framework import viewsets, status
 from rest_framework.decorators import action
 from rest_framework.response import Response
+from rest_framework.views import APIView
 from rest_framework.permissions import IsAuthenticated
 from .models import Application, Message, Review
-from .serializers import ApplicationSerializer, MessageSerializer, ReviewSerializer
+from .serializers import (
+    ApplicationSerializer, CompactMessageSerializer, InboxSerializer, MessageSerializer, ReviewSerializer
+)
+from .pagination import ApplicationCursorPagination, InboxCursorPagination, MessageSyncPagination
+from .realtime import publish_read_receipt
+from .inbox import record_read
+from .stats import rating_histogram
+from .dashboard import dashboard_summary
+from .tasks import start_job
 
 class ApplicationViewSet(viewsets.ModelViewSet):
     queryset = Application.objects.all()
     serializer_class = ApplicationSerializer
     permission_classes = [IsAuthenticated]
+    pagination_class = ApplicationCursorPagination
     
     def get_queryset(self):
         user = self.request.user
+        # Everything ApplicationSerializer nests, fetched up front
+        queryset = Application.objects.select_related(
+            'freelancer', 'job__recruiter', 'job__category'
+        ).prefetch_related('job__attachments')
         
         # Freelancers see their own applications
         if user.user_type == 'freelancer':
-            return Application.objects.filter(freelancer=user)
+            return queryset.filter(freelancer=user)
         
         # Recruiters see applications for their jobs
         elif user.user_type == 'recruiter':
-            return Application.objects.filter(job__recruiter=user)
+            return queryset.filter(job__recruiter=user)
         
         return Application.objects.none()
     
+    @action(detail=False, methods=['get'])
+    def inbox(self, request):
+        # Counters and the last message live on Application, so this is one
+        # query per page whatever the number of messages
+        user = request.user
+        queryset = Application.objects.select_related('job__recruiter', 'freelancer', 'last_message')
+        if user.user_type == 'freelancer':
+            queryset = queryset.filter(freelancer=user)
+        elif user.user_type == 'recruiter':
+            queryset = queryset.filter(job__recruiter=user)
+        else:
+            queryset = queryset.none()
+        
+        paginator = InboxCursorPagination()
+        page = paginator.paginate_queryset(queryset, request, view=self)
+        serializer = InboxSerializer(page, many=True, context={'request': request})
+        return paginator.get_paginated_response(serializer.data)
+    
     @action(detail=True, methods=['post'])
     def update_status(self, request, pk=None):
         application = self.get_object()
@@ -34,13 +67,13 @@ class ApplicationViewSet(viewsets.ModelViewSet):
         
         new_status = request.data.get('status')
         if new_status in ['pending', 'accepted', 'rejected']:
-            application.status = new_status
-            application.save()
-            
-            # If accepted, update job status to in_progress
-            if new_status == 'accepted':
-                application.job.status = 'in_progress'
-                application.job.save()
+            with transaction.atomic():
+                application.status = new_status
+                application.save()
+                
+                # If accepted, move the job to in_progress in the background
+                if new_status == 'accepted':
+                    start_job.delay(job_id=application.job_id)
             
             return Response({'message': f'Application {new_status}'})
         
@@ -62,6 +95,12 @@ class MessageViewSet(viewsets.ModelViewSet):
     queryset = Message.objects.all()
     serializer_class = MessageSerializer
     permission_classes = [IsAuthenticated]
+    pagination_class = MessageSyncPagination
+    
+    def get_serializer_class(self):
+        if self.request.query_params.get('compact') in ('1', 'true'):
+            return CompactMessageSerializer
+        return MessageSerializer
     
     def get_queryset(self):
         user = self.request.user
@@ -70,24 +109,46 @@ class MessageViewSet(viewsets.ModelViewSet):
         if application_id:
             # Check if user has access to this application
             try:
-                application = Application.objects.get(id=application_id)
-                if user == application.freelancer or user == application.job.recruiter:
-                    return Message.objects.filter(application=application)
-            except Application.DoesNotExist:
+                application = Application.objects.select_related('job').get(id=application_id)
+                if user.id in (application.freelancer_id, application.job.recruiter_id):
+                    queryset = Message.objects.filter(application=application).order_by('timestamp', 'id')
+                    if self.get_serializer_class() is MessageSerializer:
+                        queryset = queryset.select_related('sender')
+                    return queryset
+            except (Application.DoesNotExist, ValueError):
                 pass
         
         return Message.objects.none()
     
+    def perform_create(self, serializer):
+        # The inbox counters are bumped by the post_save signal; keep them in
+        # the same transaction as the message
+        with transaction.atomic():
+            serializer.save()
+    
     @action(detail=False, methods=['post'])
     def mark_read(self, request):
         application_id = request.data.get('application')
-        if application_id:
-            Message.objects.filter(
-                application_id=application_id,
+        if not application_id:
+            return Response({'error': 'Application ID required'}, status=status.HTTP_400_BAD_REQUEST)
+        
+        try:
+            application = Application.objects.select_related('job').get(id=application_id)
+        except (Application.DoesNotExist, ValueError):
+            return Response({'error': 'Application not found'}, status=status.HTTP_404_NOT_FOUND)
+        if request.user.id not in (application.freelancer_id, application.job.recruiter_id):
+            return Response({'error': 'Permission denied'}, status=status.HTTP_403_FORBIDDEN)
+        
+        with transaction.atomic():
+            updated = Message.objects.filter(
+                application=application,
                 is_read=False
             ).exclude(sender=request.user).update(is_read=True)
-            return Response({'message': 'Messages marked as read'})
-        return Response({'error': 'Application ID required'}, status=status.HTTP_400_BAD_REQUEST)
+            if updated:
+                record_read(application, request.user, updated)
+        if updated:
+            publish_read_receipt(application.id, request.user.id, updated)
+        return Response({'message': 'Messages marked as read'})
 
 class ReviewViewSet(viewsets.ModelViewSet):
     queryset = Review.objects.all()
@@ -96,14 +157,35 @@ class ReviewViewSet(viewsets.ModelViewSet):
     
     def get_queryset(self):
         user = self.request.user
+        # Everything ReviewSerializer nests, fetched up front
+        queryset = Review.objects.select_related(
+            'reviewer', 'reviewee', 'job__recruiter', 'job__category'
+        ).prefetch_related('job__attachments')
         
         # Filter based on query parameters
         reviewee_id = self.request.query_params.get('reviewee')
         if reviewee_id:
-            return Review.objects.filter(reviewee_id=reviewee_id)
+            return queryset.filter(reviewee_id=reviewee_id)
         
         # Return reviews given by user
-        return Review.objects.filter(reviewer=user)
+        return queryset.filter(reviewer=user)
+    
+    @action(detail=False, methods=['get'])
+    def histogram(self, request):
+        reviewee_id = request.query_params.get('reviewee')
+        if not reviewee_id or not reviewee_id.isdigit():
+            return Response({'error': 'Reviewee ID required'}, status=status.HTTP_400_BAD_REQUEST)
+        return Response({'reviewee': int(reviewee_id), **rating_histogram(int(reviewee_id))})
+    
+    # The reviewee's rating aggregates are adjusted by the Review signals;
+    # keep them in the same transaction as the review itself
+    def perform_update(self, serializer):
+        with transaction.atomic():
+            serializer.save()
+    
+    def perform_destroy(self, instance):
+        with transaction.atomic():
+            instance.delete()
     
     def perform_create(self, serializer):
         # Ensure the reviewer has permission to review
@@ -126,4 +208,14 @@ class ReviewViewSet(viewsets.ModelViewSet):
         except Job.DoesNotExist:
             raise ValueError("Job not found")
         
-        serializer.save(reviewer=self.request.user)
+        with transaction.atomic():
+            serializer.save(reviewer=self.request.user)
+
+class DashboardSummaryView(APIView):
+    """
+    Everything the dashboard overview shows, in one request
+    """
+    permission_classes = [IsAuthenticated]
+    
+    def get(self, request):
+        return Response(dashboard_summary(request.user))
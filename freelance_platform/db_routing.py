@@ -0,0 +1,127 @@
+"""
+Read-replica routing.
+
+With replicas configured (``DATABASE_REPLICA_URLS``), reads from safe
+(GET/HEAD/OPTIONS) requests go to a random replica; unsafe requests and all
+writes use the primary. Replication lags, so once a request writes
+anything, the rest of that request reads from the primary as well, and
+``ReplicaPinningMiddleware`` keeps the client on the primary for
+``REPLICA_PIN_SECONDS`` afterwards through a cookie, so the next requests
+(reloading the list after ``toggle_status``, say) see the write.
+
+Reads inside a transaction on the primary stay on the primary, and sessions
+are always read from it so a fresh login is never lost to replication lag.
+"""
+import random
+from contextlib import contextmanager
+from contextvars import ContextVar
+
+from asgiref.sync import iscoroutinefunction, markcoroutinefunction
+from django.conf import settings
+from django.db import DEFAULT_DB_ALIAS, connections
+
+PIN_COOKIE = 'db_primary'
+
+SAFE_METHODS = ('GET', 'HEAD', 'OPTIONS')
+
+# Apps read and written on the primary only, and whose writes don't pin
+PRIMARY_ONLY_APPS = {'sessions'}
+
+# Whether the current request reads from the primary from the start (unsafe
+# method, or a recent write by the client), and whether it has written
+_pinned = ContextVar('db_pinned_to_primary', default=False)
+_wrote = ContextVar('db_wrote', default=False)
+
+
+def replica_aliases():
+    return [alias for alias in settings.DATABASES if alias != DEFAULT_DB_ALIAS]
+
+
+def pinned_to_primary():
+    return _pinned.get() or _wrote.get()
+
+
+@contextmanager
+def primary():
+    """
+    Read from the primary inside the block, for work outside requests that
+    must see the latest writes (task workers).
+    """
+    token = _pinned.set(True)
+    try:
+        yield
+    finally:
+        _pinned.reset(token)
+
+
+class ReplicaRouter:
+    def __init__(self):
+        self.replicas = replica_aliases()
+
+    def db_for_read(self, model, **hints):
+        if (not self.replicas or model._meta.app_label in PRIMARY_ONLY_APPS
+                or pinned_to_primary() or connections[DEFAULT_DB_ALIAS].in_atomic_block):
+            return DEFAULT_DB_ALIAS
+        return random.choice(self.replicas)
+
+    def db_for_write(self, model, **hints):
+        if model._meta.app_label not in PRIMARY_ONLY_APPS:
+            _wrote.set(True)
+        return DEFAULT_DB_ALIAS
+
+    def allow_relation(self, obj1, obj2, **hints):
+        # Every alias holds the same data
+        return True
+
+    def allow_migrate(self, db, app_label, model_name=None, **hints):
+        # Replicas get their schema through replication
+        return db == DEFAULT_DB_ALIAS
+
+
+class ReplicaPinningMiddleware:
+    """
+    Pins a request to the primary when the client wrote within the last
+    ``REPLICA_PIN_SECONDS``, and starts that window whenever a request writes.
+    """
+    sync_capable = True
+    async_capable = True
+
+    def __init__(self, get_response):
+        self.get_response = get_response
+        if iscoroutinefunction(self.get_response):
+            markcoroutinefunction(self)
+
+    def __call__(self, request):
+        if iscoroutinefunction(self):
+            return self.__acall__(request)
+        tokens = self.start(request)
+        try:
+            response = self.get_response(request)
+            return self.finish(response)
+        finally:
+            self.reset(tokens)
+
+    async def __acall__(self, request):
+        tokens = self.start(request)
+        try:
+            response = await self.get_response(request)
+            return self.finish(response)
+        finally:
+            self.reset(tokens)
+
+    def start(self, request):
+        # Unsafe requests read what they are about to change from the primary,
+        # so they never write back stale rows. Worker threads serve many
+        # requests; start each from a clean slate.
+        pinned = request.method not in SAFE_METHODS or PIN_COOKIE in request.COOKIES
+        return _pinned.set(pinned), _wrote.set(False)
+
+    def finish(self, response):
+        if _wrote.get():
+            response.set_cookie(PIN_COOKIE, '1', max_age=settings.REPLICA_PIN_SECONDS,
+                                httponly=True, samesite='Lax')
+        return response
+
+    def reset(self, tokens):
+        _pinned.reset(tokens[0])
+        _wrote.reset(tokens[1])
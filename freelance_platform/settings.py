@@ -20,6 +20,8 @@ ALLOWED_HOSTS = ['*']  # Allow all hosts for Railway
 
 # Application definition
 INSTALLED_APPS = [
+    # Must precede staticfiles so runserver serves ASGI (and WebSockets)
+    'daphne',
     'django.contrib.admin',
     'django.contrib.auth',
     'django.contrib.contenttypes',
@@ -35,6 +37,10 @@ INSTALLED_APPS = [
     'allauth.account',
     'allauth.socialaccount',
     'allauth.socialaccount.providers.google',
+    # Must precede channels so runworker runs the task queue; nothing here
+    # uses Channels background workers
+    'taskqueue',
+    'channels',
     
     # Local apps
     'accounts',
@@ -45,6 +51,7 @@ INSTALLED_APPS = [
 MIDDLEWARE = [
     'corsheaders.middleware.CorsMiddleware',
     'django.middleware.security.SecurityMiddleware',
+    'freelance_platform.db_routing.ReplicaPinningMiddleware',
     'whitenoise.middleware.WhiteNoiseMiddleware',
     'django.contrib.sessions.middleware.SessionMiddleware',
     'django.middleware.common.CommonMiddleware',
@@ -74,6 +81,22 @@ TEMPLATES = [
 ]
 
 WSGI_APPLICATION = 'freelance_platform.wsgi.application'
+ASGI_APPLICATION = 'freelance_platform.asgi.application'
+
+# Serve the hot GET endpoints from the async views in */async_views.py. Turn
+# off when running under WSGI, where async views only add overhead.
+ASYNC_READ_VIEWS = os.environ.get('ASYNC_READ_VIEWS', 'True').lower() in ('1', 'true', 'yes')
+
+# Fan-out layer for WebSocket pushes. The in-memory layer only reaches sockets
+# in the same process; use a shared layer such as
+# channels_redis.core.RedisChannelLayer when running several workers.
+CHANNEL_LAYERS = {
+    'default': {
+        'BACKEND': os.environ.get('CHANNEL_LAYER_BACKEND', 'channels.layers.InMemoryChannelLayer'),
+    }
+}
+if 'CHANNEL_LAYER_URL' in os.environ:
+    CHANNEL_LAYERS['default']['CONFIG'] = {'hosts': [os.environ['CHANNEL_LAYER_URL']]}
 
 # Database
 if 'DATABASE_URL' in os.environ:
@@ -92,6 +115,55 @@ else:
         }
     }
 
+# With SQLite, the web process and the task worker write side by side; taking
+# the write lock as a transaction starts makes writers wait for each other
+# instead of failing with "database is locked"
+if DATABASES['default']['ENGINE'] == 'django.db.backends.sqlite3':
+    DATABASES['default'].setdefault('OPTIONS', {})['transaction_mode'] = 'IMMEDIATE'
+
+# Read replicas, as comma-separated database URLs. Reads are spread over them
+# and writes go to the primary (freelance_platform.db_routing); tests use the
+# primary for everything.
+DATABASE_REPLICA_URLS = [url.strip() for url in os.environ.get('DATABASE_REPLICA_URLS', '').split(',')
+                         if url.strip()]
+for index, url in enumerate(DATABASE_REPLICA_URLS, start=1):
+    DATABASES[f'replica_{index}'] = {
+        **dj_database_url.parse(url, conn_max_age=600, conn_health_checks=True),
+        'TEST': {'MIRROR': 'default'},
+    }
+DATABASE_ROUTERS = ['freelance_platform.db_routing.ReplicaRouter']
+
+# Seconds a client keeps reading from the primary after a write, so it sees
+# its own writes despite replication lag
+REPLICA_PIN_SECONDS = int(os.environ.get('REPLICA_PIN_SECONDS', 10))
+
+# Cache (local memory by default; set CACHE_BACKEND/CACHE_LOCATION for a
+# file-based or shared cache)
+CACHES = {
+    'default': {
+        'BACKEND': os.environ.get('CACHE_BACKEND', 'django.core.cache.backends.locmem.LocMemCache'),
+        'LOCATION': os.environ.get('CACHE_LOCATION', 'freelance-hub'),
+        'OPTIONS': {
+            'MAX_ENTRIES': 10000,
+        },
+    }
+}
+
+# Response cache and cache generations for ETags (jobs.cache). The generation
+# counters must be seen by every web and worker process, so this is off with
+# a process-local backend (the local-memory default); set CACHE_BACKEND to
+# Redis or file-based to turn it on
+RESPONSE_CACHE = os.environ.get(
+    'RESPONSE_CACHE', str(CACHES['default']['BACKEND'] != 'django.core.cache.backends.locmem.LocMemCache')
+).lower() == 'true'
+
+# Seconds a cached public API response may live (jobs.cache)
+RESPONSE_CACHE_TIMEOUT = int(os.environ.get('RESPONSE_CACHE_TIMEOUT', 300))
+
+# Seconds a user's dashboard summary may be served from cache
+# (applications.dashboard)
+DASHBOARD_CACHE_TIMEOUT = int(os.environ.get('DASHBOARD_CACHE_TIMEOUT', 30))
+
 # Custom User Model
 AUTH_USER_MODEL = 'accounts.User'
 
@@ -142,6 +214,27 @@ REST_FRAMEWORK = {
     'PAGE_SIZE': 20,
 }
 
+# Freelancer matching (jobs.matching)
+MATCHING_POOL_MAX_AGE = int(os.environ.get('MATCHING_POOL_MAX_AGE', 300))
+MATCHING_PROCESS_POOL_WORKERS = int(os.environ.get('MATCHING_PROCESS_POOL_WORKERS', 0))
+MATCHING_PROCESS_POOL_MIN_ROWS = 200000
+
+# Background tasks (taskqueue), run by manage.py runworker; the Procfile,
+# Dockerfile and nixpacks.toml all start one. TASKS_EAGER runs them inline
+# instead, for setups without a worker.
+TASKS_EAGER = os.environ.get('TASKS_EAGER', 'False').lower() == 'true'
+TASKS_CLAIM_TIMEOUT = int(os.environ.get('TASKS_CLAIM_TIMEOUT', 300))
+
+# Resumable job attachment uploads (jobs.uploads). Partly received files wait
+# in ATTACHMENT_UPLOAD_DIR, which every web process and the task worker must
+# share, and are dropped once untouched for ATTACHMENT_UPLOAD_EXPIRY seconds.
+ATTACHMENT_UPLOAD_DIR = os.environ.get('ATTACHMENT_UPLOAD_DIR', str(BASE_DIR / 'uploads'))
+ATTACHMENT_MAX_SIZE = int(os.environ.get('ATTACHMENT_MAX_SIZE', 500 * 1024 * 1024))
+ATTACHMENT_UPLOAD_EXPIRY = int(os.environ.get('ATTACHMENT_UPLOAD_EXPIRY', 24 * 60 * 60))
+
+# Search box autocomplete (jobs.autocomplete)
+AUTOCOMPLETE_MAX_AGE = int(os.environ.get('AUTOCOMPLETE_MAX_AGE', 300))
+
 # CORS settings
 CORS_ALLOW_ALL_ORIGINS = True  # For development
 CORS_ALLOW_CREDENTIALS = True
@@ -19,18 +19,28 @@ from django.urls import path, include
 from django.conf import settings
 from django.conf.urls.static import static
 from django.views.generic import TemplateView
+from accounts.thumbnails import VARIANT_DIR
+from accounts.views import profile_picture_variant
+from applications.views import DashboardSummaryView
 
 urlpatterns = [
     path('admin/', admin.site.urls),
     path('api/accounts/', include('accounts.urls')),
     path('api/jobs/', include('jobs.urls')),
     path('api/applications/', include('applications.urls')),
+    path('api/dashboard/summary/', DashboardSummaryView.as_view(), name='dashboard-summary'),
     path('accounts/', include('allauth.urls')),
     path('dashboard/', TemplateView.as_view(template_name='dashboard.html'), name='dashboard'),
     path('', TemplateView.as_view(template_name='index.html'), name='home'),
 ]
 
-# Serve static and media files during development
+# Serve static and media files during development; in production the web
+# server (or the storage's own URLs) serves them. Thumbnails go first, to be
+# sent with the long-lived cache headers they get in production.
 if settings.DEBUG:
+    urlpatterns += [
+        path(f'{settings.MEDIA_URL.lstrip("/")}{VARIANT_DIR}/<path:path>', profile_picture_variant,
+             name='profile-picture-variant'),
+    ]
     urlpatterns += static(settings.STATIC_URL, document_root=settings.STATICFILES_DIRS[0])
     urlpatterns += static(settings.MEDIA_URL, document_root=settings.MEDIA_ROOT)
@@ -1,19 +1,48 @@
 from django.contrib import admin
-from .models import Category, Job, JobAttachment
+from .models import AttachmentUpload, Category, Skill, SkillAlias, Job, JobAlert, JobAttachment, SavedSearch
 
 @admin.register(Category)
 class CategoryAdmin(admin.ModelAdmin):
     list_display = ['name', 'description']
     search_fields = ['name']
 
+class SkillAliasInline(admin.TabularInline):
+    model = SkillAlias
+    extra = 1
+
+@admin.register(Skill)
+class SkillAdmin(admin.ModelAdmin):
+    list_display = ['name', 'normalized_name']
+    search_fields = ['name', 'normalized_name', 'aliases__alias']
+    inlines = [SkillAliasInline]
+
 @admin.register(Job)
 class JobAdmin(admin.ModelAdmin):
     list_display = ['title', 'recruiter', 'category', 'job_type', 'status', 'created_at']
     list_filter = ['job_type', 'status', 'experience_level', 'category']
     search_fields = ['title', 'description']
+    readonly_fields = ['canonical_skills']
     date_hierarchy = 'created_at'
 
 @admin.register(JobAttachment)
 class JobAttachmentAdmin(admin.ModelAdmin):
-    list_display = ['job', 'file', 'uploaded_at']
-    list_filter = ['uploaded_at']
+    list_display = ['job', 'name', 'content_type', 'size', 'uploaded_at']
+    list_filter = ['uploaded_at', 'content_type']
+    readonly_fields = ['size', 'sha256', 'content_type']
+
+@admin.register(AttachmentUpload)
+class AttachmentUploadAdmin(admin.ModelAdmin):
+    list_display = ['name', 'job', 'user', 'received', 'size', 'updated_at']
+    readonly_fields = ['received']
+
+@admin.register(SavedSearch)
+class SavedSearchAdmin(admin.ModelAdmin):
+    list_display = ['user', 'name', 'query', 'category', 'job_type', 'experience_level', 'anchor']
+    list_filter = ['job_type', 'experience_level', 'category']
+    search_fields = ['user__username', 'name', 'query']
+    readonly_fields = ['anchor']
+
+@admin.register(JobAlert)
+class JobAlertAdmin(admin.ModelAdmin):
+    list_display = ['user', 'job', 'saved_search', 'is_read', 'created_at']
+    list_filter = ['is_read', 'created_at']
@@ -0,0 +1,94 @@
+"""
+Job alerts: reverse matching of new jobs against saved searches.
+
+Every ``SavedSearch`` is filed under one anchor key, its most selective
+predicate: the longest word of its query, else its category, experience
+level or job type, else ``*``. A new job lists every key a search it
+satisfies could be filed under (one per word of its searchable text, plus
+its category, level and type, plus ``*``), so a single indexed ``anchor IN
+(...)`` lookup returns the only searches that can match. Those candidates are
+checked against all their predicates and the matches written as ``JobAlert``
+rows, so the work per job grows with the number of plausible matches rather
+than with the number of saved searches.
+
+Query words match whole words of the job's title, skills or description,
+and budgets match like the search endpoint's: by overlap with the job's
+effective range.
+"""
+from .models import JobAlert, SavedSearch
+from .search import INDEXED_FIELDS, tokenize
+
+ANY = '*'
+
+# Keys per anchor lookup, well under every database's parameter limit
+KEY_BATCH = 500
+
+
+def search_anchor(saved_search):
+    tokens = tokenize(saved_search.query)
+    if tokens:
+        # Longer words tend to be rarer, so fewer jobs look the search up
+        return 'q:' + max(tokens, key=len)
+    if saved_search.category_id:
+        return f'category:{saved_search.category_id}'
+    if saved_search.experience_level:
+        return f'level:{saved_search.experience_level}'
+    if saved_search.job_type:
+        return f'type:{saved_search.job_type}'
+    return ANY
+
+
+def job_tokens(job):
+    return set(tokenize(' '.join(getattr(job, field) or '' for field in INDEXED_FIELDS)))
+
+
+def job_keys(job, tokens):
+    """
+    Every anchor a saved search matching ``job`` could have.
+    """
+    keys = {
+        ANY,
+        f'category:{job.category_id}',
+        f'level:{job.experience_level}',
+        f'type:{job.job_type}',
+    }
+    keys.update('q:' + token for token in tokens)
+    return sorted(keys)
+
+
+def matches(saved_search, job, tokens):
+    if saved_search.category_id and saved_search.category_id != job.category_id:
+        return False
+    if saved_search.job_type and saved_search.job_type != job.job_type:
+        return False
+    if saved_search.experience_level and saved_search.experience_level != job.experience_level:
+        return False
+    if saved_search.min_budget is not None and (
+            job.effective_max is None or job.effective_max < saved_search.min_budget):
+        return False
+    if saved_search.max_budget is not None and (
+            job.effective_min is None or job.effective_min > saved_search.max_budget):
+        return False
+    return all(token in tokens for token in tokenize(saved_search.query))
+
+
+def match_job(job):
+    """
+    Record an alert for every saved search an open ``job`` matches, except
+    its own recruiter's. Returns the new alerts.
+    """
+    if job.status != 'open':
+        return []
+    tokens = job_tokens(job)
+    keys = job_keys(job, tokens)
+    alerts = []
+    for start in range(0, len(keys), KEY_BATCH):
+        candidates = SavedSearch.objects.filter(anchor__in=keys[start:start + KEY_BATCH]).exclude(
+            user_id=job.recruiter_id
+        )
+        alerts.extend(
+            JobAlert(user_id=saved_search.user_id, saved_search=saved_search, job=job)
+            for saved_search in candidates if matches(saved_search, job, tokens)
+        )
+    JobAlert.objects.bulk_create(alerts, ignore_conflicts=True)
+    return alerts
@@ -0,0 +1,71 @@
+"""
+Async read path for the hot GET endpoints.
+
+Under an ASGI server a sync DRF view holds a thread for the whole request,
+however long it waits on the database. The views built on ``AsyncReadView``
+serve GET and HEAD as coroutines through Django's async ORM and hand every
+other method (and token-authenticated requests) to the sync DRF view for the
+same URL, so writes keep their existing behaviour.
+
+They mirror the DRF defaults this project uses: session authentication,
+AllowAny / IsAuthenticated, JSON output and the same serializers, response
+cache and conditional request handling. They are routed ahead of the DRF
+routes when ``ASYNC_READ_VIEWS`` is on (the default); turn it off when
+serving the project through WSGI.
+"""
+from asgiref.sync import sync_to_async
+from django.http import HttpResponseNotAllowed
+from django.utils.cache import patch_vary_headers
+from django.utils.decorators import classonlymethod
+from django.views import View
+from django.views.decorators.csrf import csrf_exempt
+from rest_framework import status
+from rest_framework.exceptions import APIException
+from rest_framework.renderers import JSONRenderer
+from rest_framework.request import Request
+from rest_framework.response import Response
+
+READ_METHODS = ('GET', 'HEAD')
+
+
+class AsyncReadView(View):
+    """
+    Async GET/HEAD handler with a sync DRF view behind it for everything else.
+
+    Subclasses implement ``async def get(self, request, ...)`` taking a DRF
+    ``Request`` and returning a DRF ``Response``, and pass the sync view as
+    ``as_view(write_view=...)``.
+    """
+    authenticated_only = False
+    write_view = None
+
+    @classonlymethod
+    def as_view(cls, **initkwargs):
+        # Writes are CSRF-checked by DRF's SessionAuthentication, as usual
+        return csrf_exempt(super().as_view(**initkwargs))
+
+    async def dispatch(self, request, *args, **kwargs):
+        if request.method not in READ_METHODS or request.headers.get('Authorization'):
+            if self.write_view is None:
+                return HttpResponseNotAllowed(READ_METHODS)
+            return await sync_to_async(self.write_view)(request, *args, **kwargs)
+
+        drf_request = Request(request)
+        drf_request.user = await request.auser()
+        if self.authenticated_only and not drf_request.user.is_authenticated:
+            response = Response({'detail': 'Authentication credentials were not provided.'},
+                                status=status.HTTP_403_FORBIDDEN)
+        else:
+            try:
+                response = await self.get(drf_request, *args, **kwargs)
+            except APIException as exc:
+                response = Response({'detail': exc.detail}, status=exc.status_code)
+        return self.finalize_response(drf_request, response)
+
+    def finalize_response(self, request, response):
+        if isinstance(response, Response):
+            response.accepted_renderer = JSONRenderer()
+            response.accepted_media_type = JSONRenderer.media_type
+            response.renderer_context = {'request': request, 'response': response, 'view': self}
+        patch_vary_headers(response, ['Accept'])
+        return response
@@ -0,0 +1,75 @@
+from rest_framework.exceptions import NotFound
+from rest_framework.response import Response
+from accounts.models import User
+from .async_api import AsyncReadView
+from .cache import cache_response
+from .conditional import aobject_validators, alist_validators, conditional
+from .facets import asearch_facets, wants_facets, without_facet_filters
+from .models import Category, Job, JobAttachment
+from .pagination import JobCursorPagination
+from .serializers import JobSerializer, job_list_data, job_list_rows
+from .skills import afilter_by_skills
+from .views import filter_jobs, search_queryset
+
+
+async def job_list_queryset(request):
+    queryset = filter_jobs(
+        Job.objects.select_related('recruiter', 'category'), request.query_params, request.user
+    )
+    skills = request.query_params.get('skills', None)
+    if skills:
+        queryset = await afilter_by_skills(queryset, skills)
+    return queryset.order_by('-created_at', '-id')
+
+
+async def job_validators(view, request, pk=None, **kwargs):
+    return await aobject_validators(Job.objects.filter(pk=pk), ('updated_at', 'recruiter__updated_at'),
+                                    models=(Category, JobAttachment))
+
+
+async def job_list_validators(view, request, *args, **kwargs):
+    return await alist_validators(request, await job_list_queryset(request), models=(Category, User))
+
+class JobListView(AsyncReadView):
+    """
+    Async ``GET /api/jobs/jobs/``, matching JobViewSet.list
+    """
+    
+    # Authenticated users can ask for their own jobs, so only cache anonymous reads
+    @conditional(job_list_validators, use_last_modified=False)
+    @cache_response(Job, Category, User, anonymous_only=True)
+    async def get(self, request):
+        paginator = JobCursorPagination()
+        rows = job_list_rows(await job_list_queryset(request), paginator.ordering)
+        page = await paginator.apaginate_queryset(rows, request, view=self)
+        return paginator.get_paginated_response(job_list_data(page))
+
+class JobDetailView(AsyncReadView):
+    """
+    Async ``GET /api/jobs/jobs/{id}/``, matching JobViewSet.retrieve
+    """
+    
+    @conditional(job_validators)
+    @cache_response(Job, Category, User, JobAttachment, anonymous_only=True)
+    async def get(self, request, pk=None):
+        job = await Job.objects.select_related(
+            'recruiter', 'category'
+        ).prefetch_related('attachments').filter(pk=pk).afirst()
+        if job is None:
+            raise NotFound()
+        return Response(JobSerializer(job, context={'request': request}).data)
+
+class JobSearchView(AsyncReadView):
+    """
+    Async ``GET /api/jobs/search/``, matching jobs.views.JobSearchView
+    """
+    
+    @cache_response(Job, Category, User)
+    async def get(self, request):
+        jobs, paginator = search_queryset(request.query_params)
+        page = await paginator.apaginate_queryset(job_list_rows(jobs, paginator.ordering), request, view=self)
+        response = paginator.get_paginated_response(job_list_data(page))
+        if wants_facets(request.query_params):
+            facet_jobs, _ = search_queryset(without_facet_filters(request.query_params))
+            response.data['facets'] = await asearch_facets(facet_jobs, request.query_params)
+        return response
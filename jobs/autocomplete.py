@@ -0,0 +1,323 @@
+"""
+In-process autocomplete over job titles, skills and category names.
+
+Every worker process keeps an ``AutocompleteIndex``: one entry per distinct
+title, skill and category, weighted by how many open jobs use it, and a
+sorted array of lookup keys (each entry's normalized text from every word
+onwards, so "dev" finds "Django developer") pointing at those entries.
+
+Over the key array sits a segment tree whose every node holds the best entry
+below it (heaviest, then categories before skills before titles, then by
+text). A lookup finds the prefix's key range with two binary searches and
+pops the best entries off the tree nodes covering it, so it costs about
+``limit * log(keys)`` steps however many keys match, and never touches the
+database. A job save changes a few entries' weights, and each change only
+rewrites the tree paths above that entry's own keys and forgets the
+remembered lookups for their prefixes. Keys of entries first
+seen after a load (a new title or skill) wait in a small sorted side list,
+scanned by every lookup, until the next load folds them in; loads also drop
+entries no open job uses any more.
+
+Like the matching pool, the index is loaded on first use, updated in place
+from the ``Job`` signals raised in this process, and fully reloaded once it is
+older than ``AUTOCOMPLETE_MAX_AGE`` seconds so that writes made by other
+workers are eventually picked up. Category changes are rare and just mark it
+for reloading.
+"""
+import heapq
+import threading
+import time
+from bisect import bisect_left, insort
+
+from django.conf import settings
+
+from .models import Category, Job
+from .skills import normalize_skill, parse_skills
+
+# Suggestion types, in the order they win ties
+TITLE = 'title'
+SKILL = 'skill'
+CATEGORY = 'category'
+TYPE_ORDER = {CATEGORY: 0, SKILL: 1, TITLE: 2}
+
+# Fields whose changes alter a job's contribution to the index
+SOURCE_FIELDS = {'title', 'skills_required', 'category', 'category_id', 'status'}
+
+# Tree value of keys whose entry is not suggested; sorts after every entry
+NO_ENTRY = (float('inf'),)
+
+# Distinct prefixes whose suggestions are remembered
+MAX_CACHED_LOOKUPS = 10000
+
+# Sorts after every character, to end a prefix range
+KEY_END = '\U0010ffff'
+
+
+def normalize(text):
+    return normalize_skill(text or '')
+
+
+def _word_keys(text):
+    words = normalize(text).split()
+    return {' '.join(words[i:]) for i in range(len(words))}
+
+
+class AutocompleteIndex:
+    """
+    Weighted prefix lookups over the open jobs' titles and skills and the
+    category names.
+    """
+
+    def __init__(self):
+        self.lock = threading.RLock()
+        self.loaded_at = None
+        self.clear()
+
+    def clear(self):
+        # Entries are [type, text, weight, category id]; entry_of maps
+        # (type, normalized text) to the entry's position
+        self.entries = []
+        self.entry_of = {}
+        # The sorted keys, their entries, where each entry's keys are, and
+        # the tree over them: leaf ``size + i`` is key i's entry value and
+        # every other node the smallest value below it
+        self.keys = []
+        self.key_entries = []
+        self.key_positions = {}
+        self.size = 1
+        self.tree = [NO_ENTRY, NO_ENTRY]
+        # (key, entry) pairs of entries added since the load, sorted
+        self.new_keys = []
+        self.job_entries = {}
+        # {prefix: {limit: suggestions}}
+        self.cached = {}
+
+    @property
+    def is_stale(self):
+        max_age = getattr(settings, 'AUTOCOMPLETE_MAX_AGE', 300)
+        return self.loaded_at is None or time.monotonic() - self.loaded_at > max_age
+
+    def load(self):
+        """
+        Rebuild the index with two queries: categories and open jobs. Entries
+        no open job uses any more are left out.
+        """
+        categories = list(Category.objects.values_list('id', 'name'))
+        jobs = list(Job.objects.filter(status='open').values_list(
+            'id', 'title', 'skills_required', 'category_id'
+        ))
+
+        with self.lock:
+            self.clear()
+            pairs = []
+            for category_id, name in categories:
+                pairs.extend(self._add_entry(CATEGORY, name, category_id, insert_keys=False))
+            for job_id, title, skills, category_id in jobs:
+                entries, new_pairs = self._job_entries(title, skills, category_id, insert_keys=False)
+                pairs.extend(new_pairs)
+                self._count(job_id, entries)
+            pairs.sort()
+            self.keys = [key for key, _ in pairs]
+            self.key_entries = [entry for _, entry in pairs]
+            for position, entry in enumerate(self.key_entries):
+                self.key_positions.setdefault(entry, []).append(position)
+            self._build_tree()
+            self.loaded_at = time.monotonic()
+
+    def ensure_loaded(self):
+        if self.is_stale:
+            self.load()
+
+    def _value(self, entry):
+        """
+        The entry's place in suggestion order, or NO_ENTRY when it isn't
+        suggested (no open job uses it and it isn't a category).
+        """
+        kind, text, weight, _ = self.entries[entry]
+        if weight <= 0 and kind != CATEGORY:
+            return NO_ENTRY
+        return (-weight, TYPE_ORDER[kind], text.lower(), entry)
+
+    def _build_tree(self):
+        self.size = 1
+        while self.size < len(self.keys):
+            self.size *= 2
+        values = [self._value(entry) for entry in range(len(self.entries))]
+        tree = [NO_ENTRY] * (2 * self.size)
+        tree[self.size:self.size + len(self.keys)] = [values[entry] for entry in self.key_entries]
+        for node in range(self.size - 1, 0, -1):
+            tree[node] = min(tree[2 * node], tree[2 * node + 1])
+        self.tree = tree
+
+    def _refresh(self, entry):
+        # Only the tree paths above the entry's own keys can change
+        positions = self.key_positions.get(entry)
+        if not positions:
+            return
+        value = self._value(entry)
+        tree = self.tree
+        for position in positions:
+            node = self.size + position
+            tree[node] = value
+            node //= 2
+            while node:
+                tree[node] = min(tree[2 * node], tree[2 * node + 1])
+                node //= 2
+
+    def _add_entry(self, kind, text, category_id=None, insert_keys=True):
+        """
+        The (key, entry) pairs of a new entry, which are added to the new
+        keys unless ``insert_keys`` is false. Known entries add none.
+        """
+        identity = (kind, category_id if kind == CATEGORY else normalize(text))
+        if identity in self.entry_of:
+            return []
+        entry = len(self.entries)
+        self.entries.append([kind, text, 0, category_id])
+        self.entry_of[identity] = entry
+        pairs = [(key, entry) for key in _word_keys(text)]
+        if insert_keys:
+            for pair in pairs:
+                insort(self.new_keys, pair)
+        return pairs
+
+    def _job_entries(self, title, skills, category_id, insert_keys=True):
+        pairs = []
+        entries = []
+        terms = [(TITLE, title)] + [(SKILL, name) for name in parse_skills(skills)]
+        for kind, text in terms:
+            if not normalize(text):
+                continue
+            pairs.extend(self._add_entry(kind, text, insert_keys=insert_keys))
+            entries.append(self.entry_of[(kind, normalize(text))])
+        category = self.entry_of.get((CATEGORY, category_id))
+        if category is not None:
+            entries.append(category)
+        return entries, pairs
+
+    def _forget_lookups(self, entry):
+        # Only the prefixes of the entry's own keys can suggest it
+        if not self.cached:
+            return
+        for key in _word_keys(self.entries[entry][1]):
+            for end in range(1, len(key) + 1):
+                self.cached.pop(key[:end], None)
+
+    def _count(self, job_id, entries, step=1):
+        for entry in entries:
+            self.entries[entry][2] += step
+            self._refresh(entry)
+            self._forget_lookups(entry)
+        if step > 0:
+            self.job_entries[job_id] = entries
+
+    def update_job(self, job_id, title, skills, category_id, is_open):
+        """
+        Insert, refresh or drop one job's contribution without reloading.
+        """
+        with self.lock:
+            if self.loaded_at is None:
+                return
+            self._count(job_id, self.job_entries.pop(job_id, ()), step=-1)
+            if is_open:
+                entries, _ = self._job_entries(title, skills, category_id)
+                self._count(job_id, entries)
+
+    def remove_job(self, job_id):
+        with self.lock:
+            if job_id in self.job_entries:
+                self._count(job_id, self.job_entries.pop(job_id), step=-1)
+
+    def _best_in_range(self, low, high, limit):
+        """
+        Values of the ``limit`` best distinct entries among keys
+        ``low`` to ``high - 1``, best first.
+        """
+        tree = self.tree
+        heap = []
+        # The tree nodes exactly covering the range
+        first, last = low + self.size, high + self.size
+        while first < last:
+            if first & 1:
+                heap.append((tree[first], first))
+                first += 1
+            if last & 1:
+                last -= 1
+                heap.append((tree[last], last))
+            first //= 2
+            last //= 2
+        heapq.heapify(heap)
+        best = []
+        seen = set()
+        while heap and len(best) < limit:
+            value, node = heapq.heappop(heap)
+            if value == NO_ENTRY:
+                break
+            if node < self.size:
+                heapq.heappush(heap, (tree[2 * node], 2 * node))
+                heapq.heappush(heap, (tree[2 * node + 1], 2 * node + 1))
+            elif value[-1] not in seen:
+                # An entry with two words starting with the prefix has two keys
+                seen.add(value[-1])
+                best.append(value)
+        return best
+
+    def suggest(self, prefix, limit=10):
+        """
+        ``[{'type', 'text', 'count'}, ...]`` for the ``limit`` heaviest
+        entries with a word starting with ``prefix``. Categories also carry
+        their ``id``, and are suggested even without open jobs.
+        """
+        prefix = normalize(prefix)
+        if not prefix:
+            return []
+        with self.lock:
+            cached = self.cached.get(prefix, {}).get(limit)
+            if cached is not None:
+                return cached
+            low = bisect_left(self.keys, prefix)
+            high = bisect_left(self.keys, prefix + KEY_END, low)
+            best = self._best_in_range(low, high, limit)
+
+            low = bisect_left(self.new_keys, (prefix,))
+            high = bisect_left(self.new_keys, (prefix + KEY_END,), low)
+            if low < high:
+                values = {self._value(entry) for _, entry in self.new_keys[low:high]}
+                values.discard(NO_ENTRY)
+                best = heapq.nsmallest(limit, values.union(best))
+
+            suggestions = []
+            for *_, entry in best:
+                kind, text, weight, category_id = self.entries[entry]
+                suggestion = {'type': kind, 'text': text, 'count': weight}
+                if kind == CATEGORY:
+                    suggestion['id'] = category_id
+                suggestions.append(suggestion)
+            if prefix not in self.cached and len(self.cached) >= MAX_CACHED_LOOKUPS:
+                self.cached = {}
+            self.cached.setdefault(prefix, {})[limit] = suggestions
+            return suggestions
+
+
+index = AutocompleteIndex()
+
+
+def suggest(prefix, limit=10):
+    index.ensure_loaded()
+    return index.suggest(prefix, limit)
+
+
+def refresh_job(job):
+    index.update_job(job.pk, job.title, job.skills_required, job.category_id, job.status == 'open')
+
+
+def forget_job(job_id):
+    index.remove_job(job_id)
+
+
+def invalidate():
+    """
+    Reload on the next lookup, after category changes or writes that bypass
+    the ``Job`` signals.
+    """
+    index.loaded_at = None
@@ -0,0 +1,226 @@
+"""
+In-process endpoint benchmark used by ``manage.py benchmark_endpoints``.
+
+Every GET route registered on the jobs, applications and accounts routers
+(list, detail and GET actions) plus the non-router read endpoints is driven
+through Django's test client as an anonymous user, a freelancer and a
+recruiter. Each (endpoint, role) pair records latency percentiles, the number
+of queries and the response size, keyed by the URL pattern rather than the
+concrete ids so reports from different datasets and runs line up.
+"""
+import statistics
+import time
+from contextlib import ExitStack, contextmanager
+
+from django.db import connections
+from django.db.models import Count
+from django.test import Client
+from django.test.utils import CaptureQueriesContext
+
+from accounts.models import User
+from accounts.urls import router as accounts_router
+from applications.models import Review
+from applications.urls import router as applications_router
+from .models import Job
+from .urls import router as jobs_router
+
+ROUTERS = (
+    ('/api/jobs/', jobs_router),
+    ('/api/applications/', applications_router),
+    ('/api/accounts/', accounts_router),
+)
+
+# Read endpoints routed outside the routers
+EXTRA_ENDPOINTS = (
+    '/api/jobs/search/?q={word}',
+    '/api/jobs/search/?min_budget=1000&max_budget=2000',
+    '/api/jobs/autocomplete/?q={word}',
+    '/api/accounts/profile/',
+    '/api/dashboard/summary/',
+)
+
+# Query strings some routes need to do real work, filled from the context
+ENDPOINT_PARAMS = {
+    'review-histogram': 'reviewee={reviewee}',
+}
+
+# Where each role picks the object for detail routes from, so the detail
+# requests hit objects the role is allowed to see
+LIST_PARAMS = {
+    ('job', 'recruiter'): {'my_jobs': 'true'},
+}
+
+# Routes whose detail view only serves the requesting user's own object
+OWN_OBJECTS = {
+    'freelancerprofile': 'freelancer_profile',
+    'recruiterprofile': 'recruiter_profile',
+}
+
+ROLES = ('anonymous', 'freelancer', 'recruiter')
+
+# p99 over a few dozen samples is little more than the slowest request, so it
+# is reported but not compared
+COMPARED_LATENCIES = ('p50_ms', 'p95_ms')
+
+
+def percentile(samples, fraction):
+    ordered = sorted(samples)
+    return ordered[min(int(len(ordered) * fraction), len(ordered) - 1)]
+
+
+def benchmark_users():
+    """
+    The busiest freelancer and recruiter, whose requests touch the most rows.
+    """
+    freelancer = User.objects.filter(user_type='freelancer').annotate(
+        activity=Count('applications')
+    ).order_by('-activity', 'id').first()
+    recruiter = User.objects.filter(user_type='recruiter').annotate(
+        activity=Count('posted_jobs')
+    ).order_by('-activity', 'id').first()
+    if freelancer is None or recruiter is None:
+        raise ValueError('The dataset needs at least one freelancer and one recruiter')
+    return {'anonymous': None, 'freelancer': freelancer, 'recruiter': recruiter}
+
+
+def benchmark_context():
+    job = Job.objects.order_by('-created_at', '-id').first()
+    review = Review.objects.values('reviewee').annotate(total=Count('id')).order_by('-total').first()
+    return {
+        'word': job.title.split()[0].lower() if job else 'developer',
+        'reviewee': review['reviewee'] if review else 0,
+    }
+
+
+def _first_id(response):
+    if response.status_code != 200:
+        return None
+    data = response.json()
+    if isinstance(data, dict):
+        data = data.get('results', [])
+    return data[0].get('id') if data else None
+
+
+def discover_endpoints(client, role, user, context):
+    """
+    ``(pattern, url)`` pairs for every GET endpoint, as seen by ``client``.
+
+    Detail routes use the role's own object or the first one in the matching
+    list response, and are left out when the role has none.
+    """
+    endpoints = []
+    for base, router in ROUTERS:
+        for prefix, viewset, basename in router.registry:
+            list_url = f'{base}{prefix}/'
+            endpoints.append((list_url, list_url))
+
+            if basename in OWN_OBJECTS:
+                own = getattr(user, OWN_OBJECTS[basename], None) if user else None
+                detail_pk = own.pk if own else None
+            else:
+                detail_pk = _first_id(client.get(list_url, LIST_PARAMS.get((basename, role), {})))
+            for action in viewset.get_extra_actions():
+                if 'get' not in action.mapping:
+                    continue
+                query = ENDPOINT_PARAMS.get(f'{basename}-{action.url_name}')
+                query = f'?{query}' if query else ''
+                if not action.detail:
+                    path = f'{list_url}{action.url_path}/{query}'
+                    endpoints.append((path, path.format(**context)))
+                elif detail_pk is not None:
+                    path = f'{action.url_path}/{query}'
+                    endpoints.append((f'{list_url}{{id}}/{path}',
+                                      f'{list_url}{detail_pk}/{path.format(**context)}'))
+            if detail_pk is not None:
+                endpoints.append((f'{list_url}{{id}}/', f'{list_url}{detail_pk}/'))
+
+    for pattern in EXTRA_ENDPOINTS:
+        endpoints.append((pattern, pattern.format(**context)))
+    return endpoints
+
+
+@contextmanager
+def capture_queries():
+    """
+    Capture the queries on every database, replicas included. Aliases for the
+    same database (test mirrors) are captured once.
+    """
+    databases = {}
+    for alias in connections:
+        settings_dict = connections[alias].settings_dict
+        databases.setdefault((settings_dict['ENGINE'], str(settings_dict['NAME'])), alias)
+    with ExitStack() as stack:
+        yield [stack.enter_context(CaptureQueriesContext(connections[alias])) for alias in databases.values()]
+
+
+def measure(client, url, iterations, warmup=2):
+    for _ in range(warmup):
+        client.get(url)
+
+    # Count queries on a separate request so the capture doesn't skew timings;
+    # read the count straight away, before later requests reset the query log
+    with capture_queries() as captures:
+        response = client.get(url)
+    query_count = sum(len(queries) for queries in captures)
+
+    latencies = []
+    for _ in range(iterations):
+        started = time.perf_counter()
+        client.get(url)
+        latencies.append((time.perf_counter() - started) * 1000)
+
+    return {
+        'status': response.status_code,
+        'queries': query_count,
+        'bytes': len(response.content),
+        'mean_ms': round(statistics.fmean(latencies), 3),
+        'p50_ms': round(statistics.median(latencies), 3),
+        'p95_ms': round(percentile(latencies, 0.95), 3),
+        'p99_ms': round(percentile(latencies, 0.99), 3),
+    }
+
+
+def run_benchmark(iterations=50, roles=ROLES, log=print):
+    """
+    Benchmark every endpoint for each role; returns ``{'<pattern> [<role>]': result}``.
+    """
+    users = benchmark_users()
+    context = benchmark_context()
+    results = {}
+    for role in roles:
+        client = Client()
+        if users[role] is not None:
+            client.force_login(users[role])
+        for pattern, url in discover_endpoints(client, role, users[role], context):
+            key = f'{pattern} [{role}]'
+            results[key] = measure(client, url, iterations)
+            log(f'{key}: {results[key]["p50_ms"]:.1f} ms p50, {results[key]["queries"]} queries')
+    return results
+
+
+def compare_reports(baseline, current, threshold=0.25, min_delta_ms=1.0):
+    """
+    Regressions of ``current`` against ``baseline``, as readable strings.
+
+    p50 or p95 latency regresses when it grows by more than ``threshold``
+    (relative) and ``min_delta_ms`` (absolute, to ignore noise on fast
+    endpoints); query counts regress on any increase and response sizes when
+    they grow by more than ``threshold``. Endpoints missing from either side
+    are ignored.
+    """
+    regressions = []
+    for key, new in current.items():
+        old = baseline.get(key)
+        if old is None:
+            continue
+        if new['status'] != old['status']:
+            regressions.append(f'{key}: status {old["status"]} -> {new["status"]}')
+        for metric in COMPARED_LATENCIES:
+            delta = new[metric] - old[metric]
+            if delta > min_delta_ms and delta > old[metric] * threshold:
+                regressions.append(f'{key}: {metric} {old[metric]:.1f} -> {new[metric]:.1f}')
+        if new['queries'] > old['queries']:
+            regressions.append(f'{key}: queries {old["queries"]} -> {new["queries"]}')
+        if new['bytes'] > old['bytes'] * (1 + threshold):
+            regressions.append(f'{key}: bytes {old["bytes"]} -> {new["bytes"]}')
+    return regressions
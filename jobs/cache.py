@@ -0,0 +1,167 @@
+"""
+Versioned response cache for public read endpoints.
+
+Each cached model has a generation counter in the cache. A response is stored
+under a key built from the view, its normalized query parameters and the
+current generation of every model it depends on; saving or deleting any of
+those models bumps its generation (see jobs.signals), so stale entries are
+simply never read again and expire on their own.
+
+The generation counters must be shared by every process that saves models
+or serves responses (web workers and ``runworker`` alike), so the cache is on
+only with ``RESPONSE_CACHE``, which defaults to on for any backend but the
+process-local ``LocMemCache``; the ``jobs.E001`` check refuses to start with
+both. With the cache off every response is computed, and ETags cover only
+each row's own timestamps: a change to a nested model (a category's name, a
+recruiter's profile) shows in responses but not in their ETags.
+"""
+import asyncio
+import hashlib
+import time
+from functools import wraps
+
+from asgiref.sync import sync_to_async
+from django.conf import settings
+from django.core.cache import cache
+from rest_framework.response import Response
+
+GENERATION_PREFIX = 'response-cache:generation:'
+RESPONSE_PREFIX = 'response-cache:response:'
+
+
+def _label(model):
+    return model if isinstance(model, str) else model._meta.label_lower
+
+
+def _fresh_generation():
+    # A counter that was evicted must not restart at a value it already had,
+    # or responses cached under that old value would be served again
+    return time.time_ns()
+
+
+def get_generations(models):
+    if not settings.RESPONSE_CACHE:
+        return [0] * len(models)
+    keys = [GENERATION_PREFIX + _label(model) for model in models]
+    found = cache.get_many(keys)
+    missing = {key: _fresh_generation() for key in keys if key not in found}
+    if missing:
+        cache.set_many(missing, None)
+        found.update(missing)
+    return [found[key] for key in keys]
+
+
+def bump_generation(model):
+    if not settings.RESPONSE_CACHE:
+        return
+    key = GENERATION_PREFIX + _label(model)
+    try:
+        cache.incr(key)
+    except ValueError:
+        cache.set(key, _fresh_generation(), None)
+
+
+def normalize_query_params(query_params):
+    """
+    Sorted (key, value) pairs with blank values dropped, so equivalent query
+    strings share a cache entry.
+    """
+    return sorted(
+        (key, value)
+        for key in query_params
+        for value in query_params.getlist(key)
+        if value != ''
+    )
+
+
+def response_cache_key(request, name, models, kwargs):
+    parts = [
+        name,
+        request.get_host(),
+        request.path,
+        repr(sorted(kwargs.items())),
+        repr(normalize_query_params(request.query_params)),
+        repr(get_generations(models)),
+    ]
+    digest = hashlib.md5('|'.join(parts).encode()).hexdigest()
+    return RESPONSE_PREFIX + digest
+
+
+def memoize_for_generations(request, name, models, compute, kwargs=None):
+    """
+    Cache ``compute()`` for this request's URL until one of ``models`` changes.
+    """
+    if not settings.RESPONSE_CACHE:
+        return compute()
+    key = response_cache_key(request, name, models, kwargs or {})
+    value = cache.get(key)
+    if value is None:
+        value = compute()
+        cache.set(key, value, settings.RESPONSE_CACHE_TIMEOUT)
+    return value
+
+
+async def amemoize_for_generations(request, name, models, compute, kwargs=None):
+    """
+    ``memoize_for_generations`` for an async ``compute``.
+    """
+    if not settings.RESPONSE_CACHE:
+        return await compute()
+    key = await sync_to_async(response_cache_key)(request, name, models, kwargs or {})
+    value = await cache.aget(key)
+    if value is None:
+        value = await compute()
+        await cache.aset(key, value, settings.RESPONSE_CACHE_TIMEOUT)
+    return value
+
+
+def cache_response(*models, anonymous_only=False, timeout=None):
+    """
+    Cache a DRF view method's successful GET responses until one of ``models``
+    changes.
+
+    ``anonymous_only`` skips the cache for authenticated users, for endpoints
+    whose output can depend on who is asking. Async view methods get an async
+    wrapper.
+    """
+    def decorator(view_method):
+        name = view_method.__qualname__
+
+        def timeout_seconds():
+            return timeout if timeout is not None else settings.RESPONSE_CACHE_TIMEOUT
+
+        if asyncio.iscoroutinefunction(view_method):
+            @wraps(view_method)
+            async def async_wrapper(self, request, *args, **kwargs):
+                if (not settings.RESPONSE_CACHE or request.method != 'GET'
+                        or (anonymous_only and request.user.is_authenticated)):
+                    return await view_method(self, request, *args, **kwargs)
+
+                key = await sync_to_async(response_cache_key)(request, name, models, kwargs)
+                data = await cache.aget(key)
+                if data is not None:
+                    return Response(data)
+
+                response = await view_method(self, request, *args, **kwargs)
+                if response.status_code == 200:
+                    await cache.aset(key, response.data, timeout_seconds())
+                return response
+            return async_wrapper
+
+        @wraps(view_method)
+        def wrapper(self, request, *args, **kwargs):
+            if (not settings.RESPONSE_CACHE or request.method != 'GET'
+                    or (anonymous_only and request.user.is_authenticated)):
+                return view_method(self, request, *args, **kwargs)
+
+            key = response_cache_key(request, name, models, kwargs)
+            data = cache.get(key)
+            if data is not None:
+                return Response(data)
+
+            response = view_method(self, request, *args, **kwargs)
+            if response.status_code == 200:
+                cache.set(key, response.data, timeout_seconds())
+            return response
+        return wrapper
+    return decorator
@@ -0,0 +1,20 @@
+from django.conf import settings
+from django.core.checks import Error, register
+
+# Backends whose entries only the process that wrote them can see
+PROCESS_LOCAL_BACKENDS = ('django.core.cache.backends.locmem.LocMemCache',)
+
+
+@register()
+def check_response_cache_backend(app_configs, **kwargs):
+    """
+    The response cache's generation counters are bumped by whichever process
+    saves a model, so every process must read them from the same cache.
+    """
+    if settings.RESPONSE_CACHE and settings.CACHES['default']['BACKEND'] in PROCESS_LOCAL_BACKENDS:
+        return [Error(
+            'RESPONSE_CACHE needs a cache shared by every process.',
+            hint='Set CACHE_BACKEND to a Redis or file-based backend, or RESPONSE_CACHE=false.',
+            id='jobs.E001',
+        )]
+    return []
@@ -0,0 +1,189 @@
+"""
+HTTP conditional request support (ETag / Last-Modified) for DRF views.
+
+Validators are computed from cheap aggregate queries, so a matching
+``If-None-Match`` / ``If-Modified-Since`` is answered with 304 before the view
+queries and serializes anything. On ``PUT``/``PATCH``/``DELETE`` a stale
+``If-Match`` is rejected with 412, giving optimistic concurrency control.
+"""
+import asyncio
+import hashlib
+from functools import wraps
+
+from asgiref.sync import sync_to_async
+from django.db import transaction
+from django.db.models import Count, Max
+from django.utils.cache import get_conditional_response
+from django.utils.http import http_date, quote_etag
+from rest_framework import status
+from rest_framework.response import Response
+
+from .cache import amemoize_for_generations, get_generations, memoize_for_generations, normalize_query_params
+
+SAFE_METHODS = ('GET', 'HEAD', 'OPTIONS')
+
+
+def make_etag(*parts):
+    return hashlib.md5(repr(parts).encode()).hexdigest()
+
+
+def object_validators(queryset, timestamp_fields=('updated_at',), models=()):
+    """
+    Validators for a single object: its newest ``timestamp_fields`` value,
+    plus the cache generations of ``models`` it nests but has no timestamp for.
+
+    Returns ``(None, None)`` when the object does not exist.
+    """
+    row = queryset.order_by().values_list('pk', *timestamp_fields).first()
+    return _object_validators(queryset, row, get_generations(models))
+
+
+async def aobject_validators(queryset, timestamp_fields=('updated_at',), models=()):
+    row = await queryset.order_by().values_list('pk', *timestamp_fields).afirst()
+    return _object_validators(queryset, row, await sync_to_async(get_generations)(models))
+
+
+def _object_validators(queryset, row, generations):
+    if row is None:
+        return None, None
+    timestamps = [value for value in row[1:] if value is not None]
+    last_modified = max(timestamps) if timestamps else None
+    return make_etag(queryset.model._meta.label_lower, row, generations), last_modified
+
+
+def list_validators(request, queryset, timestamp_field='updated_at', models=()):
+    """
+    Validators for a list: row count and newest timestamp of the filtered
+    queryset, the request's query parameters and who is asking.
+
+    The aggregate is memoized against the listed model's cache generation, so
+    repeat requests for an unchanged list do not query at all.
+    """
+    def compute():
+        summary = queryset.order_by().aggregate(
+            last_modified=Max(timestamp_field), count=Count('pk')
+        )
+        return _list_validators(request, queryset, summary, get_generations(models))
+
+    name = f'list-validators:{queryset.model._meta.label_lower}:{request.user.pk}'
+    return memoize_for_generations(request, name, (queryset.model,) + tuple(models), compute)
+
+
+async def alist_validators(request, queryset, timestamp_field='updated_at', models=()):
+    async def compute():
+        summary = await queryset.order_by().aaggregate(
+            last_modified=Max(timestamp_field), count=Count('pk')
+        )
+        generations = await sync_to_async(get_generations)(models)
+        return _list_validators(request, queryset, summary, generations)
+
+    name = f'list-validators:{queryset.model._meta.label_lower}:{request.user.pk}'
+    return await amemoize_for_generations(request, name, (queryset.model,) + tuple(models), compute)
+
+
+def _list_validators(request, queryset, summary, generations):
+    etag = make_etag(
+        queryset.model._meta.label_lower,
+        summary['count'],
+        summary['last_modified'],
+        normalize_query_params(request.query_params),
+        request.user.pk,
+        generations,
+    )
+    return etag, summary['last_modified']
+
+
+def lock_if_unsafe(request, queryset):
+    """
+    Lock the validated row for the rest of the transaction on writes, so a
+    concurrent update cannot slip in between the If-Match check and the save.
+    """
+    if request.method in SAFE_METHODS:
+        return queryset
+    return queryset.select_for_update(of=('self',))
+
+
+def conditional(validators, use_last_modified=True):
+    """
+    Decorate a DRF view method with conditional request handling.
+
+    ``validators(view, request, *args, **kwargs)`` returns ``(etag,
+    last_modified)``; when both are None the view runs unconditionally.
+    Unsafe methods are checked and applied in one transaction.
+
+    Pass ``use_last_modified=False`` when the timestamp cannot see every
+    change (a list's newest ``updated_at`` does not move when a row is
+    deleted): Last-Modified is still sent, but only the ETag decides on 304.
+
+    Async view methods take async validators; they only serve reads, so no
+    transaction is opened for them.
+    """
+    def decorator(view_method):
+        if asyncio.iscoroutinefunction(view_method):
+            @wraps(view_method)
+            async def async_wrapper(self, request, *args, **kwargs):
+                etag, last_modified = await validators(self, request, *args, **kwargs)
+                if etag is None and last_modified is None:
+                    return await view_method(self, request, *args, **kwargs)
+                etag, response = _precondition(request, etag, last_modified, use_last_modified)
+                if response is not None:
+                    return response
+                response = await view_method(self, request, *args, **kwargs)
+                if response.status_code == 200:
+                    _set_validators(response, etag, last_modified)
+                return response
+            return async_wrapper
+
+        @wraps(view_method)
+        def wrapper(self, request, *args, **kwargs):
+            if request.method in SAFE_METHODS:
+                return _evaluate(view_method, validators, use_last_modified,
+                                 self, request, args, kwargs)
+            with transaction.atomic():
+                return _evaluate(view_method, validators, use_last_modified,
+                                 self, request, args, kwargs)
+        return wrapper
+    return decorator
+
+
+def _evaluate(view_method, validators, use_last_modified, view, request, args, kwargs):
+    etag, last_modified = validators(view, request, *args, **kwargs)
+    if etag is None and last_modified is None:
+        if request.method not in SAFE_METHODS and request.META.get('HTTP_IF_MATCH', '*') != '*':
+            return Response({'error': 'Precondition failed'}, status=status.HTTP_412_PRECONDITION_FAILED)
+        return view_method(view, request, *args, **kwargs)
+
+    etag, response = _precondition(request, etag, last_modified, use_last_modified)
+    if response is not None:
+        return response
+
+    response = view_method(view, request, *args, **kwargs)
+    if response.status_code != 200:
+        return response
+
+    if request.method not in SAFE_METHODS:
+        # Hand back the validators of the new state for the next If-Match
+        etag, last_modified = validators(view, request, *args, **kwargs)
+        etag = quote_etag(etag) if etag else None
+    _set_validators(response, etag, last_modified)
+    return response
+
+
+def _precondition(request, etag, last_modified, use_last_modified):
+    """
+    Quote ``etag`` and answer the request's preconditions: returns the quoted
+    ETag and a 304/412 response, or None when the view should run.
+    """
+    etag = quote_etag(etag) if etag else None
+    timestamp = int(last_modified.timestamp()) if last_modified and use_last_modified else None
+    response = get_conditional_response(request, etag=etag, last_modified=timestamp)
+    if response is not None and response.status_code == status.HTTP_304_NOT_MODIFIED:
+        _set_validators(response, etag, last_modified)
+    return etag, response
+
+
+def _set_validators(response, etag, last_modified):
+    if etag:
+        response['ETag'] = etag
+    if last_modified:
+        response['Last-Modified'] = http_date(int(last_modified.timestamp()))
@@ -0,0 +1,176 @@
+"""
+Facet counts for job search.
+
+One grouped query counts the jobs matching the search text and budget range
+per (category, job type, experience level, budget bucket) combination. Fixed
+price jobs are bucketed by budget and hourly jobs by hourly rate, each with
+its own buckets, since the two amounts aren't comparable. Each
+facet is then summed from those rows with every *other* facet's filter
+applied, so the counts show what picking a different value would return
+instead of collapsing to the selected one.
+
+The grouped rows depend only on the normalized search text and budget range,
+so they are cached under those and the Job/Category generations, and shared
+by every page and filter combination of the same search.
+"""
+import hashlib
+
+from asgiref.sync import sync_to_async
+from django.conf import settings
+from django.core.cache import cache
+from django.db.models import Case, Count, IntegerField, Value, When
+
+from .cache import get_generations
+from .models import Category, Job
+from .search import tokenize
+
+FACET_PREFIX = 'job-search-facets:'
+
+# Filters that are facets; everything else narrows the grouped query itself
+FACET_PARAMS = {
+    'category': 'category_id',
+    'job_type': 'job_type',
+    'experience_level': 'experience_level',
+}
+
+# Upper bounds of the effective budget range of fixed price jobs, and of the
+# hourly rate range of hourly jobs, as [min, max) ranges
+BUDGET_BUCKETS = (
+    (None, 500),
+    (500, 1000),
+    (1000, 5000),
+    (5000, 10000),
+    (10000, None),
+)
+HOURLY_RATE_BUCKETS = (
+    (None, 25),
+    (25, 50),
+    (50, 100),
+    (100, None),
+)
+
+# Facet name and buckets per job type
+BUCKET_FACETS = {
+    'fixed': ('budget', BUDGET_BUCKETS),
+    'hourly': ('hourly_rate', HOURLY_RATE_BUCKETS),
+}
+
+
+def wants_facets(params):
+    return params.get('facets', '').lower() in ('1', 'true')
+
+
+def _budget_bucket():
+    # Index into the buckets of the row's job type
+    whens = []
+    for job_type, (_, buckets) in BUCKET_FACETS.items():
+        for index, (low, high) in enumerate(buckets):
+            if high is None:
+                whens.append(When(job_type=job_type, effective_max__gte=low, then=Value(index)))
+            else:
+                whens.append(When(job_type=job_type, effective_max__lt=high, then=Value(index)))
+    return Case(*whens, default=Value(None), output_field=IntegerField())
+
+
+def without_facet_filters(params):
+    """
+    ``params`` minus the facet filters, for the search the facets count over.
+    """
+    params = params.copy()
+    for name in FACET_PARAMS:
+        params.pop(name, None)
+    return params
+
+
+def _grouped_queryset(jobs):
+    return jobs.order_by().values(
+        'category_id', 'job_type', 'experience_level', bucket=_budget_bucket()
+    ).annotate(count=Count('id'))
+
+
+def _cache_key(params):
+    query = params.get('q', '')
+    parts = [
+        ' '.join(tokenize(query)) or query.strip().lower(),
+        params.get('min_budget', ''),
+        params.get('max_budget', ''),
+        repr(get_generations((Job, Category))),
+    ]
+    return FACET_PREFIX + hashlib.md5('|'.join(parts).encode()).hexdigest()
+
+
+def _facet_values(facet, categories):
+    if facet == 'category':
+        return [(category_id, name) for category_id, name in categories]
+    if facet == 'job_type':
+        return list(Job.JOB_TYPES)
+    return list(Job.EXPERIENCE_LEVELS)
+
+
+def summarize(rows, categories, params):
+    """
+    Facet counts from the grouped rows, for the facet filters in ``params``.
+    """
+    selected = {}
+    for name, field in FACET_PARAMS.items():
+        value = params.get(name)
+        if value:
+            selected[field] = int(value) if field == 'category_id' and value.isdigit() else value
+
+    def matching(skip=None):
+        return [
+            row for row in rows
+            if all(row[field] == value for field, value in selected.items() if field != skip)
+        ]
+
+    facets = {}
+    for name, field in FACET_PARAMS.items():
+        counts = {}
+        for row in matching(skip=field):
+            counts[row[field]] = counts.get(row[field], 0) + row['count']
+        facets[name] = [
+            {'value': value, 'label': label, 'count': counts.get(value, 0)}
+            for value, label in _facet_values(name, categories)
+        ]
+
+    bucket_counts = {}
+    for row in matching():
+        if row['bucket'] is not None:
+            key = (row['job_type'], row['bucket'])
+            bucket_counts[key] = bucket_counts.get(key, 0) + row['count']
+    for job_type, (name, buckets) in BUCKET_FACETS.items():
+        facets[name] = [
+            {'min': low, 'max': high, 'count': bucket_counts.get((job_type, index), 0)}
+            for index, (low, high) in enumerate(buckets)
+        ]
+    return facets
+
+
+def search_facets(jobs, params):
+    """
+    Facet counts for a search; ``jobs`` is the search queryset for
+    ``without_facet_filters(params)``.
+    """
+    key = _cache_key(params)
+    cached = cache.get(key) if settings.RESPONSE_CACHE else None
+    if cached is None:
+        cached = (
+            list(_grouped_queryset(jobs)),
+            list(Category.objects.order_by('name').values_list('id', 'name')),
+        )
+        if settings.RESPONSE_CACHE:
+            cache.set(key, cached, settings.RESPONSE_CACHE_TIMEOUT)
+    return summarize(*cached, params)
+
+
+async def asearch_facets(jobs, params):
+    key = await sync_to_async(_cache_key)(params)
+    cached = await cache.aget(key) if settings.RESPONSE_CACHE else None
+    if cached is None:
+        cached = (
+            [row async for row in _grouped_queryset(jobs)],
+            [row async for row in Category.objects.order_by('name').values_list('id', 'name')],
+        )
+        if settings.RESPONSE_CACHE:
+            await cache.aset(key, cached, settings.RESPONSE_CACHE_TIMEOUT)
+    return summarize(*cached, params)
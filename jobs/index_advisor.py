@@ -0,0 +1,108 @@
+"""
+EXPLAIN-based index advisor used by ``manage.py index_advisor``.
+
+Requests every read endpoint the way ``benchmark_endpoints`` does, captures
+the SELECTs each one runs and asks the database for their plans, reporting
+full table scans and explicit sorts on tables big enough for them to matter.
+Understands SQLite's ``EXPLAIN QUERY PLAN`` and PostgreSQL's ``EXPLAIN``.
+"""
+import re
+
+from django.db import connection
+from django.test import Client
+
+from .benchmark import ROLES, benchmark_context, benchmark_users, capture_queries, discover_endpoints
+
+POSTGRES_SEQ_SCAN = re.compile(r'Seq Scan on (\w+)')
+POSTGRES_SORT = re.compile(r'(?:^|->)\s*Sort\s+\(')
+
+
+def explain(sql):
+    """
+    The plan for ``sql`` as a list of text lines.
+    """
+    with connection.cursor() as cursor:
+        if connection.vendor == 'sqlite':
+            cursor.execute('EXPLAIN QUERY PLAN ' + sql)
+            return [row[-1] for row in cursor.fetchall()]
+        cursor.execute('EXPLAIN ' + sql)
+        return [row[0] for row in cursor.fetchall()]
+
+
+def plan_problems(plan, tables):
+    """
+    ``(kind, table)`` pairs for the full scans and sorts in a plan. Sorts
+    aren't tied to a table and report ``None``.
+    """
+    problems = []
+    for line in plan:
+        if connection.vendor == 'sqlite':
+            words = line.split()
+            # "SCAN <table>" without "USING ... INDEX" reads the whole table;
+            # virtual tables (the FTS index) do their own lookups
+            if words[:1] == ['SCAN'] and len(words) > 1 and words[1] in tables and \
+                    'USING' not in words and 'VIRTUAL' not in words:
+                problems.append(('seq scan', words[1]))
+            elif line.startswith('USE TEMP B-TREE FOR ORDER BY'):
+                problems.append(('sort', None))
+        else:
+            match = POSTGRES_SEQ_SCAN.search(line)
+            if match and match.group(1) in tables:
+                problems.append(('seq scan', match.group(1)))
+            elif POSTGRES_SORT.search(line):
+                problems.append(('sort', None))
+    return problems
+
+
+def table_sizes():
+    tables = connection.introspection.table_names()
+    sizes = {}
+    with connection.cursor() as cursor:
+        for table in tables:
+            cursor.execute(f'SELECT COUNT(*) FROM {connection.ops.quote_name(table)}')
+            sizes[table] = cursor.fetchone()[0]
+    return sizes
+
+
+def advise(roles=ROLES, min_rows=1000):
+    """
+    ``{'<pattern> [<role>]': [finding, ...]}`` for every endpoint with a full
+    scan of a table holding at least ``min_rows`` rows, or a sort over one.
+
+    Each finding is a dict with the ``kind`` of problem, the ``table`` and its
+    ``rows`` (for scans), the ``sql`` and its ``plan``.
+    """
+    sizes = table_sizes()
+    large = {table for table, rows in sizes.items() if rows >= min_rows}
+    users = benchmark_users()
+    context = benchmark_context()
+
+    report = {}
+    for role in roles:
+        client = Client()
+        if users[role] is not None:
+            client.force_login(users[role])
+        for pattern, url in discover_endpoints(client, role, users[role], context):
+            with capture_queries() as captures:
+                client.get(url)
+            # Replicas share the primary's schema, so plans come from the primary
+            statements = {query['sql'] for queries in captures for query in queries.captured_queries
+                          if query['sql'].lstrip().upper().startswith('SELECT')}
+
+            findings = []
+            for sql in sorted(statements):
+                plan = explain(sql)
+                # Sorts only matter when the query reads a large table
+                reads_large = any(connection.ops.quote_name(table) in sql for table in large)
+                for kind, table in plan_problems(plan, sizes):
+                    if table in large if kind == 'seq scan' else reads_large:
+                        findings.append({
+                            'kind': kind,
+                            'table': table,
+                            'rows': sizes.get(table),
+                            'sql': sql,
+                            'plan': plan,
+                        })
+            if findings:
+                report[f'{pattern} [{role}]'] = findings
+    return report
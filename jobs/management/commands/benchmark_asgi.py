@@ -0,0 +1,143 @@
+import os
+import statistics
+import subprocess
+import sys
+import time
+from concurrent.futures import ThreadPoolExecutor
+from contextlib import contextmanager
+
+import requests
+from django.core.management.base import BaseCommand, CommandError
+from accounts.models import FreelancerProfile
+from jobs.benchmark import percentile
+from jobs.models import Job
+
+SERVERS = {
+    # Sync DRF views under gunicorn's threaded WSGI workers
+    'wsgi': {
+        'args': ['freelance_platform.wsgi:application', '--worker-class', 'gthread'],
+        'env': {'ASYNC_READ_VIEWS': 'false'},
+    },
+    # Async read views under uvicorn workers
+    'asgi': {
+        'args': ['freelance_platform.asgi:application', '--worker-class', 'uvicorn.workers.UvicornWorker'],
+        'env': {'ASYNC_READ_VIEWS': 'true'},
+    },
+}
+
+class Command(BaseCommand):
+    help = 'Benchmark the hot read endpoints under WSGI (sync views) and ASGI (async views) side by side'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--concurrency', type=int, default=32,
+                            help='Requests in flight at once (default 32)')
+        parser.add_argument('--requests', type=int, default=1000,
+                            help='Requests per endpoint and server (default 1000)')
+        parser.add_argument('--workers', type=int, default=2,
+                            help='Server worker processes (default 2)')
+        parser.add_argument('--threads', type=int, default=8,
+                            help='Threads per WSGI worker (default 8)')
+        parser.add_argument('--port', type=int, default=8765)
+        parser.add_argument('--use-cache', action='store_true',
+                            help='Keep the response cache on; by default every request reaches the database')
+        parser.add_argument('--servers', nargs='+', choices=sorted(SERVERS), default=['wsgi', 'asgi'])
+
+    def handle(self, *args, **options):
+        endpoints = self.endpoints()
+        results = {}
+        for name in options['servers']:
+            with self.server(name, options) as base_url:
+                for path in endpoints:
+                    # Warm up connections, caches and lazy imports first
+                    self.run_load(base_url + path, options['concurrency'], options['concurrency'])
+                    results[name, path] = self.run_load(base_url + path, options['requests'],
+                                                        options['concurrency'])
+
+        self.stdout.write(
+            f'{options["requests"]} requests per endpoint at concurrency {options["concurrency"]}, '
+            f'{options["workers"]} workers'
+        )
+        self.stdout.write(f'{"endpoint":<45}{"server":<7}{"req/s":>9}{"p50 ms":>9}{"p95 ms":>9}'
+                          f'{"p99 ms":>9}{"errors":>8}')
+        for path in endpoints:
+            for name in options['servers']:
+                result = results[name, path]
+                self.stdout.write(
+                    f'{path:<45}{name:<7}{result["throughput"]:>9.1f}{result["p50"]:>9.1f}'
+                    f'{result["p95"]:>9.1f}{result["p99"]:>9.1f}{result["errors"]:>8}'
+                )
+
+    def endpoints(self):
+        job = Job.objects.order_by('-created_at', '-id').first()
+        if job is None or not FreelancerProfile.objects.exists():
+            raise CommandError('No data to benchmark; run populate_sample_data first')
+        word = job.title.split()[0].lower()
+        return [
+            '/api/jobs/jobs/?page_size=20',
+            f'/api/jobs/jobs/{job.pk}/',
+            f'/api/jobs/search/?q={word}&page_size=20',
+            '/api/accounts/freelancer-profiles/',
+        ]
+
+    @contextmanager
+    def server(self, name, options):
+        config = SERVERS[name]
+        env = {**os.environ, **config['env']}
+        if not options['use_cache']:
+            env['CACHE_BACKEND'] = 'django.core.cache.backends.dummy.DummyCache'
+        bind = f'127.0.0.1:{options["port"]}'
+        process = subprocess.Popen(
+            [sys.executable, '-m', 'gunicorn', *config['args'], '--bind', bind,
+             '--workers', str(options['workers']), '--threads', str(options['threads']),
+             '--log-level', 'warning'],
+            env=env,
+        )
+        try:
+            base_url = f'http://{bind}'
+            self.wait_until_ready(base_url, process)
+            yield base_url
+        finally:
+            process.terminate()
+            process.wait(timeout=30)
+
+    def wait_until_ready(self, base_url, process, timeout=30):
+        deadline = time.monotonic() + timeout
+        while time.monotonic() < deadline:
+            if process.poll() is not None:
+                raise CommandError(f'Server exited with code {process.returncode}')
+            try:
+                requests.get(base_url + '/api/jobs/categories/', timeout=5)
+                return
+            except requests.RequestException:
+                time.sleep(0.2)
+        raise CommandError(f'Server at {base_url} did not start within {timeout}s')
+
+    def run_load(self, url, total, concurrency):
+        def worker(count):
+            session = requests.Session()
+            latencies, errors = [], 0
+            for _ in range(count):
+                started = time.perf_counter()
+                try:
+                    response = session.get(url, timeout=30)
+                    if response.status_code != 200:
+                        errors += 1
+                except requests.RequestException:
+                    errors += 1
+                latencies.append((time.perf_counter() - started) * 1000)
+            return latencies, errors
+
+        shares = [total // concurrency + (1 if i < total % concurrency else 0) for i in range(concurrency)]
+        started = time.perf_counter()
+        with ThreadPoolExecutor(max_workers=concurrency) as executor:
+            outcomes = list(executor.map(worker, [share for share in shares if share]))
+        elapsed = time.perf_counter() - started
+
+        latencies = [latency for samples, _ in outcomes for latency in samples]
+        return {
+            'throughput': len(latencies) / elapsed,
+            'p50': statistics.median(latencies),
+            'p95': percentile(latencies, 0.95),
+            'p99': percentile(latencies, 0.99),
+            'errors': sum(errors for _, errors in outcomes),
+        }
@@ -0,0 +1,121 @@
+import json
+import logging
+import platform
+from io import StringIO
+from contextlib import contextmanager, nullcontext
+
+import django
+from django.core.management import call_command
+from django.core.management.base import BaseCommand, CommandError
+from django.db import connection, router
+from django.test.utils import override_settings
+from django.utils import timezone
+from freelance_platform.db_routing import ReplicaRouter
+from jobs.benchmark import ROLES, compare_reports, run_benchmark
+
+# Dataset generated into the throwaway test database, per populate_sample_data flag
+DATASET = {
+    'users': 500,
+    'jobs': 2000,
+    'applications': 10000,
+    'messages': 20000,
+    'reviews': 300,
+}
+
+class Command(BaseCommand):
+    help = ('Benchmark every API read endpoint through the test client and write a JSON report; '
+            'optionally flag regressions against a baseline report')
+
+    def add_arguments(self, parser):
+        parser.add_argument('--iterations', type=int, default=50,
+                            help='Timed requests per endpoint and role (default 50)')
+        parser.add_argument('--roles', nargs='+', choices=ROLES, default=list(ROLES))
+        parser.add_argument('--output', default='benchmark-report.json',
+                            help='Where to write the report (default benchmark-report.json)')
+        parser.add_argument('--baseline',
+                            help='Compare against this report and fail on regressions')
+        parser.add_argument('--threshold', type=float, default=0.25,
+                            help='Allowed relative growth in latency and size (default 0.25)')
+        parser.add_argument('--min-delta-ms', type=float, default=1.0,
+                            help='Ignore latency changes smaller than this (default 1.0)')
+        parser.add_argument('--use-current-db', action='store_true',
+                            help='Benchmark the configured database instead of a generated one')
+        parser.add_argument('--use-cache', action='store_true',
+                            help='Turn the response cache on, whatever the backend; by default every request reaches the database')
+        parser.add_argument('--seed', type=int, default=42)
+        for name, default in DATASET.items():
+            parser.add_argument(f'--{name}', type=int, default=default,
+                                help=f'Synthetic {name} in the generated dataset (default {default})')
+
+    def handle(self, *args, **options):
+        baseline = None
+        if options['baseline']:
+            try:
+                with open(options['baseline']) as f:
+                    baseline = json.load(f)
+            except (OSError, ValueError) as exc:
+                raise CommandError(f'Cannot read baseline: {exc}')
+
+        dataset = nullcontext() if options['use_current_db'] else self.generated_dataset(options)
+        cache = override_settings(RESPONSE_CACHE=True) if options['use_cache'] else override_settings(CACHES={
+            'default': {'BACKEND': 'django.core.cache.backends.dummy.DummyCache'},
+        })
+        # Anonymous requests to private endpoints are expected to be refused
+        logging.getLogger('django.request').setLevel(logging.ERROR)
+        with dataset, cache:
+            try:
+                results = run_benchmark(options['iterations'], options['roles'], log=self.stdout.write)
+            except ValueError as exc:
+                raise CommandError(str(exc))
+
+        report = {
+            'meta': {
+                'created_at': timezone.now().isoformat(),
+                'iterations': options['iterations'],
+                'dataset': 'current' if options['use_current_db'] else {
+                    'seed': options['seed'], **{name: options[name] for name in DATASET},
+                },
+                'cache': options['use_cache'],
+                'database': connection.vendor,
+                'django': django.get_version(),
+                'python': platform.python_version(),
+            },
+            'results': results,
+        }
+        with open(options['output'], 'w') as f:
+            json.dump(report, f, indent=2, sort_keys=True)
+        self.stdout.write(self.style.SUCCESS(f'Report for {len(results)} endpoints written to {options["output"]}'))
+
+        if baseline is not None:
+            regressions = compare_reports(baseline['results'], results, options['threshold'],
+                                          options['min_delta_ms'])
+            for regression in regressions:
+                self.stdout.write(self.style.ERROR(regression))
+            if regressions:
+                raise CommandError(f'{len(regressions)} regressions against {options["baseline"]}')
+            self.stdout.write(self.style.SUCCESS(f'No regressions against {options["baseline"]}'))
+
+    @contextmanager
+    def generated_dataset(self, options):
+        """
+        A throwaway test database filled by populate_sample_data, so runs are
+        comparable regardless of what the configured database holds.
+        """
+        old_name = connection.settings_dict['NAME']
+        connection.creation.create_test_db(verbosity=0, autoclobber=True)
+        # The dataset only exists on the primary's test database
+        replica_routers = {
+            replica_router: replica_router.replicas
+            for replica_router in router.routers if isinstance(replica_router, ReplicaRouter)
+        }
+        for replica_router in replica_routers:
+            replica_router.replicas = []
+        try:
+            self.stdout.write('Generating the benchmark dataset...')
+            call_command('populate_sample_data', seed=options['seed'], stdout=StringIO(),
+                         **{name: options[name] for name in DATASET})
+            yield
+        finally:
+            for replica_router, replicas in replica_routers.items():
+                replica_router.replicas = replicas
+            connection.creation.destroy_test_db(old_name, verbosity=0)
@@ -0,0 +1,48 @@
+import statistics
+import time
+
+from django.core.management.base import BaseCommand, CommandError
+from rest_framework.renderers import JSONRenderer
+from jobs.models import Job
+from jobs.pagination import JobCursorPagination
+from jobs.serializers import JobListSerializer, job_list_data, job_list_rows
+
+
+class Command(BaseCommand):
+    help = ('Time a page of the job list rendered through JobListSerializer and through the '
+            'row-based fast path, and check both give the same JSON')
+
+    def add_arguments(self, parser):
+        parser.add_argument('--rows', type=int, default=1000,
+                            help='Jobs on the page (default 1000)')
+        parser.add_argument('--iterations', type=int, default=20,
+                            help='Timed runs per path (default 20)')
+
+    def handle(self, *args, **options):
+        queryset = Job.objects.select_related('recruiter', 'category').order_by(*JobCursorPagination.ordering)
+        queryset = queryset[:options['rows']]
+        paths = {
+            'serializer': lambda: JobListSerializer(list(queryset), many=True).data,
+            'fast path': lambda: job_list_data(list(job_list_rows(queryset))),
+        }
+
+        rendered = {name: JSONRenderer().render(build()) for name, build in paths.items()}
+        if rendered['serializer'] != rendered['fast path']:
+            raise CommandError('The fast path renders different JSON from JobListSerializer')
+        rows = len(list(queryset))
+        if not rows:
+            raise CommandError('No jobs to benchmark; run populate_sample_data first')
+
+        medians = {}
+        for name, build in paths.items():
+            samples = []
+            for _ in range(options['iterations']):
+                start = time.perf_counter()
+                JSONRenderer().render(build())
+                samples.append(time.perf_counter() - start)
+            medians[name] = statistics.median(samples)
+            self.stdout.write(f'{name:<12} {medians[name] * 1000:8.2f} ms per page  '
+                              f'{medians[name] / rows * 1e6:6.2f} us per row')
+        self.stdout.write(self.style.SUCCESS(
+            f'{rows} rows, identical JSON, {medians["serializer"] / medians["fast path"]:.1f}x faster'
+        ))
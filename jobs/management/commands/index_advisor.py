@@ -0,0 +1,48 @@
+import logging
+
+from django.core.management.base import BaseCommand, CommandError
+from django.test.utils import override_settings
+from jobs.benchmark import ROLES
+from jobs.index_advisor import advise
+
+class Command(BaseCommand):
+    help = ('EXPLAIN the queries behind every API read endpoint against the current database '
+            'and report full table scans and sorts')
+
+    def add_arguments(self, parser):
+        parser.add_argument('--roles', nargs='+', choices=ROLES, default=list(ROLES))
+        parser.add_argument('--min-rows', type=int, default=1000,
+                            help='Ignore tables with fewer rows than this (default 1000)')
+        parser.add_argument('--fail', action='store_true',
+                            help='Exit with an error if any full table scan is found')
+
+    def handle(self, *args, **options):
+        # Anonymous requests to private endpoints are expected to be refused
+        logging.getLogger('django.request').setLevel(logging.ERROR)
+        # With the response cache on, repeated requests never reach the database
+        try:
+            with override_settings(CACHES={
+                'default': {'BACKEND': 'django.core.cache.backends.dummy.DummyCache'},
+            }):
+                report = advise(options['roles'], options['min_rows'])
+        except ValueError as exc:
+            raise CommandError(str(exc))
+
+        scans = 0
+        for endpoint, findings in report.items():
+            self.stdout.write(self.style.WARNING(endpoint))
+            for finding in findings:
+                if finding['kind'] == 'seq scan':
+                    scans += 1
+                    self.stdout.write(f'  seq scan on {finding["table"]} ({finding["rows"]} rows)')
+                else:
+                    self.stdout.write('  sort without a matching index')
+                if options['verbosity'] > 1:
+                    self.stdout.write(f'    {finding["sql"]}')
+                    for line in finding['plan']:
+                        self.stdout.write(f'    | {line}')
+
+        if not report:
+            self.stdout.write(self.style.SUCCESS('No full table scans or sorts on large tables'))
+        elif options['fail'] and scans:
+            raise CommandError(f'{scans} full table scans')
@@ -1,13 +1,25 @@
-from django.core.management.base import BaseCommand
+from django.core.management.base import BaseCommand, CommandError
 from django.utils import timezone
 from datetime import timedelta
 from accounts.models import User, FreelancerProfile, RecruiterProfile
 from jobs.models import Category, Job
 from applications.models import Application
+from jobs.synthetic import SyntheticDataGenerator
+
+SCALE_OPTIONS = ('users', 'jobs', 'applications', 'messages', 'reviews')
 
 class Command(BaseCommand):
     help = 'Populate database with sample data'
 
+    def add_arguments(self, parser):
+        for name in SCALE_OPTIONS:
+            parser.add_argument(f'--{name}', type=int, default=0,
+                                help=f'Also generate this many synthetic {name}')
+        parser.add_argument('--seed', type=int, default=42,
+                            help='Random seed for the synthetic data (default 42)')
+        parser.add_argument('--batch-size', type=int, default=5000,
+                            help='Rows per bulk insert (default 5000)')
+
     def handle(self, *args, **options):
         self.stdout.write('Creating sample data...')
         
@@ -163,6 +175,15 @@ class Command(BaseCommand):
                 defaults={**job_data, 'category': category, 'recruiter': recruiter}
             )
         
+        if any(options[name] for name in SCALE_OPTIONS):
+            generator = SyntheticDataGenerator(
+                seed=options['seed'], batch_size=options['batch_size'], log=self.stdout.write
+            )
+            try:
+                generator.generate(**{name: options[name] for name in SCALE_OPTIONS})
+            except ValueError as exc:
+                raise CommandError(str(exc))
+        
         self.stdout.write(self.style.SUCCESS('Sample data created successfully!'))
         self.stdout.write('You can now:')
         self.stdout.write('- Login as admin with username: admin, password: admin123')
@@ -0,0 +1,10 @@
+from django.core.management.base import BaseCommand
+from jobs.models import Job
+from jobs.search import rebuild_index
+
+class Command(BaseCommand):
+    help = 'Rebuild the job full-text search index'
+
+    def handle(self, *args, **options):
+        rebuild_index()
+        self.stdout.write(self.style.SUCCESS(f'Search index rebuilt for {Job.objects.count()} jobs'))
@@ -0,0 +1,324 @@
+"""
+Vectorized freelancer-to-job matching.
+
+Every worker process keeps a ``FreelancerPool``: NumPy arrays of hourly rate,
+experience and rating per freelancer profile, plus a column-compressed skill
+incidence matrix (for each skill, the sorted array of pool rows that have it).
+Scoring a job is then a handful of array operations over the whole pool.
+
+The pool is loaded lazily, updated in place from the ``FreelancerProfile``
+signals raised in this process, and fully reloaded once it is older than
+``MATCHING_POOL_MAX_AGE`` seconds so that writes made by other workers are
+eventually picked up.
+"""
+import math
+import threading
+import time
+from concurrent.futures import ProcessPoolExecutor
+
+import numpy as np
+from django.conf import settings
+
+from accounts.models import FreelancerProfile
+
+# Relative weight of each component in the final score
+SKILL_WEIGHT = 0.5
+RATE_WEIGHT = 0.2
+EXPERIENCE_WEIGHT = 0.15
+RATING_WEIGHT = 0.15
+
+# Years of experience that fully satisfy each experience level
+EXPERIENCE_TARGETS = {
+    'beginner': 0,
+    'intermediate': 2,
+    'expert': 5,
+}
+
+MAX_RATING = 5.0
+
+
+def _setting(name, default):
+    return getattr(settings, name, default)
+
+
+def _job_rate_range(job):
+    """
+    Rate range to compare hourly rates against: the hourly range when the
+    job has one, otherwise its budget range.
+    """
+    low, high = job.hourly_rate_min, job.hourly_rate_max
+    if low is None and high is None:
+        low, high = job.budget_min, job.budget_max
+    low = float(low) if low is not None else math.nan
+    high = float(high) if high is not None else math.nan
+    return low, high
+
+
+def score_rows(overlap, skill_count, hourly_rate, experience, rating, rate_range, target_years):
+    """
+    Score a block of pool rows. Pure NumPy so it can run in a worker process.
+    """
+    if skill_count:
+        skill_score = overlap / skill_count
+    else:
+        skill_score = np.zeros(len(overlap))
+
+    low, high = rate_range
+    rate_score = np.full(len(hourly_rate), 0.5)
+    known = ~np.isnan(hourly_rate) & (hourly_rate > 0)
+    if not (math.isnan(low) and math.isnan(high)):
+        rates = hourly_rate[known]
+        fit = np.ones(len(rates))
+        if not math.isnan(high):
+            above = rates > high
+            fit[above] = high / rates[above]
+        if not math.isnan(low) and low > 0:
+            below = rates < low
+            fit[below] = rates[below] / low
+        rate_score[known] = fit
+
+    if target_years:
+        experience_score = np.minimum(experience / target_years, 1.0)
+    else:
+        experience_score = np.ones(len(experience))
+
+    rating_score = rating / MAX_RATING
+
+    return (
+        SKILL_WEIGHT * skill_score +
+        RATE_WEIGHT * rate_score +
+        EXPERIENCE_WEIGHT * experience_score +
+        RATING_WEIGHT * rating_score
+    )
+
+
+def _top_k(scores, k):
+    k = min(k, len(scores))
+    if k <= 0:
+        return np.array([], dtype=np.int64)
+    candidates = np.argpartition(-scores, k - 1)[:k]
+    return candidates[np.argsort(-scores[candidates], kind='stable')]
+
+
+def _score_chunk(args):
+    offset, k, active, block = args
+    scores = score_rows(*block)
+    scores = np.where(active & ~np.isnan(scores), scores, -np.inf)
+    rows = _top_k(scores, k)
+    return rows + offset, scores[rows]
+
+
+class FreelancerPool:
+    """
+    In-memory, column-oriented snapshot of every freelancer profile.
+    """
+
+    def __init__(self):
+        self.lock = threading.RLock()
+        self.loaded_at = None
+        self.clear()
+
+    def clear(self):
+        self.size = 0
+        self.profile_ids = np.zeros(0, dtype=np.int64)
+        self.hourly_rate = np.zeros(0)
+        self.experience = np.zeros(0)
+        self.rating = np.zeros(0)
+        self.active = np.zeros(0, dtype=bool)
+        self.row_of = {}
+        self.row_skills = {}
+        self.skill_rows = {}
+
+    @property
+    def is_stale(self):
+        max_age = _setting('MATCHING_POOL_MAX_AGE', 300)
+        return self.loaded_at is None or time.monotonic() - self.loaded_at > max_age
+
+    def load(self):
+        """
+        Rebuild the pool with two queries: profile scalars and skill links.
+        """
+        profiles = list(FreelancerProfile.objects.order_by('id').values_list(
+            'id', 'hourly_rate', 'experience_years', 'rating'
+        ))
+        through = FreelancerProfile.canonical_skills.through
+        links = np.array(
+            list(through.objects.values_list('freelancerprofile_id', 'skill_id')),
+            dtype=np.int64,
+        ).reshape(-1, 2)
+
+        with self.lock:
+            self.clear()
+            size = len(profiles)
+            self._grow(size)
+            if size:
+                ids, rates, years, ratings = zip(*profiles)
+                self.profile_ids[:size] = ids
+                self.hourly_rate[:size] = [np.nan if rate is None else float(rate) for rate in rates]
+                self.experience[:size] = [value or 0 for value in years]
+                self.rating[:size] = [float(value or 0) for value in ratings]
+                self.active[:size] = True
+            self.size = size
+            self.row_of = dict(zip(self.profile_ids[:size].tolist(), range(size)))
+
+            if len(links) and size:
+                # Profile ids are sorted, so rows can be found by binary search
+                rows = np.searchsorted(self.profile_ids[:size], links[:, 0])
+                rows = np.minimum(rows, size - 1)
+                keep = self.profile_ids[rows] == links[:, 0]
+                rows, skills = rows[keep], links[keep, 1]
+                order = np.lexsort((rows, skills))
+                rows, skills = rows[order], skills[order]
+                boundaries = np.flatnonzero(np.diff(skills)) + 1
+                starts = np.concatenate(([0], boundaries))
+                for start, skill_rows in zip(starts.tolist(), np.split(rows, boundaries)):
+                    self.skill_rows[int(skills[start])] = skill_rows
+                for row, skill_id in zip(rows.tolist(), skills.tolist()):
+                    self.row_skills.setdefault(row, set()).add(skill_id)
+
+            self.loaded_at = time.monotonic()
+
+    def ensure_loaded(self):
+        if self.is_stale:
+            self.load()
+
+    def _grow(self, needed):
+        capacity = len(self.profile_ids)
+        if needed <= capacity:
+            return
+        capacity = max(needed, capacity * 2, 64)
+        for name, fill in (('profile_ids', 0), ('hourly_rate', np.nan),
+                           ('experience', 0.0), ('rating', 0.0), ('active', False)):
+            old = getattr(self, name)
+            new = np.full(capacity, fill, dtype=old.dtype)
+            new[:len(old)] = old
+            setattr(self, name, new)
+
+    def _set_scalars(self, row, profile_id, hourly_rate, experience_years, rating):
+        self.profile_ids[row] = profile_id
+        self.hourly_rate[row] = float(hourly_rate) if hourly_rate is not None else np.nan
+        self.experience[row] = experience_years or 0
+        self.rating[row] = float(rating or 0)
+
+    def update_profile(self, profile_id, hourly_rate, experience_years, rating, skill_ids):
+        """
+        Insert or refresh one profile without reloading the pool.
+        """
+        with self.lock:
+            if self.loaded_at is None:
+                return
+            row = self.row_of.get(profile_id)
+            if row is None:
+                row = self.size
+                self._grow(row + 1)
+                self.size += 1
+                self.row_of[profile_id] = row
+            self._set_scalars(row, profile_id, hourly_rate, experience_years, rating)
+            self.active[row] = True
+            self._set_skills(row, set(skill_ids))
+
+    def remove_profile(self, profile_id):
+        with self.lock:
+            row = self.row_of.pop(profile_id, None)
+            if row is None:
+                return
+            self.active[row] = False
+            self._set_skills(row, set())
+
+    def _set_skills(self, row, skill_ids):
+        previous = self.row_skills.get(row, set())
+        for skill_id in previous - skill_ids:
+            rows = self.skill_rows.get(skill_id)
+            if rows is not None:
+                self.skill_rows[skill_id] = rows[rows != row]
+        for skill_id in skill_ids - previous:
+            rows = self.skill_rows.get(skill_id, np.zeros(0, dtype=np.int64))
+            position = np.searchsorted(rows, row)
+            self.skill_rows[skill_id] = np.insert(rows, position, row)
+        if skill_ids:
+            self.row_skills[row] = skill_ids
+        else:
+            self.row_skills.pop(row, None)
+
+    def top_matches(self, job, skill_ids, k=10):
+        """
+        Return ``[(profile_id, score), ...]`` for the best ``k`` freelancers.
+        """
+        skill_ids = set(skill_ids)
+        rate_range = _job_rate_range(job)
+        target_years = EXPERIENCE_TARGETS.get(job.experience_level, 0)
+
+        with self.lock:
+            size = self.size
+            overlap = np.zeros(size)
+            for skill_id in skill_ids:
+                rows = self.skill_rows.get(skill_id)
+                if rows is not None:
+                    overlap[rows] += 1
+            block = (overlap, len(skill_ids), self.hourly_rate[:size].copy(),
+                     self.experience[:size].copy(), self.rating[:size].copy(),
+                     rate_range, target_years)
+            active = self.active[:size].copy()
+            profile_ids = self.profile_ids[:size].copy()
+
+        rows, scores = self._score(block, active, k)
+        return list(zip(profile_ids[rows].tolist(), scores.tolist()))
+
+    def _score(self, block, active, k):
+        size = len(active)
+        workers = _setting('MATCHING_PROCESS_POOL_WORKERS', 0)
+        min_rows = _setting('MATCHING_PROCESS_POOL_MIN_ROWS', 200000)
+        if workers and size >= min_rows:
+            overlap, skill_count, hourly_rate, experience, rating, rate_range, target_years = block
+            bounds = np.linspace(0, size, workers + 1, dtype=np.int64)
+            chunks = [
+                (int(start), k, active[start:end],
+                 (overlap[start:end], skill_count, hourly_rate[start:end],
+                  experience[start:end], rating[start:end], rate_range, target_years))
+                for start, end in zip(bounds[:-1], bounds[1:]) if end > start
+            ]
+            # Each chunk returns its local top-k; merge them below
+            results = list(_executor(workers).map(_score_chunk, chunks))
+            rows = np.concatenate([rows for rows, _ in results])
+            scores = np.concatenate([scores for _, scores in results])
+        else:
+            rows = np.arange(size)
+            scores = score_rows(*block)
+
+        scores = np.where(active[rows] & ~np.isnan(scores), scores, -np.inf)
+        best = _top_k(scores, k)
+        best = best[np.isfinite(scores[best])]
+        return rows[best], scores[best]
+
+
+_process_executor = None
+
+
+def _executor(workers):
+    # Shared for the life of the worker process; creating one per request
+    # would cost more than the scoring itself
+    global _process_executor
+    if _process_executor is None:
+        _process_executor = ProcessPoolExecutor(max_workers=workers)
+    return _process_executor
+
+
+pool = FreelancerPool()
+
+
+def match_freelancers(job, k=10):
+    pool.ensure_loaded()
+    skill_ids = job.canonical_skills.values_list('id', flat=True)
+    return pool.top_matches(job, skill_ids, k=k)
+
+
+def refresh_profile(profile):
+    if pool.loaded_at is None:
+        return
+    skill_ids = profile.canonical_skills.values_list('id', flat=True)
+    pool.update_profile(profile.pk, profile.hourly_rate, profile.experience_years,
+                        profile.rating, skill_ids)
+
+
+def forget_profile(profile_id):
+    pool.remove_profile(profile_id)
@@ -0,0 +1,84 @@
+# Generated by Django 5.2.4 on 2026-10-18 19:25
+
+import django.db.models.deletion
+from django.db import migrations, models
+
+
+SQLITE_FORWARDS = [
+    """
+    CREATE VIRTUAL TABLE jobs_job_fts USING fts5(
+        title, skills_required, description,
+        tokenize = 'unicode61 remove_diacritics 2',
+        prefix = '2 3'
+    )
+    """,
+    "INSERT INTO jobs_job_fts (jobs_job_fts, rank) VALUES ('rank', 'bm25(10.0, 5.0, 1.0)')",
+    """
+    INSERT INTO jobs_job_fts (rowid, title, skills_required, description)
+    SELECT id, title, skills_required, description FROM jobs_job
+    """,
+]
+
+SQLITE_BACKWARDS = [
+    "DROP TABLE IF EXISTS jobs_job_fts",
+]
+
+POSTGRES_FORWARDS = [
+    """
+    ALTER TABLE jobs_job ADD COLUMN search_vector tsvector GENERATED ALWAYS AS (
+        setweight(to_tsvector('simple', coalesce(title, '')), 'A') ||
+        setweight(to_tsvector('simple', coalesce(skills_required, '')), 'B') ||
+        setweight(to_tsvector('simple', coalesce(description, '')), 'C')
+    ) STORED
+    """,
+    "CREATE INDEX jobs_job_search_vector_gin ON jobs_job USING gin (search_vector)",
+]
+
+POSTGRES_BACKWARDS = [
+    "DROP INDEX IF EXISTS jobs_job_search_vector_gin",
+    "ALTER TABLE jobs_job DROP COLUMN IF EXISTS search_vector",
+]
+
+
+def run_for_vendor(statements):
+    def run(apps, schema_editor):
+        for statement in statements.get(schema_editor.connection.vendor, []):
+            schema_editor.execute(statement)
+    return run
+
+
+create_search_index = run_for_vendor({
+    'sqlite': SQLITE_FORWARDS,
+    'postgresql': POSTGRES_FORWARDS,
+})
+
+drop_search_index = run_for_vendor({
+    'sqlite': SQLITE_BACKWARDS,
+    'postgresql': POSTGRES_BACKWARDS,
+})
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('jobs', '0001_initial'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='JobSearchEntry',
+            fields=[
+                ('job', models.OneToOneField(db_column='rowid', on_delete=django.db.models.deletion.DO_NOTHING, primary_key=True, related_name='search_entry', serialize=False, to='jobs.job')),
+                ('title', models.TextField()),
+                ('skills_required', models.TextField()),
+                ('description', models.TextField()),
+                ('document', models.TextField(db_column='jobs_job_fts')),
+                ('rank', models.FloatField()),
+            ],
+            options={
+                'db_table': 'jobs_job_fts',
+                'managed': False,
+            },
+        ),
+        migrations.RunPython(create_search_index, drop_search_index),
+    ]
@@ -0,0 +1,95 @@
+from django.db import migrations
+
+
+# Common alternative spellings, keyed by canonical skill name
+SEED_ALIASES = {
+    'JavaScript': ['js', 'javascript', 'ecmascript'],
+    'TypeScript': ['ts', 'typescript'],
+    'React': ['react', 'reactjs', 'react.js'],
+    'Node.js': ['node', 'nodejs', 'node.js'],
+    'Vue.js': ['vue', 'vuejs', 'vue.js'],
+    'Python': ['python', 'python3'],
+    'Django': ['django', 'django rest framework', 'drf'],
+    'PostgreSQL': ['postgres', 'postgresql', 'psql'],
+    'MongoDB': ['mongo', 'mongodb'],
+    'Machine Learning': ['ml', 'machine learning'],
+    'UI/UX Design': ['ui/ux', 'ux/ui', 'ui/ux design', 'ui design', 'ux design'],
+    'SEO': ['seo', 'search engine optimization'],
+    'CSS': ['css', 'css3'],
+    'HTML': ['html', 'html5'],
+}
+
+
+# Skill.name / Skill.normalized_name length
+MAX_LENGTH = 100
+
+
+def normalize(name):
+    return ' '.join(name.lower().split())
+
+
+def parse(text):
+    """
+    (normalized key, name) pairs of a comma-separated skill string, cut to
+    what a Skill holds; the same rule as jobs.skills.parse_skills.
+    """
+    for part in (text or '').split(','):
+        name = ' '.join(part.split())[:MAX_LENGTH].rstrip()
+        key = normalize(name)[:MAX_LENGTH]
+        if key:
+            yield key, name
+
+
+def populate_skills(apps, schema_editor):
+    Skill = apps.get_model('jobs', 'Skill')
+    SkillAlias = apps.get_model('jobs', 'SkillAlias')
+    Job = apps.get_model('jobs', 'Job')
+    FreelancerProfile = apps.get_model('accounts', 'FreelancerProfile')
+
+    lookup = {}
+    for name, aliases in SEED_ALIASES.items():
+        skill, _ = Skill.objects.get_or_create(normalized_name=normalize(name), defaults={'name': name})
+        lookup[skill.normalized_name] = skill
+        for alias in aliases:
+            SkillAlias.objects.get_or_create(alias=alias, defaults={'skill': skill})
+            lookup[alias] = skill
+
+    def resolve(text):
+        skills = set()
+        for key, name in parse(text):
+            if key not in lookup:
+                lookup[key], _ = Skill.objects.get_or_create(
+                    normalized_name=key, defaults={'name': name}
+                )
+            skills.add(lookup[key].pk)
+        return skills
+
+    JobSkill = Job.canonical_skills.through
+    JobSkill.objects.bulk_create([
+        JobSkill(job_id=job_id, skill_id=skill_id)
+        for job_id, text in Job.objects.values_list('id', 'skills_required').iterator()
+        for skill_id in resolve(text)
+    ], batch_size=1000, ignore_conflicts=True)
+
+    ProfileSkill = FreelancerProfile.canonical_skills.through
+    ProfileSkill.objects.bulk_create([
+        ProfileSkill(freelancerprofile_id=profile_id, skill_id=skill_id)
+        for profile_id, text in FreelancerProfile.objects.values_list('id', 'skills').iterator()
+        for skill_id in resolve(text)
+    ], batch_size=1000, ignore_conflicts=True)
+
+
+def clear_skills(apps, schema_editor):
+    apps.get_model('jobs', 'Skill').objects.all().delete()
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('jobs', '0003_skill_taxonomy'),
+        ('accounts', '0002_freelancerprofile_canonical_skills'),
+    ]
+
+    operations = [
+        migrations.RunPython(populate_skills, clear_skills),
+    ]
@@ -0,0 +1,34 @@
+# Generated by Django 5.2.4 on 2026-10-18 20:03
+
+from django.conf import settings
+from django.db import migrations, models
+from jobs.operations import AddIndexConcurrently
+
+
+class Migration(migrations.Migration):
+    # CREATE INDEX CONCURRENTLY can't run in a transaction on PostgreSQL
+    atomic = False
+
+    dependencies = [
+        ('jobs', '0005_job_job_created_id_idx'),
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+    ]
+
+    operations = [
+        AddIndexConcurrently(
+            model_name='job',
+            index=models.Index(fields=['status', '-created_at', '-id'], name='job_status_created_idx'),
+        ),
+        AddIndexConcurrently(
+            model_name='job',
+            index=models.Index(fields=['recruiter', '-created_at', '-id'], name='job_recruiter_created_idx'),
+        ),
+        AddIndexConcurrently(
+            model_name='job',
+            index=models.Index(condition=models.Q(('status', 'open')), fields=['category', '-created_at', '-id'], name='job_open_category_idx'),
+        ),
+        AddIndexConcurrently(
+            model_name='job',
+            index=models.Index(condition=models.Q(('status', 'open')), fields=['job_type', 'experience_level', '-created_at', '-id'], name='job_open_type_level_idx'),
+        ),
+    ]
@@ -0,0 +1,42 @@
+# Generated by Django 5.2.4 on 2026-10-18 20:12
+
+from django.conf import settings
+from django.db import migrations, models
+from django.db.models import F
+from django.db.models.functions import Coalesce, Greatest, Least
+
+
+def backfill_effective_range(apps, schema_editor):
+    Job = apps.get_model('jobs', 'Job')
+    for job_type, low, high in (
+        ('hourly', 'hourly_rate_min', 'hourly_rate_max'),
+        ('fixed', 'budget_min', 'budget_max'),
+    ):
+        # Same normalization as Job.set_effective_range()
+        low, high = Coalesce(F(low), F(high)), Coalesce(F(high), F(low))
+        Job.objects.filter(job_type=job_type).update(
+            effective_min=Least(low, high),
+            effective_max=Greatest(low, high),
+        )
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('jobs', '0006_filter_indexes'),
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='job',
+            name='effective_max',
+            field=models.DecimalField(blank=True, decimal_places=2, editable=False, max_digits=10, null=True),
+        ),
+        migrations.AddField(
+            model_name='job',
+            name='effective_min',
+            field=models.DecimalField(blank=True, decimal_places=2, editable=False, max_digits=10, null=True),
+        ),
+        migrations.RunPython(backfill_effective_range, migrations.RunPython.noop),
+    ]
@@ -0,0 +1,26 @@
+# Generated by Django 5.2.4 on 2026-10-18 20:14
+
+from django.db import migrations, models
+from jobs.operations import AddIndexConcurrently
+
+
+class Migration(migrations.Migration):
+    # CREATE INDEX CONCURRENTLY can't run in a transaction on PostgreSQL
+    atomic = False
+
+    dependencies = [
+        ('jobs', '0007_effective_range'),
+    ]
+
+    operations = [
+        AddIndexConcurrently(
+            model_name='job',
+            index=models.Index(condition=models.Q(('status', 'open')), fields=['effective_min', 'effective_max'], name='job_open_effective_min_idx'),
+        ),
+        AddIndexConcurrently(
+            model_name='job',
+            index=models.Index(condition=models.Q(('status', 'open')), fields=['effective_max', 'effective_min'], name='job_open_effective_max_idx'),
+        ),
+        # Without statistics SQLite prefers the status index to the range scans
+        migrations.RunSQL('ANALYZE jobs_job', migrations.RunSQL.noop),
+    ]
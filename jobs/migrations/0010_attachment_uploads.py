@@ -0,0 +1,76 @@
+# Generated by Django 5.2.4 on 2026-10-18 20:35
+
+import django.db.models.deletion
+import django.utils.timezone
+import hashlib
+import mimetypes
+import os
+import uuid
+from django.conf import settings
+from django.core.files.storage import default_storage
+from django.db import migrations, models
+
+
+def describe_attachments(apps, schema_editor):
+    # Existing files stay where they are; missing ones only get a name
+    JobAttachment = apps.get_model('jobs', 'JobAttachment')
+    for attachment in JobAttachment.objects.iterator():
+        attachment.name = os.path.basename(attachment.file.name)
+        attachment.content_type = mimetypes.guess_type(attachment.name)[0] or 'application/octet-stream'
+        try:
+            with default_storage.open(attachment.file.name, 'rb') as f:
+                digest = hashlib.sha256()
+                for block in f.chunks():
+                    digest.update(block)
+                attachment.size = f.size
+                attachment.sha256 = digest.hexdigest()
+        except (FileNotFoundError, ValueError):
+            pass
+        attachment.save(update_fields=['name', 'content_type', 'size', 'sha256'])
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('jobs', '0009_saved_searches'),
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='jobattachment',
+            name='content_type',
+            field=models.CharField(blank=True, editable=False, max_length=100),
+        ),
+        migrations.AddField(
+            model_name='jobattachment',
+            name='name',
+            field=models.CharField(blank=True, max_length=255),
+        ),
+        migrations.AddField(
+            model_name='jobattachment',
+            name='sha256',
+            field=models.CharField(blank=True, editable=False, max_length=64),
+        ),
+        migrations.AddField(
+            model_name='jobattachment',
+            name='size',
+            field=models.PositiveBigIntegerField(editable=False, null=True),
+        ),
+        migrations.CreateModel(
+            name='AttachmentUpload',
+            fields=[
+                ('id', models.UUIDField(default=uuid.uuid4, editable=False, primary_key=True, serialize=False)),
+                ('name', models.CharField(max_length=255)),
+                ('size', models.PositiveBigIntegerField()),
+                ('content_type', models.CharField(blank=True, max_length=100)),
+                ('sha256', models.CharField(blank=True, max_length=64)),
+                ('received', models.PositiveBigIntegerField(default=0)),
+                ('created_at', models.DateTimeField(default=django.utils.timezone.now)),
+                ('updated_at', models.DateTimeField(auto_now=True)),
+                ('job', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='uploads', to='jobs.job')),
+                ('user', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='attachment_uploads', to=settings.AUTH_USER_MODEL)),
+            ],
+        ),
+        migrations.RunPython(describe_attachments, migrations.RunPython.noop),
+    ]
@@ -0,0 +1,18 @@
+# Generated by Django 5.2.4 on 2026-10-18 20:55
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('jobs', '0010_attachment_uploads'),
+    ]
+
+    operations = [
+        migrations.AlterField(
+            model_name='savedsearch',
+            name='anchor',
+            field=models.CharField(db_index=True, editable=False, max_length=202),
+        ),
+    ]
@@ -0,0 +1,29 @@
+# Generated by Django 5.2.4 on 2026-10-18 21:12
+
+import django.db.models.deletion
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('jobs', '0011_saved_search_anchor_length'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='attachmentupload',
+            name='attachment',
+            field=models.ForeignKey(blank=True, null=True, on_delete=django.db.models.deletion.SET_NULL, related_name='+', to='jobs.jobattachment'),
+        ),
+        migrations.AddField(
+            model_name='attachmentupload',
+            name='error',
+            field=models.TextField(blank=True),
+        ),
+        migrations.AddField(
+            model_name='attachmentupload',
+            name='status',
+            field=models.CharField(choices=[('receiving', 'Receiving'), ('processing', 'Processing'), ('complete', 'Complete'), ('failed', 'Failed')], default='receiving', max_length=20),
+        ),
+    ]
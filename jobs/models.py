@@ -1,3 +1,5 @@
+import uuid
+
 from django.db import models
 from django.utils import timezone
 from accounts.models import User
@@ -12,6 +14,29 @@ class Category(models.Model):
     def __str__(self):
         return self.name
 
+class Skill(models.Model):
+    name = models.CharField(max_length=100, unique=True)
+    normalized_name = models.CharField(max_length=100, unique=True)
+    
+    class Meta:
+        ordering = ['name']
+    
+    def __str__(self):
+        return self.name
+
+class SkillAlias(models.Model):
+    skill = models.ForeignKey(Skill, on_delete=models.CASCADE, related_name='aliases')
+    alias = models.CharField(max_length=100, unique=True, help_text="Normalized alternative spelling")
+    
+    class Meta:
+        verbose_name_plural = "Skill aliases"
+    
+    def __str__(self):
+        return f"{self.alias} -> {self.skill.name}"
+
+# Fields Job.effective_min/effective_max are derived from
+RANGE_SOURCE_FIELDS = {'job_type', 'budget_min', 'budget_max', 'hourly_rate_min', 'hourly_rate_max'}
+
 class Job(models.Model):
     JOB_TYPES = (
         ('fixed', 'Fixed Price'),
@@ -42,6 +67,11 @@ class Job(models.Model):
     hourly_rate_max = models.DecimalField(max_digits=10, decimal_places=2, null=True, blank=True)
     experience_level = models.CharField(max_length=20, choices=EXPERIENCE_LEVELS)
     skills_required = models.TextField(help_text="Comma-separated skills")
+    canonical_skills = models.ManyToManyField(Skill, related_name='jobs', blank=True)
+    # The budget for fixed-price jobs or the hourly rate for hourly ones, as
+    # a normalized [min, max] range; maintained by save()
+    effective_min = models.DecimalField(max_digits=10, decimal_places=2, null=True, blank=True, editable=False)
+    effective_max = models.DecimalField(max_digits=10, decimal_places=2, null=True, blank=True, editable=False)
     deadline = models.DateTimeField(null=True, blank=True)
     status = models.CharField(max_length=20, choices=STATUS_CHOICES, default='open')
     created_at = models.DateTimeField(default=timezone.now)
@@ -49,14 +79,150 @@ class Job(models.Model):
     
     class Meta:
         ordering = ['-created_at']
+        indexes = [
+            models.Index(fields=['-created_at', '-id'], name='job_created_id_idx'),
+            # Filtered job lists, in the list's (created_at, id) order
+            models.Index(fields=['status', '-created_at', '-id'], name='job_status_created_idx'),
+            models.Index(fields=['recruiter', '-created_at', '-id'], name='job_recruiter_created_idx'),
+            # Search and browsing only ever look at open jobs
+            models.Index(fields=['category', '-created_at', '-id'], name='job_open_category_idx',
+                         condition=models.Q(status='open')),
+            models.Index(fields=['job_type', 'experience_level', '-created_at', '-id'],
+                         name='job_open_type_level_idx', condition=models.Q(status='open')),
+            # Budget range overlap, scanned from either end
+            models.Index(fields=['effective_min', 'effective_max'], name='job_open_effective_min_idx',
+                         condition=models.Q(status='open')),
+            models.Index(fields=['effective_max', 'effective_min'], name='job_open_effective_max_idx',
+                         condition=models.Q(status='open')),
+        ]
     
     def __str__(self):
         return self.title
+    
+    def set_effective_range(self):
+        if self.job_type == 'hourly':
+            low, high = self.hourly_rate_min, self.hourly_rate_max
+        else:
+            low, high = self.budget_min, self.budget_max
+        # A single bound is a point; swapped bounds are put in order
+        low = high if low is None else low
+        high = low if high is None else high
+        if low is not None and low > high:
+            low, high = high, low
+        self.effective_min, self.effective_max = low, high
+    
+    def save(self, *args, **kwargs):
+        self.set_effective_range()
+        update_fields = kwargs.get('update_fields')
+        if update_fields is not None and set(update_fields) & RANGE_SOURCE_FIELDS:
+            kwargs['update_fields'] = set(update_fields) | {'effective_min', 'effective_max'}
+        super().save(*args, **kwargs)
 
 class JobAttachment(models.Model):
     job = models.ForeignKey(Job, on_delete=models.CASCADE, related_name='attachments')
+    # Uploads through AttachmentUpload are stored once per content, under
+    # job_attachments/sha256/ (see jobs.uploads), and may be shared
     file = models.FileField(upload_to='job_attachments/')
+    name = models.CharField(max_length=255, blank=True)
+    size = models.PositiveBigIntegerField(null=True, editable=False)
+    sha256 = models.CharField(max_length=64, blank=True, editable=False)
+    content_type = models.CharField(max_length=100, blank=True, editable=False)
     uploaded_at = models.DateTimeField(default=timezone.now)
     
     def __str__(self):
         return f"Attachment for {self.job.title}"
+
+class AttachmentUpload(models.Model):
+    """
+    A resumable attachment upload; see jobs.uploads.
+    """
+    STATUS_CHOICES = (
+        ('receiving', 'Receiving'),
+        ('processing', 'Processing'),
+        ('complete', 'Complete'),
+        ('failed', 'Failed'),
+    )
+    
+    id = models.UUIDField(primary_key=True, default=uuid.uuid4, editable=False)
+    job = models.ForeignKey(Job, on_delete=models.CASCADE, related_name='uploads')
+    user = models.ForeignKey(User, on_delete=models.CASCADE, related_name='attachment_uploads')
+    name = models.CharField(max_length=255)
+    size = models.PositiveBigIntegerField()
+    # As declared by the client; the stored type is sniffed from the content
+    content_type = models.CharField(max_length=100, blank=True)
+    # Expected digest, checked once every byte has arrived when given
+    sha256 = models.CharField(max_length=64, blank=True)
+    received = models.PositiveBigIntegerField(default=0)
+    # Once every byte is in, a background task hashes and stores the file
+    status = models.CharField(max_length=20, choices=STATUS_CHOICES, default='receiving')
+    attachment = models.ForeignKey('JobAttachment', on_delete=models.SET_NULL, null=True, blank=True,
+                                   related_name='+')
+    error = models.TextField(blank=True)
+    created_at = models.DateTimeField(default=timezone.now)
+    updated_at = models.DateTimeField(auto_now=True)
+    
+    def __str__(self):
+        return f"Upload of {self.name} ({self.received}/{self.size} bytes)"
+
+class SavedSearch(models.Model):
+    """
+    Search parameters a user wants to hear about new jobs for; see jobs.alerts.
+    """
+    user = models.ForeignKey(User, on_delete=models.CASCADE, related_name='saved_searches')
+    name = models.CharField(max_length=100, blank=True)
+    query = models.CharField(max_length=200, blank=True)
+    category = models.ForeignKey(Category, on_delete=models.CASCADE, null=True, blank=True)
+    job_type = models.CharField(max_length=20, choices=Job.JOB_TYPES, blank=True)
+    experience_level = models.CharField(max_length=20, choices=Job.EXPERIENCE_LEVELS, blank=True)
+    min_budget = models.DecimalField(max_digits=10, decimal_places=2, null=True, blank=True)
+    max_budget = models.DecimalField(max_digits=10, decimal_places=2, null=True, blank=True)
+    # Most selective predicate, which new jobs look the search up by;
+    # maintained by a pre_save signal. Long enough for 'q:' and a query that
+    # is a single word
+    anchor = models.CharField(max_length=202, db_index=True, editable=False)
+    created_at = models.DateTimeField(default=timezone.now)
+    
+    class Meta:
+        ordering = ['-created_at']
+        verbose_name_plural = "Saved searches"
+    
+    def __str__(self):
+        return self.name or self.query or f"Saved search {self.pk}"
+
+class JobAlert(models.Model):
+    """
+    A new job that matched a saved search, waiting in its owner's notifications.
+    """
+    user = models.ForeignKey(User, on_delete=models.CASCADE, related_name='job_alerts')
+    saved_search = models.ForeignKey(SavedSearch, on_delete=models.CASCADE, related_name='alerts')
+    job = models.ForeignKey(Job, on_delete=models.CASCADE, related_name='alerts')
+    is_read = models.BooleanField(default=False)
+    created_at = models.DateTimeField(default=timezone.now)
+    
+    class Meta:
+        unique_together = ('saved_search', 'job')
+        ordering = ['-created_at']
+        indexes = [
+            models.Index(fields=['user', '-created_at', '-id'], name='jobalert_user_created_idx'),
+        ]
+    
+    def __str__(self):
+        return f"{self.job.title} for {self.user.username}"
+
+class JobSearchEntry(models.Model):
+    """
+    Read-only view of the SQLite FTS5 table maintained by jobs.search.
+    """
+    job = models.OneToOneField(Job, on_delete=models.DO_NOTHING, primary_key=True,
+                               db_column='rowid', related_name='search_entry')
+    title = models.TextField()
+    skills_required = models.TextField()
+    description = models.TextField()
+    # FTS5 exposes a hidden column named after the table for MATCH queries,
+    # and a hidden "rank" column holding the configured bm25 score.
+    document = models.TextField(db_column='jobs_job_fts')
+    rank = models.FloatField()
+    
+    class Meta:
+        managed = False
+        db_table = 'jobs_job_fts'
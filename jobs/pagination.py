@@ -0,0 +1,177 @@
+import json
+from datetime import datetime
+
+from django.core.exceptions import ValidationError
+from django.core.paginator import InvalidPage, Page, Paginator
+from django.db.models import Q
+from rest_framework.exceptions import NotFound
+from rest_framework.pagination import Cursor, CursorPagination, PageNumberPagination
+from rest_framework.utils.urls import remove_query_param
+
+def reverse_ordering(ordering):
+    return tuple(field[1:] if field.startswith('-') else '-' + field for field in ordering)
+
+class KeysetCursorPagination(CursorPagination):
+    """
+    Cursor pagination on the whole ordering rather than its first field.
+
+    DRF's ``CursorPagination`` keeps only the first ordering field in the
+    cursor and steps over rows that tie on it with an offset, so a page inside
+    a run of equal ``created_at`` values scans the run again. Here the cursor
+    holds the value of every ordering field, the last of which must be unique
+    (the primary key), and the page is filtered on that tuple, so every page is
+    one range scan on the matching index however deep it is.
+
+    ``paginate_queryset`` and ``apaginate_queryset`` differ only in whether
+    the page is fetched through the sync or the async ORM.
+    """
+
+    def paginate_queryset(self, queryset, request, view=None):
+        window = self.window_queryset(queryset, request, view)
+        if window is None:
+            return None
+        return self.paginate_results(list(window))
+
+    async def apaginate_queryset(self, queryset, request, view=None):
+        window = self.window_queryset(queryset, request, view)
+        if window is None:
+            return None
+        return self.paginate_results([row async for row in window])
+
+    def window_queryset(self, queryset, request, view=None):
+        """
+        The page's rows plus one, positioned by the request's cursor.
+        """
+        self.page_size = self.get_page_size(request)
+        if not self.page_size:
+            return None
+
+        self.base_url = request.build_absolute_uri()
+        self.ordering = self.get_ordering(request, queryset, view)
+        self.cursor = self.decode_cursor(request)
+        self.reverse = self.cursor is not None and self.cursor.reverse
+        self.position = None if self.cursor is None else self.cursor.position
+
+        ordering = reverse_ordering(self.ordering) if self.reverse else self.ordering
+        queryset = queryset.order_by(*ordering)
+        if self.position is not None:
+            try:
+                queryset = queryset.filter(self.position_filter(ordering, self.decode_position(self.position)))
+            except (TypeError, ValueError, ValidationError):
+                raise NotFound(self.invalid_cursor_message)
+
+        # One extra row tells whether another page follows
+        return queryset[:self.page_size + 1]
+
+    def paginate_results(self, results):
+        self.page = list(results[:self.page_size])
+        has_more = len(results) > self.page_size
+        if self.reverse:
+            self.page.reverse()
+            self.has_next, self.has_previous = self.position is not None, has_more
+        else:
+            self.has_next, self.has_previous = has_more, self.position is not None
+
+        if (self.has_previous or self.has_next) and self.template is not None:
+            self.display_page_controls = True
+
+        return self.page
+
+    def position_filter(self, ordering, values):
+        """
+        Rows after ``values`` in ``ordering``: ``(a, b, id) > (x, y, z)``
+        spelled out field by field, plus a bound on the first field alone so
+        the database can start the index scan there.
+        """
+        first = ordering[0]
+        bound = '__lte' if first.startswith('-') else '__gte'
+        after = Q()
+        equal = {}
+        for field, value in zip(ordering, values):
+            name = field.lstrip('-')
+            lookup = '__lt' if field.startswith('-') else '__gt'
+            after |= Q(**equal, **{name + lookup: value})
+            equal[name] = value
+        return Q(**{first.lstrip('-') + bound: values[0]}) & after
+
+    def encode_position(self, instance):
+        values = []
+        for field in self.ordering:
+            value = getattr(instance, field.lstrip('-'))
+            values.append(value.isoformat() if isinstance(value, datetime) else value)
+        return json.dumps(values, separators=(',', ':'))
+
+    def decode_position(self, position):
+        values = json.loads(position)
+        if not isinstance(values, list) or len(values) != len(self.ordering):
+            raise ValueError(position)
+        return values
+
+    def get_next_link(self):
+        if not self.has_next:
+            return None
+        if not self.page:
+            # Everything before the cursor has gone: start again at the top
+            return remove_query_param(self.base_url, self.cursor_query_param)
+        return self.encode_cursor(Cursor(offset=0, reverse=False, position=self.encode_position(self.page[-1])))
+
+    def get_previous_link(self):
+        if not self.has_previous:
+            return None
+        if not self.page:
+            return self.encode_cursor(Cursor(offset=0, reverse=True, position=self.position))
+        return self.encode_cursor(Cursor(offset=0, reverse=True, position=self.encode_position(self.page[0])))
+
+class JobCursorPagination(KeysetCursorPagination):
+    """
+    Keyset pagination over (created_at, id), backed by the matching index on
+    Job, so deep pages cost the same as the first one and no COUNT(*) is run.
+    """
+    ordering = ('-created_at', '-id')
+    page_size_query_param = 'page_size'
+    max_page_size = 100
+
+class RankedJobCursorPagination(JobCursorPagination):
+    """
+    Keyset pagination for full-text results, ordered by relevance first.
+    """
+    ordering = ('search_rank', '-created_at', '-id')
+
+class AsyncPageNumberPagination(PageNumberPagination):
+    """
+    The default page-number pagination, with an async variant that counts and
+    fetches the page through the async ORM.
+    """
+
+    async def apaginate_queryset(self, queryset, request, view=None):
+        page_size = self.get_page_size(request)
+        if not page_size:
+            return None
+
+        paginator = Paginator(queryset, page_size)
+        # Paginator.count is a cached property; fill it so nothing below
+        # queries synchronously
+        paginator.count = await queryset.acount()
+        page_number = self.get_page_number(request, paginator)
+        try:
+            number = paginator.validate_number(page_number)
+        except InvalidPage as exc:
+            msg = self.invalid_page_message.format(page_number=page_number, message=str(exc))
+            raise NotFound(msg)
+
+        bottom = (number - 1) * page_size
+        rows = [row async for row in queryset[bottom:bottom + page_size]]
+        self.page = Page(rows, number, paginator)
+        if paginator.num_pages > 1 and self.template is not None:
+            self.display_page_controls = True
+        self.request = request
+        return list(self.page)
+
+class JobAlertCursorPagination(KeysetCursorPagination):
+    """
+    Keyset pagination over (created_at, id), backed by the per-user index on
+    JobAlert.
+    """
+    ordering = ('-created_at', '-id')
+    page_size_query_param = 'page_size'
+    max_page_size = 100
@@ -0,0 +1,143 @@
+"""
+Full-text search over jobs.
+
+SQLite keeps an FTS5 table (``jobs_job_fts``) that is updated from the
+``Job`` save/delete signals. PostgreSQL uses a generated, GIN-indexed
+``search_vector`` tsvector column on ``jobs_job``. Any other database falls
+back to substring matching.
+"""
+import re
+
+from django.db import connection
+from django.db.models import F, FloatField, Lookup, Q
+from django.db.models.functions import Cast
+from django.db.models.expressions import RawSQL
+
+from .models import Job, JobSearchEntry
+
+FTS_TABLE = 'jobs_job_fts'
+
+# Columns copied into the FTS5 table and their bm25 weights.
+INDEXED_FIELDS = ('title', 'skills_required', 'description')
+FIELD_WEIGHTS = (10.0, 5.0, 1.0)
+
+TOKEN_RE = re.compile(r'\w+', re.UNICODE)
+
+
+class FullTextMatch(Lookup):
+    lookup_name = 'match'
+
+    def as_sql(self, compiler, connection):
+        lhs, lhs_params = self.process_lhs(compiler, connection)
+        rhs, rhs_params = self.process_rhs(compiler, connection)
+        return f'{lhs} MATCH {rhs}', lhs_params + rhs_params
+
+
+JobSearchEntry._meta.get_field('document').register_lookup(FullTextMatch)
+
+
+def tokenize(query):
+    return TOKEN_RE.findall(query.lower())
+
+
+def _fts5_query(tokens):
+    # Quote every token so user input can never be parsed as FTS5 syntax, and
+    # prefix-match the last one since the search box queries as the user types.
+    terms = ['"%s"' % token for token in tokens[:-1]]
+    terms.append('"%s"*' % tokens[-1])
+    return ' '.join(terms)
+
+
+def _tsquery(tokens):
+    terms = ["'%s'" % token for token in tokens[:-1]]
+    terms.append("'%s':*" % tokens[-1])
+    return ' & '.join(terms)
+
+
+def _substring_search(queryset, query):
+    return queryset.filter(
+        Q(title__icontains=query) |
+        Q(description__icontains=query) |
+        Q(skills_required__icontains=query)
+    )
+
+
+def search_jobs(queryset, query):
+    """
+    Filter a Job queryset down to matches for ``query``, ordered by relevance.
+
+    The relevance score is exposed as the ``search_rank`` annotation; lower is
+    better on every backend.
+    """
+    tokens = tokenize(query)
+    if not tokens:
+        return _substring_search(queryset, query)
+
+    if connection.vendor == 'sqlite':
+        return queryset.filter(
+            search_entry__document__match=_fts5_query(tokens)
+        ).annotate(
+            search_rank=F('search_entry__rank')
+        ).order_by('search_rank', '-created_at', '-id')
+
+    if connection.vendor == 'postgresql':
+        from django.contrib.postgres.search import SearchQuery, SearchRank, SearchVectorField
+
+        search_query = SearchQuery(_tsquery(tokens), search_type='raw')
+        vector = RawSQL('"jobs_job"."search_vector"', [], output_field=SearchVectorField())
+        return queryset.annotate(
+            search_vector=vector
+        ).filter(
+            search_vector=search_query
+        ).annotate(
+            # ts_rank is a real; as a double it compares equal to the value a
+            # cursor carries back
+            search_rank=Cast(-SearchRank(vector, search_query), FloatField())
+        ).order_by('search_rank', '-created_at', '-id')
+
+    return _substring_search(queryset, query)
+
+
+def index_job(job, created=False):
+    """
+    Write a single job's text into the SQLite FTS5 table.
+    """
+    if connection.vendor != 'sqlite':
+        return
+    values = [getattr(job, field) or '' for field in INDEXED_FIELDS]
+    with connection.cursor() as cursor:
+        if not created:
+            cursor.execute(f'DELETE FROM {FTS_TABLE} WHERE rowid = %s', [job.pk])
+        cursor.execute(
+            f'INSERT INTO {FTS_TABLE} (rowid, {", ".join(INDEXED_FIELDS)}) VALUES (%s, %s, %s, %s)',
+            [job.pk] + values,
+        )
+
+
+def unindex_job(job_id):
+    if connection.vendor != 'sqlite':
+        return
+    with connection.cursor() as cursor:
+        cursor.execute(f'DELETE FROM {FTS_TABLE} WHERE rowid = %s', [job_id])
+
+
+def rebuild_index():
+    """
+    Repopulate the SQLite FTS5 table from ``jobs_job``.
+
+    Needed after writes that bypass model signals, such as ``bulk_create`` or
+    ``QuerySet.update``. PostgreSQL maintains its generated column itself.
+    """
+    if connection.vendor != 'sqlite':
+        return
+    columns = ', '.join(INDEXED_FIELDS)
+    weights = ', '.join(str(weight) for weight in FIELD_WEIGHTS)
+    with connection.cursor() as cursor:
+        cursor.execute(f'DELETE FROM {FTS_TABLE}')
+        cursor.execute(
+            f'INSERT INTO {FTS_TABLE} (rowid, {columns}) '
+            f'SELECT id, {columns} FROM {Job._meta.db_table}'
+        )
+        cursor.execute(
+            f"INSERT INTO {FTS_TABLE} ({FTS_TABLE}, rank) VALUES ('rank', 'bm25({weights})')"
+        )
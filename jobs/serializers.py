@@ -1,5 +1,10 @@
+import re
+
+from django.conf import settings
+from django.urls import reverse
+from django.utils import timezone
 from rest_framework import serializers
-from .models import Category, Job, JobAttachment
+from .models import AttachmentUpload, Category, Job, JobAlert, JobAttachment, SavedSearch
 from accounts.serializers import UserSerializer
 
 class CategorySerializer(serializers.ModelSerializer):
@@ -8,10 +13,43 @@ class CategorySerializer(serializers.ModelSerializer):
         fields = '__all__'
 
 class JobAttachmentSerializer(serializers.ModelSerializer):
+    # Served with range support, unlike the plain media URL in ``file``
+    download_url = serializers.SerializerMethodField()
+    
     class Meta:
         model = JobAttachment
         fields = '__all__'
 
+    def get_download_url(self, attachment):
+        return reverse('job-attachment-download', args=[attachment.pk])
+
+class AttachmentUploadSerializer(serializers.ModelSerializer):
+    attachment = JobAttachmentSerializer(read_only=True)
+    
+    class Meta:
+        model = AttachmentUpload
+        fields = ['id', 'job', 'name', 'size', 'content_type', 'sha256', 'received', 'status', 'attachment',
+                  'error', 'created_at']
+        read_only_fields = ['id', 'received', 'status', 'error', 'created_at']
+
+    def validate_name(self, value):
+        # Just the file name, whichever separators the client's OS uses
+        value = value.replace('\\', '/').rsplit('/', 1)[-1].strip()
+        if not value:
+            raise serializers.ValidationError('Must be a file name')
+        return value
+
+    def validate_size(self, value):
+        if not 0 < value <= settings.ATTACHMENT_MAX_SIZE:
+            raise serializers.ValidationError(f'Must be between 1 and {settings.ATTACHMENT_MAX_SIZE} bytes')
+        return value
+
+    def validate_sha256(self, value):
+        value = value.lower()
+        if value and not re.fullmatch(r'[0-9a-f]{64}', value):
+            raise serializers.ValidationError('Must be a hex SHA-256 digest')
+        return value
+
 class JobSerializer(serializers.ModelSerializer):
     recruiter = UserSerializer(read_only=True)
     category = CategorySerializer(read_only=True)
@@ -39,3 +77,79 @@ class JobListSerializer(serializers.ModelSerializer):
         fields = ['id', 'title', 'description', 'category', 'recruiter', 'job_type', 
                  'budget_min', 'budget_max', 'hourly_rate_min', 'hourly_rate_max',
                  'experience_level', 'created_at', 'status']
+
+# The columns behind JobListSerializer's fields, in its field order; the
+# category and recruiter are rendered by their __str__, which is the name read
+# through the join
+JOB_LIST_COLUMNS = ('id', 'title', 'description', 'category__name', 'recruiter__username', 'job_type',
+                    'budget_min', 'budget_max', 'hourly_rate_min', 'hourly_rate_max',
+                    'experience_level', 'created_at', 'status')
+
+def job_list_rows(queryset, ordering=()):
+    """
+    ``queryset`` as rows for ``job_list_data``. Columns named in ``ordering``
+    (a cursor paginator's) are fetched too, for the cursor positions.
+    """
+    extra = [field.lstrip('-') for field in ordering if field.lstrip('-') not in JOB_LIST_COLUMNS]
+    return queryset.values_list(*JOB_LIST_COLUMNS, *extra, named=True)
+
+def job_list_data(rows):
+    """
+    ``JobListSerializer(jobs, many=True).data`` for the same jobs, built from
+    ``job_list_rows`` without DRF's per-field calls. Renders to the same JSON.
+    """
+    # DateTimeField shows datetimes in the current time zone, ISO 8601 with Z
+    # for UTC; DecimalField as fixed-point strings, which the database already
+    # returns quantized to the model's decimal places
+    tz = timezone.get_current_timezone() if settings.USE_TZ else None
+    data = []
+    append = data.append
+    for (pk, title, description, category, recruiter, job_type, budget_min, budget_max,
+         hourly_rate_min, hourly_rate_max, experience_level, created_at, status, *_) in rows:
+        if tz is not None:
+            created_at = created_at.astimezone(tz)
+        created_at = created_at.isoformat()
+        if created_at.endswith('+00:00'):
+            created_at = created_at[:-6] + 'Z'
+        append({
+            'id': pk,
+            'title': title,
+            'description': description,
+            'category': category,
+            'recruiter': recruiter,
+            'job_type': job_type,
+            'budget_min': None if budget_min is None else f'{budget_min:f}',
+            'budget_max': None if budget_max is None else f'{budget_max:f}',
+            'hourly_rate_min': None if hourly_rate_min is None else f'{hourly_rate_min:f}',
+            'hourly_rate_max': None if hourly_rate_max is None else f'{hourly_rate_max:f}',
+            'experience_level': experience_level,
+            'created_at': created_at,
+            'status': status,
+        })
+    return data
+
+class SavedSearchSerializer(serializers.ModelSerializer):
+    class Meta:
+        model = SavedSearch
+        fields = ['id', 'name', 'query', 'category', 'job_type', 'experience_level',
+                 'min_budget', 'max_budget', 'created_at']
+        read_only_fields = ['id', 'created_at']
+
+    def validate(self, attrs):
+        min_budget = attrs.get('min_budget', getattr(self.instance, 'min_budget', None))
+        max_budget = attrs.get('max_budget', getattr(self.instance, 'max_budget', None))
+        if min_budget is not None and max_budget is not None and min_budget > max_budget:
+            raise serializers.ValidationError({'max_budget': 'Must not be below min_budget'})
+        return attrs
+
+    def create(self, validated_data):
+        validated_data['user'] = self.context['request'].user
+        return super().create(validated_data)
+
+class JobAlertSerializer(serializers.ModelSerializer):
+    job = JobListSerializer(read_only=True)
+    
+    class Meta:
+        model = JobAlert
+        fields = ['id', 'saved_search', 'job', 'is_read', 'created_at']
+        read_only_fields = fields
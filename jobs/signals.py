@@ -0,0 +1,69 @@
+from django.db.models.signals import post_save, post_delete, pre_save
+from django.dispatch import receiver
+from accounts.models import User, FreelancerProfile
+from .models import Category, Job, JobAttachment, SavedSearch
+from .cache import bump_generation
+from .skills import sync_skills
+from . import alerts, autocomplete, search, tasks
+
+@receiver(post_save, sender=Job)
+def index_job_on_save(sender, instance, created, update_fields=None, **kwargs):
+    """
+    Keep the full-text index in step with the job's searchable text
+    """
+    if update_fields and not set(update_fields) & set(search.INDEXED_FIELDS):
+        return
+    search.index_job(instance, created=created)
+
+@receiver(post_delete, sender=Job)
+def unindex_job_on_delete(sender, instance, **kwargs):
+    search.unindex_job(instance.pk)
+
+@receiver(post_save, sender=Job)
+def sync_job_skills(sender, instance, update_fields=None, **kwargs):
+    if update_fields and 'skills_required' not in update_fields:
+        return
+    sync_skills(instance, instance.skills_required)
+
+@receiver(post_save, sender=Job)
+def refresh_autocomplete(sender, instance, update_fields=None, **kwargs):
+    if update_fields and not set(update_fields) & autocomplete.SOURCE_FIELDS:
+        return
+    autocomplete.refresh_job(instance)
+
+@receiver(post_delete, sender=Job)
+def remove_from_autocomplete(sender, instance, **kwargs):
+    autocomplete.forget_job(instance.pk)
+
+@receiver(post_save, sender=Category)
+@receiver(post_delete, sender=Category)
+def reload_autocomplete(sender, **kwargs):
+    autocomplete.invalidate()
+
+@receiver(post_save, sender=Job)
+def queue_job_alerts(sender, instance, created, **kwargs):
+    if created:
+        tasks.send_job_alerts.delay(job_id=instance.pk)
+
+@receiver(pre_save, sender=SavedSearch)
+def set_saved_search_anchor(sender, instance, **kwargs):
+    instance.anchor = alerts.search_anchor(instance)
+
+@receiver(post_save, sender=Job)
+@receiver(post_delete, sender=Job)
+@receiver(post_save, sender=JobAttachment)
+@receiver(post_delete, sender=JobAttachment)
+@receiver(post_save, sender=Category)
+@receiver(post_delete, sender=Category)
+@receiver(post_save, sender=FreelancerProfile)
+@receiver(post_delete, sender=FreelancerProfile)
+def invalidate_cached_responses(sender, **kwargs):
+    bump_generation(sender)
+
+@receiver(post_save, sender=User)
+@receiver(post_delete, sender=User)
+def invalidate_cached_user_responses(sender, update_fields=None, **kwargs):
+    # Logging in only touches last_login, which no cached response shows
+    if update_fields and set(update_fields) <= {'last_login'}:
+        return
+    bump_generation(sender)
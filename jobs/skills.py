@@ -0,0 +1,140 @@
+"""
+Skill taxonomy helpers.
+
+``Job.skills_required`` and ``FreelancerProfile.skills`` stay the editable,
+comma-separated source of truth; they are parsed into canonical ``Skill`` rows
+(resolving ``SkillAlias`` spellings) so skill filters can run against the
+many-to-many join tables instead of substring scans.
+"""
+from django.db.models import Count
+
+from .models import Skill, SkillAlias
+
+
+# What Skill.name and Skill.normalized_name hold
+MAX_SKILL_LENGTH = Skill._meta.get_field('normalized_name').max_length
+
+
+def normalize_skill(name):
+    return ' '.join(name.lower().split())
+
+
+def skill_name(text):
+    """
+    A skill name as stored: whitespace collapsed and cut to ``Skill.name``.
+    """
+    return ' '.join(text.split())[:MAX_SKILL_LENGTH].rstrip()
+
+
+def skill_key(name):
+    """
+    The ``Skill.normalized_name`` / ``SkillAlias.alias`` of a name. Derived
+    from the cut name, so names that are stored alike share a key.
+    """
+    return normalize_skill(skill_name(name))[:MAX_SKILL_LENGTH]
+
+
+def parse_skills(text):
+    """
+    Split a comma-separated skill string into unique, stripped names, each
+    cut to the length a ``Skill`` holds.
+    """
+    names = []
+    seen = set()
+    for part in (text or '').split(','):
+        name = skill_name(part)
+        key = skill_key(name)
+        if key and key not in seen:
+            seen.add(key)
+            names.append(name)
+    return names
+
+
+def resolve_skills(names, create=False):
+    """
+    Map skill names to canonical ``Skill`` rows, keyed by normalized name.
+
+    Aliases win over direct name matches. Unknown names are created as new
+    skills when ``create`` is true and left out of the result otherwise.
+    """
+    keys = {skill_key(name): skill_name(name) for name in names}
+    if not keys:
+        return {}
+
+    resolved = {
+        alias.alias: alias.skill
+        for alias in SkillAlias.objects.filter(alias__in=keys).select_related('skill')
+    }
+    missing = [key for key in keys if key not in resolved]
+    if missing:
+        for skill in Skill.objects.filter(normalized_name__in=missing):
+            resolved[skill.normalized_name] = skill
+
+    if create:
+        for key, name in keys.items():
+            if key not in resolved:
+                resolved[key], _ = Skill.objects.get_or_create(
+                    normalized_name=key, defaults={'name': name}
+                )
+    return resolved
+
+
+async def aresolve_skills(names):
+    """
+    Async ``resolve_skills`` for lookups; it never creates skills.
+    """
+    keys = {skill_key(name) for name in names}
+    if not keys:
+        return {}
+
+    resolved = {
+        alias.alias: alias.skill
+        async for alias in SkillAlias.objects.filter(alias__in=keys).select_related('skill')
+    }
+    missing = [key for key in keys if key not in resolved]
+    if missing:
+        async for skill in Skill.objects.filter(normalized_name__in=missing):
+            resolved[skill.normalized_name] = skill
+    return resolved
+
+
+def sync_skills(instance, text):
+    """
+    Point ``instance.canonical_skills`` at the skills parsed from ``text``.
+    """
+    skills = resolve_skills(parse_skills(text), create=True)
+    instance.canonical_skills.set({skill.pk for skill in skills.values()})
+
+
+def filter_by_skills(queryset, skills_param):
+    """
+    Restrict a queryset of a model with ``canonical_skills`` to rows linked to
+    every skill named in ``skills_param`` (comma-separated).
+    """
+    names = parse_skills(skills_param)
+    if not names:
+        return queryset
+    return _filter_by_resolved_skills(queryset, names, resolve_skills(names))
+
+
+async def afilter_by_skills(queryset, skills_param):
+    names = parse_skills(skills_param)
+    if not names:
+        return queryset
+    return _filter_by_resolved_skills(queryset, names, await aresolve_skills(names))
+
+
+def _filter_by_resolved_skills(queryset, names, resolved):
+    if len(resolved) < len(names):
+        # At least one requested skill does not exist, so nothing can match
+        return queryset.none()
+
+    skill_ids = {skill.pk for skill in resolved.values()}
+    field = queryset.model._meta.get_field('canonical_skills')
+    owner_column = field.m2m_column_name()
+    matching = field.remote_field.through.objects.filter(
+        skill_id__in=skill_ids
+    ).values(owner_column).annotate(
+        matched=Count('skill_id')
+    ).filter(matched=len(skill_ids)).values(owner_column)
+    return queryset.filter(pk__in=matching)
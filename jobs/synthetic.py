@@ -0,0 +1,426 @@
+"""
+Synthetic dataset generator behind ``populate_sample_data --users/--jobs/...``.
+
+Rows are generated batch by batch from a seeded NumPy generator and written
+with ``bulk_create``, so a given seed and set of counts always produces the
+same data on an empty database. Skills follow a Zipf-like popularity curve per
+category, job popularity (applications per job) and recruiter activity are
+heavy-tailed, and budgets and rates are log-normal.
+
+``bulk_create`` skips model signals, so everything the signals would maintain
+(skill links, the full-text index, inbox counters, rating aggregates, cache
+generations, the autocomplete index) is written or rebuilt here in bulk instead.
+"""
+from datetime import datetime, timedelta, timezone as dt_timezone
+
+import numpy as np
+from django.contrib.auth.hashers import make_password
+from django.db import transaction
+
+from accounts.models import User, FreelancerProfile, RecruiterProfile
+from applications.inbox import rebuild_counters
+from applications.models import Application, Message, Review
+from applications.stats import rebuild_profile_stats
+from . import autocomplete
+from .cache import bump_generation
+from .models import Category, Job
+from .search import rebuild_index
+from .skills import resolve_skills, skill_key
+
+# Timestamps are laid out backwards from a fixed instant so that a seed always
+# yields the same rows
+EPOCH = datetime(2025, 1, 1, tzinfo=dt_timezone.utc)
+HISTORY_DAYS = 365
+
+PASSWORD = 'password123'
+
+# Most popular first; popularity falls off as 1 / rank
+CATEGORY_SKILLS = {
+    'Web Development': ['JavaScript', 'React', 'Python', 'Django', 'Node.js', 'HTML', 'CSS',
+                        'TypeScript', 'PHP', 'WordPress', 'PostgreSQL', 'Vue.js', 'REST APIs'],
+    'Mobile App Development': ['Flutter', 'React Native', 'Swift', 'Kotlin', 'iOS', 'Android',
+                               'Firebase', 'Dart', 'Mobile Design'],
+    'Data Science': ['Python', 'SQL', 'Pandas', 'Machine Learning', 'Data Analysis', 'Statistics',
+                     'TensorFlow', 'PyTorch', 'R', 'Matplotlib'],
+    'Graphic Design': ['Figma', 'UI/UX Design', 'Photoshop', 'Illustrator', 'Branding',
+                       'Logo Design', 'Prototyping', 'Adobe Creative Suite'],
+    'Content Writing': ['Content Writing', 'SEO', 'Copywriting', 'Technical Writing', 'Research',
+                        'Editing', 'Blogging'],
+    'Digital Marketing': ['SEO', 'Social Media', 'Google Ads', 'Email Marketing', 'Analytics',
+                          'Content Strategy', 'Copywriting'],
+    'Video Editing': ['Premiere Pro', 'After Effects', 'Final Cut Pro', 'Motion Graphics',
+                      'Color Grading', 'Video Production'],
+    'Cybersecurity': ['Network Security', 'Linux', 'Penetration Testing', 'Python', 'AWS',
+                      'Cloud Security', 'Security Audits'],
+}
+
+TITLE_TEMPLATES = [
+    'Build a {skill} {thing}',
+    '{skill} developer needed for {thing}',
+    'Senior {skill} expert for {thing}',
+    'Improve our {thing} with {skill}',
+    '{skill} and {other} work on a {thing}',
+    'Quick {skill} fix for an existing {thing}',
+]
+THINGS = ['website', 'mobile app', 'dashboard', 'landing page', 'data pipeline', 'online store',
+          'marketing campaign', 'brand identity', 'internal tool', 'API', 'report', 'video series']
+DESCRIPTION_SENTENCES = [
+    'We are looking for someone experienced with {skill} to help us ship this {thing}.',
+    'The project covers planning, implementation and a short handover.',
+    'You will work closely with our product team and report progress weekly.',
+    'Experience with {other} is a strong plus.',
+    'Please include links to similar work in your proposal.',
+    'The {thing} is already in production and serves thousands of users every day.',
+    'We value clear communication and well documented deliverables.',
+    'Timeline is flexible for the right candidate, but we would like to start soon.',
+]
+COVER_LETTERS = [
+    'I have delivered several similar projects and would love to help with this one.',
+    'My background in {skill} matches your requirements closely.',
+    'I can start immediately and have availability for the whole project.',
+    'Happy to share references and walk you through my previous work.',
+]
+CHAT_LINES = [
+    'Thanks for the update!', 'Could you share the latest draft?', 'I pushed the changes.',
+    'When would be a good time for a call?', 'The deadline works for me.',
+    'I have a question about the requirements.', 'Looks great, thank you.',
+    'I will have the next milestone ready tomorrow.', 'Can we adjust the scope slightly?',
+]
+FIRST_NAMES = ['Alex', 'Sam', 'Jordan', 'Taylor', 'Morgan', 'Casey', 'Riley', 'Jamie', 'Avery',
+               'Quinn', 'Priya', 'Wei', 'Carlos', 'Fatima', 'Olu', 'Yuki', 'Lena', 'Ivan']
+LAST_NAMES = ['Smith', 'Garcia', 'Chen', 'Patel', 'Okafor', 'Kowalski', 'Nguyen', 'Silva',
+              'Müller', 'Johnson', 'Haddad', 'Sato', 'Brown', 'Rossi']
+COMPANY_WORDS = ['Blue', 'North', 'Bright', 'Pixel', 'Summit', 'Atlas', 'Nimbus', 'Cedar']
+COMPANY_SUFFIXES = ['Labs', 'Studio', 'Digital', 'Systems', 'Media', 'Ventures']
+INDUSTRIES = ['Technology', 'Design', 'Finance', 'Healthcare', 'Retail', 'Education', 'Media']
+
+JOB_STATUSES = ['open', 'in_progress', 'completed', 'cancelled']
+JOB_STATUS_WEIGHTS = [0.55, 0.15, 0.25, 0.05]
+EXPERIENCE_LEVELS = ['beginner', 'intermediate', 'expert']
+EXPERIENCE_LEVEL_WEIGHTS = [0.25, 0.5, 0.25]
+APPLICATION_STATUSES = ['pending', 'rejected', 'withdrawn']
+APPLICATION_STATUS_WEIGHTS = [0.8, 0.15, 0.05]
+REVIEW_RATINGS = [1, 2, 3, 4, 5]
+REVIEW_RATING_WEIGHTS = [0.03, 0.05, 0.12, 0.35, 0.45]
+
+
+def _zipf_weights(count):
+    weights = 1.0 / np.arange(1, count + 1)
+    return weights / weights.sum()
+
+
+def _heavy_tail_weights(rng, count):
+    weights = rng.pareto(1.5, count) + 1
+    return weights / weights.sum()
+
+
+class SyntheticDataGenerator:
+    def __init__(self, seed=42, batch_size=5000, log=print):
+        self.seed = seed
+        self.rng = np.random.default_rng(seed)
+        self.batch_size = batch_size
+        self.log = log
+        self.prefix = f's{seed}_'
+
+    def generate(self, users=0, jobs=0, applications=0, messages=0, reviews=0):
+        with transaction.atomic():
+            self.skill_ids = self.load_skills()
+            if users:
+                self.create_users(users)
+            if jobs:
+                self.create_jobs(jobs)
+            if applications:
+                self.create_applications(applications)
+            if messages:
+                self.create_messages(messages)
+            if reviews:
+                self.create_reviews(reviews)
+            self.refresh_derived_data()
+
+    # Helpers
+
+    def pick(self, options, size=None, weights=None):
+        return np.asarray(options, dtype=object)[self.rng.choice(len(options), size=size, p=weights)]
+
+    def timestamps(self, size, earliest=None, spread_days=HISTORY_DAYS):
+        """
+        ``size`` instants within ``spread_days`` after ``earliest`` (seconds
+        since EPOCH, defaulting to the start of the history window).
+        """
+        if earliest is None:
+            earliest = np.full(size, -HISTORY_DAYS * 86400.0)
+        offsets = self.rng.uniform(0, spread_days * 86400.0, size)
+        return np.minimum(earliest + offsets, 0)
+
+    def as_datetime(self, seconds):
+        return EPOCH + timedelta(seconds=float(seconds))
+
+    def batches(self, total):
+        for start in range(0, total, self.batch_size):
+            yield start, min(self.batch_size, total - start)
+
+    def load_skills(self):
+        names = {name for skills in CATEGORY_SKILLS.values() for name in skills}
+        resolved = resolve_skills(names, create=True)
+        return {name: resolved[skill_key(name)].pk for name in names}
+
+    def sample_skills(self, category, size_range=(2, 6)):
+        skills = CATEGORY_SKILLS[category]
+        count = min(int(self.rng.integers(*size_range)), len(skills))
+        rows = self.rng.choice(len(skills), size=count, replace=False, p=_zipf_weights(len(skills)))
+        return [skills[row] for row in rows]
+
+    def fill(self, template, skills):
+        return template.format(
+            skill=skills[0],
+            other=skills[1] if len(skills) > 1 else skills[0],
+            thing=THINGS[int(self.rng.integers(len(THINGS)))],
+        )
+
+    # Stages
+
+    def create_users(self, total):
+        if User.objects.filter(username__startswith=self.prefix).exists():
+            raise ValueError(f'Synthetic users for seed {self.seed} already exist')
+        # Hashing is deliberately slow; do it once and share the hash
+        password = make_password(PASSWORD)
+        categories = list(CATEGORY_SKILLS)
+        category_weights = _zipf_weights(len(categories))
+        created = 0
+        for start, size in self.batches(total):
+            is_freelancer = self.rng.random(size) < 0.75
+            first = self.pick(FIRST_NAMES, size)
+            last = self.pick(LAST_NAMES, size)
+            joined = self.timestamps(size)
+            users = User.objects.bulk_create([
+                User(
+                    username=f'{self.prefix}{start + i}',
+                    email=f'{self.prefix}{start + i}@example.com',
+                    first_name=first[i],
+                    last_name=last[i],
+                    user_type='freelancer' if is_freelancer[i] else 'recruiter',
+                    password=password,
+                    date_joined=self.as_datetime(joined[i]),
+                    created_at=self.as_datetime(joined[i]),
+                )
+                for i in range(size)
+            ])
+
+            freelancers = [user for user in users if user.user_type == 'freelancer']
+            recruiters = [user for user in users if user.user_type == 'recruiter']
+            rates = np.round(self.rng.lognormal(np.log(45), 0.5, len(freelancers)), 2)
+            years = np.minimum(self.rng.geometric(0.2, len(freelancers)) - 1, 30)
+            profile_skills = [
+                self.sample_skills(categories[self.rng.choice(len(categories), p=category_weights)])
+                for _ in freelancers
+            ]
+            profiles = FreelancerProfile.objects.bulk_create([
+                FreelancerProfile(
+                    user=user,
+                    skills=', '.join(skills),
+                    hourly_rate=rates[i],
+                    experience_years=int(years[i]),
+                )
+                for i, (user, skills) in enumerate(zip(freelancers, profile_skills))
+            ])
+            through = FreelancerProfile.canonical_skills.through
+            through.objects.bulk_create([
+                through(freelancerprofile_id=profile.pk, skill_id=self.skill_ids[name])
+                for profile, skills in zip(profiles, profile_skills)
+                for name in skills
+            ])
+            RecruiterProfile.objects.bulk_create([
+                RecruiterProfile(
+                    user=user,
+                    company_name=f'{self.pick(COMPANY_WORDS)} {self.pick(COMPANY_SUFFIXES)}',
+                    industry=self.pick(INDUSTRIES),
+                    verified=bool(self.rng.random() < 0.3),
+                )
+                for user in recruiters
+            ])
+            created += size
+            self.log(f'Users: {created}/{total}')
+
+    def create_jobs(self, total):
+        recruiter_ids = np.array(
+            User.objects.filter(user_type='recruiter').order_by('id').values_list('id', flat=True)
+        )
+        if not len(recruiter_ids):
+            raise ValueError('Jobs need at least one recruiter; pass --users as well')
+        categories = {
+            category.name: category.pk
+            for category in Category.objects.filter(name__in=list(CATEGORY_SKILLS))
+        }
+        names = [name for name in CATEGORY_SKILLS if name in categories]
+        category_weights = _zipf_weights(len(names))
+        recruiter_weights = _heavy_tail_weights(self.rng, len(recruiter_ids))
+
+        created = 0
+        for start, size in self.batches(total):
+            category_names = self.pick(names, size, category_weights)
+            recruiters = recruiter_ids[self.rng.choice(len(recruiter_ids), size=size, p=recruiter_weights)]
+            statuses = self.pick(JOB_STATUSES, size, JOB_STATUS_WEIGHTS)
+            levels = self.pick(EXPERIENCE_LEVELS, size, EXPERIENCE_LEVEL_WEIGHTS)
+            hourly = self.rng.random(size) < 0.4
+            budgets = np.round(self.rng.lognormal(np.log(1500), 0.8, size), -1)
+            rates = np.round(self.rng.lognormal(np.log(40), 0.4, size))
+            created_at = self.timestamps(size)
+            deadlines = created_at + self.rng.integers(7, 90, size) * 86400.0
+
+            jobs, job_skills = [], []
+            for i in range(size):
+                skills = self.sample_skills(category_names[i])
+                sentences = self.rng.choice(len(DESCRIPTION_SENTENCES), size=3, replace=False)
+                job = Job(
+                    title=self.fill(TITLE_TEMPLATES[int(self.rng.integers(len(TITLE_TEMPLATES)))], skills)[:200],
+                    description=' '.join(self.fill(DESCRIPTION_SENTENCES[s], skills) for s in sentences),
+                    category_id=categories[category_names[i]],
+                    recruiter_id=int(recruiters[i]),
+                    job_type='hourly' if hourly[i] else 'fixed',
+                    experience_level=levels[i],
+                    skills_required=', '.join(skills),
+                    deadline=self.as_datetime(deadlines[i]),
+                    status=statuses[i],
+                    created_at=self.as_datetime(created_at[i]),
+                )
+                if hourly[i]:
+                    job.hourly_rate_min = rates[i]
+                    job.hourly_rate_max = rates[i] * 1.5
+                else:
+                    job.budget_min = budgets[i]
+                    job.budget_max = budgets[i] * 1.5
+                # bulk_create skips save()
+                job.set_effective_range()
+                jobs.append(job)
+                job_skills.append(skills)
+
+            jobs = Job.objects.bulk_create(jobs)
+            through = Job.canonical_skills.through
+            through.objects.bulk_create([
+                through(job_id=job.pk, skill_id=self.skill_ids[name])
+                for job, skills in zip(jobs, job_skills)
+                for name in skills
+            ])
+            created += size
+            self.log(f'Jobs: {created}/{total}')
+
+    def create_applications(self, total):
+        jobs = list(Job.objects.order_by('id').values_list('id', 'status', 'created_at', 'skills_required'))
+        freelancer_ids = np.array(
+            User.objects.filter(user_type='freelancer').order_by('id').values_list('id', flat=True)
+        )
+        if not jobs or not len(freelancer_ids):
+            raise ValueError('Applications need jobs and freelancers')
+
+        # Heavy-tailed popularity, each job capped at one application per freelancer
+        counts = self.rng.multinomial(total, _heavy_tail_weights(self.rng, len(jobs)))
+        counts = np.minimum(counts, len(freelancer_ids))
+
+        pending = []
+        created = 0
+        for (job_id, status, created_at, skills), count in zip(jobs, counts):
+            if not count:
+                continue
+            freelancers = freelancer_ids[self.rng.choice(len(freelancer_ids), size=count, replace=False)]
+            base = (created_at - EPOCH).total_seconds()
+            applied = np.sort(self.timestamps(count, np.full(count, base), spread_days=14))
+            skills = [name.strip() for name in skills.split(',')] or ['this']
+            hired = status in ('in_progress', 'completed')
+            for i in range(count):
+                if hired:
+                    app_status = 'accepted' if i == 0 else 'rejected'
+                else:
+                    app_status = self.pick(APPLICATION_STATUSES, weights=APPLICATION_STATUS_WEIGHTS)
+                pending.append(Application(
+                    job_id=job_id,
+                    freelancer_id=int(freelancers[i]),
+                    cover_letter=self.fill(COVER_LETTERS[int(self.rng.integers(len(COVER_LETTERS)))], skills),
+                    proposed_rate=round(float(self.rng.lognormal(np.log(45), 0.4)), 2),
+                    status=app_status,
+                    applied_at=self.as_datetime(applied[i]),
+                    last_activity_at=self.as_datetime(applied[i]),
+                ))
+            if len(pending) >= self.batch_size:
+                Application.objects.bulk_create(pending, ignore_conflicts=True)
+                created += len(pending)
+                pending = []
+                self.log(f'Applications: {created}/{total}')
+        Application.objects.bulk_create(pending, ignore_conflicts=True)
+        self.log(f'Applications: {created + len(pending)}/{total}')
+
+    def create_messages(self, total):
+        applications = np.array(list(
+            Application.objects.order_by('id').values_list('id', 'freelancer_id', 'job__recruiter_id')
+        ), dtype=np.int64).reshape(-1, 3)
+        applied_at = list(Application.objects.order_by('id').values_list('applied_at', flat=True))
+        if not len(applications):
+            raise ValueError('Messages need applications')
+
+        counts = self.rng.multinomial(total, _heavy_tail_weights(self.rng, len(applications)))
+        pending = []
+        created = 0
+        for row in np.flatnonzero(counts):
+            count = int(counts[row])
+            application_id, freelancer_id, recruiter_id = applications[row].tolist()
+            base = (applied_at[row] - EPOCH).total_seconds()
+            sent = np.sort(self.timestamps(count, np.full(count, base), spread_days=30))
+            from_freelancer = self.rng.random(count) < 0.5
+            # Everything but the tail of a conversation has been read
+            read = np.arange(count) < count - self.rng.integers(0, 4)
+            lines = self.rng.integers(len(CHAT_LINES), size=count)
+            for i in range(count):
+                pending.append(Message(
+                    application_id=application_id,
+                    sender_id=freelancer_id if from_freelancer[i] else recruiter_id,
+                    content=CHAT_LINES[lines[i]],
+                    timestamp=self.as_datetime(sent[i]),
+                    is_read=bool(read[i]),
+                ))
+            if len(pending) >= self.batch_size:
+                Message.objects.bulk_create(pending)
+                created += len(pending)
+                pending = []
+                self.log(f'Messages: {created}/{total}')
+        Message.objects.bulk_create(pending)
+        self.log(f'Messages: {created + len(pending)}/{total}')
+
+    def create_reviews(self, total):
+        # One review per completed job, by its recruiter for the hired freelancer
+        hired = list(Application.objects.filter(
+            status='accepted', job__status='completed', job__review__isnull=True
+        ).order_by('job_id').values_list('job_id', 'job__recruiter_id', 'freelancer_id', 'applied_at'))
+        hires = np.array([hire[:3] for hire in hired], dtype=np.int64).reshape(-1, 3)
+        if len(hires) < total:
+            self.log(f'Only {len(hires)} completed jobs can be reviewed')
+            total = len(hires)
+        rows = np.sort(self.rng.choice(len(hires), size=total, replace=False))
+        ratings = self.pick(REVIEW_RATINGS, total, REVIEW_RATING_WEIGHTS)
+        comments = self.rng.integers(len(CHAT_LINES), size=total)
+        # Left once the work is done: one to twelve weeks after the hire applied
+        applied = np.array([(hired[row][3] - EPOCH).total_seconds() for row in rows])
+        reviewed = self.timestamps(total, applied + 7 * 86400.0, spread_days=77)
+        created = 0
+        for start, size in self.batches(total):
+            Review.objects.bulk_create([
+                Review(
+                    job_id=int(hires[row, 0]),
+                    reviewer_id=int(hires[row, 1]),
+                    reviewee_id=int(hires[row, 2]),
+                    rating=int(ratings[start + i]),
+                    comment=CHAT_LINES[comments[start + i]],
+                    created_at=self.as_datetime(reviewed[start + i]),
+                )
+                for i, row in enumerate(rows[start:start + size])
+            ], ignore_conflicts=True)
+            created += size
+            self.log(f'Reviews: {created}/{total}')
+
+    def refresh_derived_data(self):
+        self.log('Rebuilding search index, inbox counters and profile stats')
+        rebuild_index()
+        rebuild_counters()
+        rebuild_profile_stats()
+        autocomplete.invalidate()
+        for model in (User, FreelancerProfile, RecruiterProfile, Category, Job,
+                      Application, Message, Review):
+            bump_generation(model)
@@ -0,0 +1,49 @@
+from datetime import timedelta
+
+from django.conf import settings
+from django.utils import timezone
+from taskqueue.queue import task
+from .models import AttachmentUpload, Job
+from . import alerts, uploads
+
+
+@task
+def send_job_alerts(job_id):
+    job = Job.objects.filter(pk=job_id).first()
+    if job is not None:
+        alerts.match_job(job)
+
+
+@task
+def finish_attachment_upload(upload_id):
+    """
+    Verify and store a fully received upload, recording a digest mismatch on
+    the upload for the client to see
+    """
+    upload = AttachmentUpload.objects.filter(pk=upload_id, status='processing').first()
+    if upload is None:
+        return
+    try:
+        uploads.complete(upload)
+    except uploads.DigestMismatch as mismatch:
+        AttachmentUpload.objects.filter(pk=upload_id).update(
+            status='failed', error=str(mismatch), updated_at=timezone.now(),
+        )
+
+
+@task
+def expire_attachment_upload(upload_id):
+    """
+    Drop an upload left untouched for ATTACHMENT_UPLOAD_EXPIRY seconds, or
+    look again once that long has passed since its last change; finished
+    uploads stay that long for the client to read their outcome
+    """
+    expiry = timedelta(seconds=settings.ATTACHMENT_UPLOAD_EXPIRY)
+    upload = AttachmentUpload.objects.filter(pk=upload_id).first()
+    if upload is not None and (upload.status == 'processing' or upload.updated_at + expiry > timezone.now()):
+        expire_attachment_upload.schedule(upload.updated_at + expiry, upload_id=upload_id)
+        return
+    # Also cleans up after uploads deleted along with their job
+    uploads.discard(upload_id)
+    if upload is not None:
+        upload.delete()
@@ -0,0 +1,47 @@
+"""
+Helpers shared by the apps' test suites.
+"""
+from django.core.cache import cache
+
+from .models import Job, JobAttachment
+
+
+class QueryBudgetMixin:
+    """
+    Assert that an endpoint issues a fixed number of queries, however many
+    rows end up on the page.
+    """
+    def setUp(self):
+        super().setUp()
+        # Measure the uncached path
+        cache.clear()
+    
+    def assertQueryBudget(self, url, budget, params=None,
+                          variants=({'page_size': 2}, {'page_size': 20})):
+        for variant in variants:
+            data = {**(params or {}), **variant}
+            with self.subTest(url=url, params=data):
+                with self.assertNumQueries(budget):
+                    response = self.client.get(url, data)
+                self.assertEqual(response.status_code, 200)
+                self.assertTrue(response.json()['results'])
+
+
+def create_jobs(recruiter, categories, count, attachments=1):
+    jobs = []
+    for i in range(count):
+        job = Job.objects.create(
+            title=f'Django developer {i}',
+            description='Build and maintain a Django REST API',
+            category=categories[i % len(categories)],
+            recruiter=recruiter,
+            job_type='fixed',
+            budget_min=100,
+            budget_max=500,
+            experience_level='intermediate',
+            skills_required='Python, Django',
+        )
+        for n in range(attachments):
+            JobAttachment.objects.create(job=job, file=f'job_attachments/brief-{i}-{n}.pdf')
+        jobs.append(job)
+    return jobs
@@ -1,3 +1,1040 @@
-from django.test import TestCase
+import hashlib
+import json
+import os
+import random
+import shutil
+import tempfile
+from decimal import Decimal
+from concurrent.futures import ThreadPoolExecutor
+from io import StringIO
+from urllib.parse import parse_qsl, urlsplit
+from unittest import mock, skipUnless
+from django.conf import settings
+from django.contrib.sessions.models import Session
+from django.core.cache import cache
+from django.core.management import call_command
+from django.core.management.base import CommandError
+from django.db import connection
+from django.test.utils import CaptureQueriesContext
+from django.test import RequestFactory, TestCase, override_settings
+from django.http import HttpResponse
+from django.urls import resolve
+from django.utils import timezone
+from rest_framework.renderers import JSONRenderer
+from rest_framework.request import Request
+from asgiref.sync import async_to_sync
+from importlib import import_module
+from django.apps import apps
+from accounts.models import FreelancerProfile, User
+from freelance_platform.db_routing import (
+    PIN_COOKIE, ReplicaPinningMiddleware, ReplicaRouter, pinned_to_primary,
+)
+from taskqueue.queue import run_pending
+from . import alerts, autocomplete, matching, search
+from .benchmark import compare_reports
+from .cache import GENERATION_PREFIX
+from .checks import check_response_cache_backend
+from .index_advisor import advise
+from .pagination import JobCursorPagination
+from .models import AttachmentUpload, Category, Job, JobAlert, JobAttachment, SavedSearch, Skill
+from .serializers import JobListSerializer, job_list_data, job_list_rows
+from .tasks import expire_attachment_upload, finish_attachment_upload
+from .testing import QueryBudgetMixin, create_jobs
 
-# Create your tests here.
+
+class JobQueryBudgetTests(QueryBudgetMixin, TestCase):
+    @classmethod
+    def setUpTestData(cls):
+        cls.recruiter = User.objects.create(username='recruiter', user_type='recruiter')
+        cls.categories = [Category.objects.create(name=f'Category {i}') for i in range(25)]
+        cls.jobs = create_jobs(cls.recruiter, cls.categories, 25, attachments=2)
+
+    def test_category_list(self):
+        self.assertQueryBudget('/api/jobs/categories/', 2, variants=({}, {'page': 2}))
+
+    def test_job_list(self):
+        self.assertQueryBudget('/api/jobs/jobs/', 2)
+
+    def test_job_list_filtered_by_skills(self):
+        self.assertQueryBudget('/api/jobs/jobs/', 4, params={'skills': 'python,django'})
+
+    def test_job_detail(self):
+        with self.assertNumQueries(3):
+            response = self.client.get(f'/api/jobs/jobs/{self.jobs[0].pk}/')
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(len(response.json()['attachments']), 2)
+
+    def test_search(self):
+        self.assertQueryBudget('/api/jobs/search/', 1, params={'q': 'django'})
+        self.assertQueryBudget('/api/jobs/search/', 1)
+
+
+@override_settings(RESPONSE_CACHE=True)
+class ResponseCacheTests(TestCase):
+    @classmethod
+    def setUpTestData(cls):
+        cls.recruiter = User.objects.create(username='recruiter', user_type='recruiter')
+        cls.category = Category.objects.create(name='Web Development')
+        cls.jobs = create_jobs(cls.recruiter, [cls.category], 3)
+
+    def setUp(self):
+        cache.clear()
+
+    def test_repeat_request_is_served_from_cache(self):
+        first = self.client.get('/api/jobs/jobs/', {'status': 'open', 'category': ''})
+        with self.assertNumQueries(0):
+            second = self.client.get('/api/jobs/jobs/', {'category': '', 'status': 'open'})
+        self.assertEqual(first.json(), second.json())
+
+    def test_saving_a_job_invalidates_job_responses(self):
+        self.client.get('/api/jobs/search/', {'q': 'django'})
+        job = self.jobs[0]
+        job.title = 'Flask developer'
+        job.description = 'Build a Flask API'
+        job.skills_required = 'Python, Flask'
+        job.save()
+        response = self.client.get('/api/jobs/search/', {'q': 'django'})
+        self.assertNotIn(job.pk, [result['id'] for result in response.json()['results']])
+
+    def test_category_change_invalidates_category_list(self):
+        self.client.get('/api/jobs/categories/')
+        Category.objects.create(name='Data Science')
+        response = self.client.get('/api/jobs/categories/')
+        self.assertEqual(response.json()['count'], 2)
+
+    def test_authenticated_job_list_is_not_cached(self):
+        self.client.force_login(self.recruiter)
+        self.client.get('/api/jobs/jobs/', {'my_jobs': 'true'})
+        with self.assertNumQueries(3):
+            self.client.get('/api/jobs/jobs/', {'my_jobs': 'true'})
+
+    @override_settings(RESPONSE_CACHE=False)
+    def test_off_without_a_shared_backend(self):
+        first = self.client.get('/api/jobs/jobs/')
+        # No per-process generation counters, so every process gives the
+        # same ETag for the same rows
+        self.assertEqual(self.client.get('/api/jobs/jobs/')['ETag'], first['ETag'])
+        self.assertFalse(cache.get_many([GENERATION_PREFIX + 'jobs.job', GENERATION_PREFIX + 'jobs.category']))
+
+        # A write made where this process's signals don't see it
+        Job.objects.filter(pk=self.jobs[0].pk).update(title='Changed elsewhere')
+        response = self.client.get('/api/jobs/jobs/')
+        self.assertIn('Changed elsewhere', [job['title'] for job in response.json()['results']])
+
+    def test_process_local_backend_is_refused(self):
+        self.assertEqual([error.id for error in check_response_cache_backend(None)], ['jobs.E001'])
+        with override_settings(RESPONSE_CACHE=False):
+            self.assertEqual(check_response_cache_backend(None), [])
+        with override_settings(CACHES={'default': {
+            'BACKEND': 'django.core.cache.backends.filebased.FileBasedCache', 'LOCATION': tempfile.gettempdir(),
+        }}):
+            self.assertEqual(check_response_cache_backend(None), [])
+
+
+class ConditionalRequestTests(TestCase):
+    @classmethod
+    def setUpTestData(cls):
+        cls.recruiter = User.objects.create(username='recruiter', user_type='recruiter')
+        cls.category = Category.objects.create(name='Web Development')
+        cls.job = create_jobs(cls.recruiter, [cls.category], 1)[0]
+
+    def setUp(self):
+        cache.clear()
+
+    def test_job_detail_not_modified(self):
+        url = f'/api/jobs/jobs/{self.job.pk}/'
+        response = self.client.get(url)
+        self.assertIn('Last-Modified', response)
+        with self.assertNumQueries(1):
+            response = self.client.get(url, HTTP_IF_NONE_MATCH=response['ETag'])
+        self.assertEqual(response.status_code, 304)
+
+    def test_job_list_etag_changes_when_a_job_is_deleted(self):
+        etag = self.client.get('/api/jobs/jobs/')['ETag']
+        self.assertEqual(self.client.get('/api/jobs/jobs/', HTTP_IF_NONE_MATCH=etag).status_code, 304)
+        create_jobs(self.recruiter, [self.category], 1)[0].delete()
+        self.assertEqual(self.client.get('/api/jobs/jobs/', HTTP_IF_NONE_MATCH=etag).status_code, 304)
+        self.job.delete()
+        self.assertEqual(self.client.get('/api/jobs/jobs/', HTTP_IF_NONE_MATCH=etag).status_code, 200)
+
+    def test_stale_if_match_is_rejected(self):
+        self.client.force_login(self.recruiter)
+        url = f'/api/jobs/jobs/{self.job.pk}/'
+        etag = self.client.get(url)['ETag']
+        response = self.client.patch(url, {'title': 'Updated'}, content_type='application/json',
+                                     HTTP_IF_MATCH=etag)
+        self.assertEqual(response.status_code, 200)
+        self.assertNotEqual(response['ETag'], etag)
+        response = self.client.patch(url, {'title': 'Lost update'}, content_type='application/json',
+                                     HTTP_IF_MATCH=etag)
+        self.assertEqual(response.status_code, 412)
+        self.job.refresh_from_db()
+        self.assertEqual(self.job.title, 'Updated')
+
+
+@skipUnless(settings.ASYNC_READ_VIEWS, 'async read views are not routed')
+class AsyncReadPathTests(TestCase):
+    """
+    The async GET views must answer exactly like the sync DRF views they
+    stand in front of.
+    """
+    @classmethod
+    def setUpTestData(cls):
+        cls.recruiter = User.objects.create(username='recruiter', user_type='recruiter')
+        categories = [Category.objects.create(name=f'Category {i}') for i in range(2)]
+        cls.jobs = create_jobs(cls.recruiter, categories, 5)
+
+    def setUp(self):
+        cache.clear()
+
+    def assertMatchesSyncView(self, url, params=None):
+        match = resolve(url)
+        sync_view = match.func.view_initkwargs['write_view']
+        self.assertNotEqual(match.func, sync_view)
+
+        response = self.client.get(url, params)
+        request = RequestFactory().get(url, params)
+        request.user = response.wsgi_request.user
+        request.session = self.client.session
+        expected = sync_view(request, **match.kwargs)
+        expected.render()
+        self.assertEqual(response.status_code, expected.status_code)
+        self.assertEqual(response.content, expected.content)
+        self.assertEqual(response['ETag'] if response.has_header('ETag') else None,
+                         expected['ETag'] if expected.has_header('ETag') else None)
+
+    def test_job_endpoints(self):
+        self.assertMatchesSyncView('/api/jobs/jobs/', {'page_size': 2, 'category': self.jobs[0].category_id})
+        self.assertMatchesSyncView('/api/jobs/jobs/', {'skills': 'Python, Django'})
+        next_link = urlsplit(self.client.get('/api/jobs/jobs/', {'page_size': 2}).json()['next'])
+        self.assertMatchesSyncView('/api/jobs/jobs/', dict(parse_qsl(next_link.query)))
+        self.assertMatchesSyncView(f'/api/jobs/jobs/{self.jobs[0].pk}/')
+        self.assertMatchesSyncView(f'/api/jobs/jobs/{self.jobs[-1].pk + 100}/')
+        self.assertMatchesSyncView('/api/jobs/search/', {'q': 'django', 'page_size': 2})
+        self.assertMatchesSyncView('/api/jobs/search/', {'q': 'django', 'facets': '1',
+                                                         'category': self.jobs[0].category_id})
+
+    def test_profile_endpoints(self):
+        self.assertMatchesSyncView('/api/accounts/freelancer-profiles/', {'page': 1})
+        self.assertMatchesSyncView('/api/accounts/profile/')
+        self.client.force_login(self.recruiter)
+        self.assertMatchesSyncView('/api/accounts/profile/')
+
+    def test_writes_reach_the_sync_view(self):
+        self.client.force_login(self.recruiter)
+        response = self.client.post('/api/jobs/jobs/', {
+            'title': 'Async', 'description': 'Posted through the async route',
+            'category_id': self.jobs[0].category_id, 'job_type': 'fixed',
+            'experience_level': 'beginner', 'skills_required': 'Go',
+        })
+        self.assertEqual(response.status_code, 201)
+        self.assertEqual(self.client.get('/api/jobs/jobs/', {'my_jobs': 'true'}).json()['results'][0]['title'],
+                         'Async')
+
+class CursorPaginationTests(TestCase):
+    @classmethod
+    def setUpTestData(cls):
+        cls.recruiter = User.objects.create(username='recruiter', user_type='recruiter')
+        cls.jobs = create_jobs(cls.recruiter, [Category.objects.create(name='Web Development')], 7, attachments=0)
+        # Every job posted in the same instant: only the id breaks the tie
+        Job.objects.update(created_at=timezone.now())
+
+    def setUp(self):
+        cache.clear()
+
+    def walk(self, url, params, key='next'):
+        pages = []
+        response = self.client.get(url, params)
+        while True:
+            self.assertEqual(response.status_code, 200)
+            body = response.json()
+            pages.append([job['id'] for job in body['results']])
+            if not body[key]:
+                return pages, body
+            response = self.client.get(body[key])
+
+    def test_pages_step_through_ties_on_created_at(self):
+        ids = sorted((job.pk for job in self.jobs), reverse=True)
+        pages, last = self.walk('/api/jobs/jobs/', {'page_size': 2})
+        self.assertEqual(pages, [ids[0:2], ids[2:4], ids[4:6], ids[6:7]])
+        self.assertIsNotNone(last['previous'])
+
+        backwards, first = self.walk(last['previous'], None, key='previous')
+        self.assertEqual(backwards, [ids[4:6], ids[2:4], ids[0:2]])
+        self.assertIsNone(first['previous'])
+        self.assertIsNotNone(first['next'])
+
+    def test_cursor_holds_the_whole_position(self):
+        first = self.client.get('/api/jobs/jobs/', {'page_size': 3}).json()
+        with CaptureQueriesContext(connection) as queries:
+            second = self.client.get(first['next']).json()
+        self.assertEqual([job['id'] for job in second['results']],
+                         sorted((job.pk for job in self.jobs), reverse=True)[3:6])
+        self.assertFalse([query for query in queries if 'OFFSET' in query['sql'].upper()])
+
+    def test_invalid_cursors_are_not_found(self):
+        for cursor in ('not base64!', 'cD0yMDI0LTAxLTAx', 'cD0lNUIxJTVE'):  # p=2024-01-01, p=[1]
+            self.assertEqual(self.client.get('/api/jobs/jobs/', {'cursor': cursor}).status_code, 404)
+
+    @skipUnless(connection.vendor in ('sqlite', 'postgresql'), 'Ranked search needs a full-text index')
+    def test_search_pages(self):
+        ids = sorted((job.pk for job in self.jobs), reverse=True)
+        pages, last = self.walk('/api/jobs/search/', {'q': 'django', 'page_size': 3})
+        self.assertEqual(set(last), {'next', 'previous', 'results'})
+        self.assertEqual(set(last['results'][0]), set(JobListSerializer.Meta.fields))
+        # Equal relevance and equal created_at: ordered by id alone
+        self.assertEqual(pages, [ids[0:3], ids[3:6], ids[6:7]])
+
+    def test_sync_and_async_pages_match(self):
+        first = self.client.get('/api/jobs/jobs/', {'page_size': 2}).json()
+        factory = RequestFactory()
+        for url in (first['next'], self.client.get(first['next']).json()['previous']):
+            request = Request(factory.get(url))
+            sync = JobCursorPagination()
+            rows = sync.paginate_queryset(job_list_rows(Job.objects.all(), sync.ordering), request)
+            asynchronous = JobCursorPagination()
+            arows = async_to_sync(asynchronous.apaginate_queryset)(
+                job_list_rows(Job.objects.all(), asynchronous.ordering), request,
+            )
+            self.assertEqual(rows, arows)
+            self.assertEqual((sync.get_next_link(), sync.get_previous_link()),
+                             (asynchronous.get_next_link(), asynchronous.get_previous_link()))
+
+class SyntheticDataTests(TestCase):
+    def test_generates_consistent_data(self):
+        from applications.models import Application, Message, Review
+        call_command('populate_sample_data', users=40, jobs=60, applications=200, messages=300,
+                     reviews=5, batch_size=25, stdout=StringIO())
+        self.assertEqual(User.objects.filter(username__startswith='s42_').count(), 40)
+        self.assertEqual(Job.objects.count(), 65)
+        self.assertEqual(Message.objects.count(), 300)
+        self.assertEqual(Review.objects.count(), 5)
+        # Counters the signals would have kept are rebuilt after the bulk load
+        application = Application.objects.filter(messages__is_read=False).first()
+        unread = application.messages.filter(is_read=False).exclude(sender=application.freelancer).count()
+        self.assertEqual(application.freelancer_unread_count, unread)
+        review = Review.objects.first()
+        self.assertEqual(FreelancerProfile.objects.get(user=review.reviewee).rating_count,
+                         Review.objects.filter(reviewee=review.reviewee).count())
+        for review in Review.objects.select_related('job'):
+            hire = Application.objects.get(job=review.job, status='accepted')
+            self.assertLessEqual(hire.applied_at, review.created_at)
+        self.assertTrue(Job.objects.filter(canonical_skills__isnull=False).exists())
+
+        with self.assertRaises(CommandError):
+            call_command('populate_sample_data', users=1, stdout=StringIO())
+
+class EndpointBenchmarkTests(TestCase):
+    def test_report_and_baseline_comparison(self):
+        call_command('populate_sample_data', users=20, jobs=20, applications=40, messages=40,
+                     reviews=2, stdout=StringIO())
+        with tempfile.TemporaryDirectory() as tmp:
+            output = os.path.join(tmp, 'report.json')
+            call_command('benchmark_endpoints', use_current_db=True, iterations=1,
+                         output=output, stdout=StringIO())
+            with open(output) as f:
+                report = json.load(f)
+            results = report['results']
+            self.assertEqual(results['/api/jobs/jobs/{id}/ [anonymous]']['status'], 200)
+            self.assertEqual(results['/api/applications/applications/ [anonymous]']['status'], 403)
+            self.assertIn('/api/accounts/freelancer-profiles/{id}/ [freelancer]', results)
+            self.assertGreater(results['/api/applications/applications/inbox/ [recruiter]']['queries'], 0)
+
+            # A baseline that was faster and leaner everywhere flags regressions
+            for result in results.values():
+                result.update(p50_ms=0, p95_ms=0, queries=0)
+            with open(output, 'w') as f:
+                json.dump(report, f)
+            with self.assertRaises(CommandError):
+                call_command('benchmark_endpoints', use_current_db=True, iterations=1, roles=['anonymous'],
+                             output=os.path.join(tmp, 'new.json'), baseline=output,
+                             min_delta_ms=0, stdout=StringIO())
+
+    def test_compare_reports(self):
+        baseline = {'/api/jobs/jobs/ [anonymous]': {
+            'status': 200, 'p50_ms': 10.0, 'p95_ms': 20.0, 'p99_ms': 30.0, 'queries': 2, 'bytes': 1000,
+        }}
+        noisy = {key: {**result, 'p50_ms': 12.0, 'p99_ms': 90.0} for key, result in baseline.items()}
+        self.assertEqual(compare_reports(baseline, noisy), [])
+        slower = {key: {**result, 'p95_ms': 30.0, 'queries': 3} for key, result in baseline.items()}
+        self.assertEqual(compare_reports(baseline, slower), [
+            '/api/jobs/jobs/ [anonymous]: p95_ms 20.0 -> 30.0',
+            '/api/jobs/jobs/ [anonymous]: queries 2 -> 3',
+        ])
+
+class IndexAdvisorTests(TestCase):
+    def test_filtered_job_lists_use_indexes(self):
+        plan = Job.objects.filter(status='open', category_id=1).order_by('-created_at', '-id')[:20].explain()
+        self.assertIn('job_open_category_idx', plan)
+        self.assertNotIn('TEMP B-TREE', plan)
+
+    def test_reports_scans_on_large_tables(self):
+        call_command('populate_sample_data', users=20, jobs=20, applications=40, stdout=StringIO())
+        report = advise(roles=['recruiter'], min_rows=1)
+        # The unfiltered list's ETag aggregates over every job
+        self.assertIn('/api/jobs/jobs/ [recruiter]', report)
+        findings = report['/api/jobs/jobs/ [recruiter]']
+        self.assertIn(('seq scan', 'jobs_job'), [(finding['kind'], finding['table']) for finding in findings])
+        self.assertNotIn('/api/jobs/jobs/ [recruiter]', advise(roles=['recruiter'], min_rows=10 ** 6))
+
+class ReplicaRoutingTests(TestCase):
+    def setUp(self):
+        self.router = ReplicaRouter()
+        self.router.replicas = ['replica_1']
+        self.factory = RequestFactory()
+
+    def route_during(self, request, view):
+        """
+        Run ``view`` inside the pinning middleware; returns the response and
+        the database the router picked for a read at the end of the view.
+        """
+        picked = {}
+
+        def get_response(request):
+            view()
+            picked['read'] = self.router.db_for_read(Job)
+            return HttpResponse()
+
+        response = ReplicaPinningMiddleware(get_response)(request)
+        return response, picked['read']
+
+    def test_reads_and_writes(self):
+        pinned = pinned_to_primary()
+        # TestCase runs inside a transaction, which keeps reads on the primary
+        with mock.patch('freelance_platform.db_routing.connections') as connections:
+            connections.__getitem__.return_value.in_atomic_block = False
+            response, db = self.route_during(self.factory.get('/api/jobs/jobs/'), lambda: None)
+            self.assertEqual(db, 'replica_1')
+            self.assertNotIn(PIN_COOKIE, response.cookies)
+
+            # A write pins the rest of the request and the client's next requests
+            write = lambda: self.router.db_for_write(Job)
+            response, db = self.route_during(self.factory.get('/api/jobs/jobs/'), write)
+            self.assertEqual(db, 'default')
+            self.assertEqual(response.cookies[PIN_COOKIE]['max-age'], settings.REPLICA_PIN_SECONDS)
+
+            request = self.factory.get('/api/jobs/jobs/')
+            request.COOKIES[PIN_COOKIE] = '1'
+            self.assertEqual(self.route_during(request, lambda: None)[1], 'default')
+
+            # Unsafe requests read from the primary before writing
+            self.assertEqual(self.route_during(self.factory.post('/api/jobs/jobs/'), lambda: None)[1], 'default')
+
+            # Session writes don't pin, and sessions are always read from the primary
+            session = lambda: self.router.db_for_write(Session)
+            response, db = self.route_during(self.factory.get('/'), session)
+            self.assertEqual(db, 'replica_1')
+            self.assertNotIn(PIN_COOKIE, response.cookies)
+            self.assertEqual(self.router.db_for_read(Session), 'default')
+
+            # Nothing leaks out of a request
+            self.assertEqual(pinned_to_primary(), pinned)
+        self.assertEqual(self.router.db_for_read(Job), 'default')
+
+
+@override_settings(RESPONSE_CACHE=True)
+class SearchFacetTests(TestCase):
+    @classmethod
+    def setUpTestData(cls):
+        call_command('populate_sample_data', users=20, jobs=80, stdout=StringIO())
+
+    def setUp(self):
+        cache.clear()
+
+    def test_counts_ignore_their_own_filter(self):
+        category = Category.objects.get(name='Web Development')
+        open_jobs = Job.objects.filter(status='open')
+        params = {'facets': '1', 'category': category.pk, 'job_type': 'fixed'}
+        with self.assertNumQueries(3):
+            facets = self.client.get('/api/jobs/search/', params).json()['facets']
+
+        counts = {item['value']: item['count'] for item in facets['category']}
+        self.assertEqual(counts[category.pk], open_jobs.filter(category=category, job_type='fixed').count())
+        self.assertEqual(sum(counts.values()), open_jobs.filter(job_type='fixed').count())
+        counts = {item['value']: item['count'] for item in facets['job_type']}
+        self.assertEqual(counts['hourly'], open_jobs.filter(category=category, job_type='hourly').count())
+        counts = {item['value']: item['count'] for item in facets['experience_level']}
+        self.assertEqual(counts['expert'], open_jobs.filter(
+            category=category, job_type='fixed', experience_level='expert'
+        ).count())
+        self.assertEqual(sum(bucket['count'] for bucket in facets['budget']),
+                         open_jobs.filter(category=category, job_type='fixed').count())
+        self.assertEqual(sum(bucket['count'] for bucket in facets['hourly_rate']), 0)
+
+        # Other pages and filter combinations of the same search reuse the grouped counts
+        with self.assertNumQueries(1):
+            facets = self.client.get('/api/jobs/search/', {'facets': '1', 'job_type': 'hourly'}).json()['facets']
+        counts = {item['value']: item['count'] for item in facets['category']}
+        self.assertEqual(counts[category.pk], open_jobs.filter(category=category, job_type='hourly').count())
+
+
+class BudgetRangeTests(TestCase):
+    @classmethod
+    def setUpTestData(cls):
+        recruiter = User.objects.create(username='recruiter', user_type='recruiter')
+        category = Category.objects.create(name='Web Development')
+        common = dict(description='Build a site', category=category, recruiter=recruiter,
+                      experience_level='entry', skills_required='Python')
+        cls.fixed = Job.objects.create(title='Fixed', job_type='fixed', budget_min=1000,
+                                       budget_max=2000, **common)
+        cls.hourly = Job.objects.create(title='Hourly', job_type='hourly', hourly_rate_min=40,
+                                        hourly_rate_max=60, **common)
+        cls.open_ended = Job.objects.create(title='Open ended', job_type='fixed', budget_min=5000,
+                                            **common)
+
+    def search(self, **params):
+        response = self.client.get('/api/jobs/search/', params)
+        return {job['title'] for job in response.json()['results']}
+
+    def test_effective_range_follows_job_type(self):
+        self.assertEqual((self.fixed.effective_min, self.fixed.effective_max), (1000, 2000))
+        self.assertEqual((self.hourly.effective_min, self.hourly.effective_max), (40, 60))
+        self.assertEqual((self.open_ended.effective_min, self.open_ended.effective_max), (5000, 5000))
+
+        self.hourly.job_type = 'fixed'
+        self.hourly.budget_max = 300
+        self.hourly.save(update_fields=['job_type', 'budget_max'])
+        self.hourly.refresh_from_db()
+        self.assertEqual((self.hourly.effective_min, self.hourly.effective_max), (300, 300))
+
+    def test_budget_facets_keep_rates_and_budgets_apart(self):
+        Job.objects.create(title='Small fixed', job_type='fixed', budget_min=50, budget_max=60,
+                           description='Build a site', category=self.fixed.category,
+                           recruiter=self.fixed.recruiter, experience_level='entry')
+        facets = self.client.get('/api/jobs/search/', {'facets': '1'}).json()['facets']
+        budget = {(bucket['min'], bucket['max']): bucket['count'] for bucket in facets['budget']}
+        hourly_rate = {(bucket['min'], bucket['max']): bucket['count'] for bucket in facets['hourly_rate']}
+        self.assertEqual(budget, {(None, 500): 1, (500, 1000): 0, (1000, 5000): 1, (5000, 10000): 1,
+                                  (10000, None): 0})
+        self.assertEqual(hourly_rate, {(None, 25): 0, (25, 50): 0, (50, 100): 1, (100, None): 0})
+
+    def test_budget_filters_match_overlapping_ranges(self):
+        self.assertEqual(self.search(min_budget=1500, max_budget=1800), {'Fixed'})
+        self.assertEqual(self.search(min_budget=50, max_budget=70), {'Hourly'})
+        self.assertEqual(self.search(max_budget=100), {'Hourly'})
+        self.assertEqual(self.search(min_budget=1500), {'Fixed', 'Open ended'})
+
+
+class AutocompleteTests(TestCase):
+    @classmethod
+    def setUpTestData(cls):
+        cls.recruiter = User.objects.create(username='recruiter', user_type='recruiter')
+        cls.category = Category.objects.create(name='Data Science')
+        cls.jobs = create_jobs(cls.recruiter, [cls.category], 3)
+        Job.objects.filter(pk=cls.jobs[2].pk).update(title='Data pipeline in Django')
+
+    def setUp(self):
+        autocomplete.index.load()
+
+    def suggest(self, q, **params):
+        response = self.client.get('/api/jobs/autocomplete/', {'q': q, **params})
+        self.assertEqual(response.status_code, 200)
+        return [(item['type'], item['text'], item['count']) for item in response.json()['results']]
+
+    def test_prefix_matches_weighted_by_open_jobs(self):
+        with self.assertNumQueries(0):
+            suggestions = self.suggest('dja')
+        self.assertEqual(suggestions, [
+            ('skill', 'Django', 3),
+            ('title', 'Data pipeline in Django', 1),
+            ('title', 'Django developer 0', 1),
+            ('title', 'Django developer 1', 1),
+        ])
+        # Any word of an entry matches, and the limit is honoured
+        self.assertEqual(self.suggest('DEV', limit=1), [('title', 'Django developer 0', 1)])
+        self.assertEqual(self.suggest('data')[0], ('category', 'Data Science', 3))
+        self.assertEqual(self.suggest(' '), [])
+
+    def test_updated_on_job_save(self):
+        job = self.jobs[0]
+        job.status = 'closed'
+        job.save(update_fields=['status'])
+        job = self.jobs[1]
+        job.skills_required = 'Django, Kubernetes'
+        job.save()
+        with self.assertNumQueries(0):
+            self.assertEqual(self.suggest('django')[0], ('skill', 'Django', 2))
+            self.assertEqual(self.suggest('kube'), [('skill', 'Kubernetes', 1)])
+            self.assertNotIn(('title', 'Django developer 0', 1), self.suggest('django'))
+
+        job.delete()
+        self.assertEqual(self.suggest('kube'), [])
+
+    def test_saves_only_forget_their_own_prefixes(self):
+        self.suggest('pipe')
+        self.suggest('kube')
+        job = self.jobs[1]
+        job.skills_required = 'Python, Kubernetes'
+        job.save()
+        self.assertIn('pipe', autocomplete.index.cached)
+        self.assertNotIn('kube', autocomplete.index.cached)
+        self.assertEqual(self.suggest('kube'), [('skill', 'Kubernetes', 1)])
+
+        # A reload drops entries no open job uses any more
+        job.skills_required = 'Python'
+        job.save()
+        self.assertIn((autocomplete.SKILL, 'kubernetes'), autocomplete.index.entry_of)
+        autocomplete.index.load()
+        self.assertNotIn((autocomplete.SKILL, 'kubernetes'), autocomplete.index.entry_of)
+
+    def test_lookups_match_a_full_scan(self):
+        index = autocomplete.AutocompleteIndex()
+        index.load()
+        rng = random.Random(7)
+        words = ['django', 'data', 'design', 'devops', 'docker', 'dart', 'deno']
+        for job_id in range(1000, 1200):
+            title = ' '.join(rng.sample(words, 2))
+            skills = ', '.join(rng.sample(words, rng.randint(0, 3)))
+            index.update_job(job_id, title, skills, self.category.pk, rng.random() < 0.8)
+            if rng.random() < 0.2:
+                index.remove_job(rng.randrange(1000, job_id + 1))
+
+        for prefix in ('d', 'da', 'de', 'dj', 'docker d', 'x'):
+            for limit in (1, 5, 20):
+                expected = sorted(
+                    (entry for entry in index.entries
+                     if (entry[2] > 0 or entry[0] == autocomplete.CATEGORY)
+                     and any(key.startswith(prefix) for key in autocomplete._word_keys(entry[1]))),
+                    key=lambda entry: (-entry[2], autocomplete.TYPE_ORDER[entry[0]], entry[1].lower()),
+                )[:limit]
+                self.assertEqual([(item['type'], item['text'], item['count']) for item in index.suggest(prefix, limit)],
+                                 [(kind, text, weight) for kind, text, weight, _ in expected])
+
+
+class JobAlertTests(TestCase):
+    @classmethod
+    def setUpTestData(cls):
+        cls.recruiter = User.objects.create(username='recruiter', user_type='recruiter')
+        cls.freelancer = User.objects.create(username='freelancer', user_type='freelancer')
+        cls.web = Category.objects.create(name='Web Development')
+        cls.design = Category.objects.create(name='Design')
+
+    def save_search(self, **fields):
+        return SavedSearch.objects.create(user=self.freelancer, **fields)
+
+    def post_job(self, **fields):
+        fields = {
+            'title': 'Django developer', 'description': 'Build a REST API', 'category': self.web,
+            'recruiter': self.recruiter, 'job_type': 'fixed', 'budget_min': 1000, 'budget_max': 2000,
+            'experience_level': 'expert', 'skills_required': 'Python, Django', **fields,
+        }
+        return Job.objects.create(**fields)
+
+    def test_new_jobs_alert_matching_searches(self):
+        matching = [
+            self.save_search(query='django api'),
+            self.save_search(category=self.web, experience_level='expert'),
+            self.save_search(job_type='fixed', min_budget=1500),
+            self.save_search(),
+        ]
+        self.save_search(query='django flutter')
+        self.save_search(category=self.design)
+        self.save_search(query='python', job_type='hourly')
+        self.save_search(max_budget=500)
+        SavedSearch.objects.create(user=self.recruiter, query='django')
+        self.assertEqual(matching[0].anchor, 'q:django')
+        self.assertEqual(matching[1].anchor, f'category:{self.web.pk}')
+
+        job = self.post_job()
+        self.assertFalse(JobAlert.objects.exists())
+        run_pending()
+        self.assertEqual(
+            set(JobAlert.objects.filter(job=job).values_list('saved_search', flat=True)),
+            {search.pk for search in matching},
+        )
+        # Closed jobs don't alert
+        self.assertFalse(alerts.match_job(self.post_job(status='closed')))
+
+    def test_anchor_fits_the_longest_query(self):
+        self.client.force_login(self.freelancer)
+        word = 'x' * SavedSearch._meta.get_field('query').max_length
+        response = self.client.post('/api/jobs/saved-searches/', {'query': word})
+        self.assertEqual(response.status_code, 201)
+        anchor = SavedSearch.objects.get(pk=response.json()['id']).anchor
+        self.assertEqual(anchor, 'q:' + word)
+        self.assertLessEqual(len(anchor), SavedSearch._meta.get_field('anchor').max_length)
+
+    def test_matching_is_an_anchor_lookup(self):
+        self.save_search(query='django')
+        self.save_search(query='kotlin')
+        job = self.post_job()
+        JobAlert.objects.all().delete()
+        # One lookup by anchor and one insert, however many searches are saved
+        with self.assertNumQueries(2):
+            self.assertEqual(len(alerts.match_job(job)), 1)
+
+    def test_alert_api(self):
+        self.client.force_login(self.freelancer)
+        response = self.client.post('/api/jobs/saved-searches/', {'query': 'django', 'min_budget': 100},
+                              content_type='application/json')
+        self.assertEqual(response.status_code, 201)
+        response = self.client.post('/api/jobs/saved-searches/', {'min_budget': 500, 'max_budget': 100},
+                              content_type='application/json')
+        self.assertEqual(response.status_code, 400)
+        job = self.post_job()
+        run_pending()
+
+        results = self.client.get('/api/jobs/alerts/', {'unread': 'true'}).json()['results']
+        self.assertEqual([alert['job']['id'] for alert in results], [job.pk])
+        response = self.client.post('/api/jobs/alerts/mark_read/', {}, content_type='application/json')
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(self.client.get('/api/jobs/alerts/', {'unread': 'true'}).json()['results'], [])
+
+        self.client.force_login(self.recruiter)
+        self.assertEqual(self.client.get('/api/jobs/saved-searches/').json()['results'], [])
+        self.assertEqual(self.client.get('/api/jobs/alerts/').json()['results'], [])
+
+
+class AttachmentUploadTests(TestCase):
+    @classmethod
+    def setUpTestData(cls):
+        cls.recruiter = User.objects.create(username='recruiter', user_type='recruiter')
+        category = Category.objects.create(name='Design')
+        cls.job = Job.objects.create(
+            title='Logo design', description='A logo', category=category, recruiter=cls.recruiter,
+            job_type='fixed', budget_min=100, budget_max=200, experience_level='entry',
+        )
+        cls.content = b'%PDF-1.7\n' + os.urandom(200000)
+
+    def setUp(self):
+        media_root = tempfile.mkdtemp()
+        self.addCleanup(shutil.rmtree, media_root, ignore_errors=True)
+        settings_override = override_settings(
+            MEDIA_ROOT=media_root, ATTACHMENT_UPLOAD_DIR=os.path.join(media_root, 'incoming'),
+        )
+        settings_override.enable()
+        self.addCleanup(settings_override.disable)
+        self.client.force_login(self.recruiter)
+
+    def start(self, name='brief.pdf', **fields):
+        response = self.client.post('/api/jobs/attachment-uploads/', {
+            'job': self.job.pk, 'name': name, 'size': len(self.content), **fields,
+        }, content_type='application/json')
+        self.assertEqual(response.status_code, 201)
+        return response.json()['id']
+
+    def put(self, upload_id, start, end):
+        return self.client.put(
+            f'/api/jobs/attachment-uploads/{upload_id}/', self.content[start:end + 1],
+            content_type='application/octet-stream',
+            headers={'Content-Range': f'bytes {start}-{end}/{len(self.content)}'},
+        )
+
+    def finish(self, upload_id):
+        run_pending()
+        return self.client.get(f'/api/jobs/attachment-uploads/{upload_id}/').json()
+
+    def upload(self, name='brief.pdf', chunk=65536):
+        upload_id = self.start(name, sha256=hashlib.sha256(self.content).hexdigest())
+        for start in range(0, len(self.content), chunk):
+            response = self.put(upload_id, start, min(start + chunk, len(self.content)) - 1)
+        self.assertEqual((response.status_code, response.json()['status']), (202, 'processing'))
+        upload = self.finish(upload_id)
+        self.assertEqual(upload['status'], 'complete')
+        return upload['attachment']
+
+    def test_chunked_upload_is_stored_once_per_content(self):
+        first = self.upload()
+        self.assertEqual(first['size'], len(self.content))
+        self.assertEqual(first['content_type'], 'application/pdf')
+        self.assertEqual(first['sha256'], hashlib.sha256(self.content).hexdigest())
+
+        second = self.upload(name='copy.bin', chunk=150000)
+        self.assertEqual(second['name'], 'copy.bin')
+        attachments = JobAttachment.objects.filter(job=self.job)
+        self.assertEqual(len({attachment.file.name for attachment in attachments}), 1)
+        self.assertEqual(os.listdir(settings.ATTACHMENT_UPLOAD_DIR), [])
+
+    def test_upload_resumes_from_received_offset(self):
+        upload_id = self.start()
+        self.assertEqual(self.put(upload_id, 0, 99999).json()['received'], 100000)
+
+        # A retried or skipped chunk is refused with the offset to resume at
+        response = self.put(upload_id, 50000, 149999)
+        self.assertEqual((response.status_code, response.json()['received']), (409, 100000))
+        self.assertEqual(self.client.get(f'/api/jobs/attachment-uploads/{upload_id}/').json()['received'], 100000)
+
+        response = self.put(upload_id, 100000, len(self.content) - 1)
+        self.assertEqual(response.status_code, 202)
+        # Nothing more is taken while the upload is verified, or once it is
+        self.assertEqual(self.put(upload_id, 0, 99).status_code, 409)
+        self.assertEqual(self.finish(upload_id)['status'], 'complete')
+        self.assertEqual(self.put(upload_id, 0, 99).status_code, 409)
+        with JobAttachment.objects.get().file.open('rb') as f:
+            self.assertEqual(f.read(), self.content)
+
+    def test_only_the_recruiter_uploads_and_digests_are_checked(self):
+        other = User.objects.create(username='other', user_type='recruiter')
+        self.client.force_login(other)
+        response = self.client.post('/api/jobs/attachment-uploads/', {
+            'job': self.job.pk, 'name': 'brief.pdf', 'size': 10,
+        }, content_type='application/json')
+        self.assertEqual(response.status_code, 403)
+
+        self.client.force_login(self.recruiter)
+        upload_id = self.start(sha256='0' * 64)
+        self.assertEqual(self.put(upload_id, 0, len(self.content) - 1).status_code, 202)
+        upload = self.finish(upload_id)
+        self.assertEqual((upload['status'], upload['attachment']), ('failed', None))
+        self.assertIn('SHA-256', upload['error'])
+        self.assertFalse(JobAttachment.objects.exists())
+        self.assertEqual(os.listdir(settings.ATTACHMENT_UPLOAD_DIR), [])
+
+    @override_settings(ATTACHMENT_UPLOAD_EXPIRY=0)
+    def test_expiry_waits_for_verification(self):
+        upload_id = self.start()
+        self.put(upload_id, 0, len(self.content) - 1)
+        expire_attachment_upload(upload_id=upload_id)
+        self.assertTrue(os.path.exists(os.path.join(settings.ATTACHMENT_UPLOAD_DIR, f'{upload_id}.part')))
+
+        finish_attachment_upload(upload_id=upload_id)
+        expire_attachment_upload(upload_id=upload_id)
+        self.assertFalse(AttachmentUpload.objects.exists())
+        self.assertTrue(JobAttachment.objects.exists())
+
+    def test_download_ranges(self):
+        attachment = self.upload()
+        self.client.logout()
+        url = attachment['download_url']
+
+        response = self.client.get(url)
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(b''.join(response.streaming_content), self.content)
+        self.assertEqual(response['Accept-Ranges'], 'bytes')
+        self.assertIn('brief.pdf', response['Content-Disposition'])
+        etag = response['ETag']
+
+        response = self.client.get(url, headers={'Range': 'bytes=100-199'})
+        self.assertEqual(response.status_code, 206)
+        self.assertEqual(response['Content-Range'], f'bytes 100-199/{len(self.content)}')
+        self.assertEqual(b''.join(response.streaming_content), self.content[100:200])
+
+        response = self.client.get(url, headers={'Range': 'bytes=-10', 'If-Range': etag})
+        self.assertEqual(b''.join(response.streaming_content), self.content[-10:])
+        response = self.client.get(url, headers={'Range': 'bytes=0-9', 'If-Range': '"stale"'})
+        self.assertEqual(response.status_code, 200)
+        response = self.client.get(url, headers={'Range': f'bytes={len(self.content)}-'})
+        self.assertEqual(response.status_code, 416)
+        response = self.client.get(url, headers={'If-None-Match': etag})
+        self.assertEqual(response.status_code, 304)
+
+
+class JobListFastPathTests(TestCase):
+    @classmethod
+    def setUpTestData(cls):
+        recruiter = User.objects.create(username='recruiter', user_type='recruiter')
+        category = Category.objects.create(name='Web Development')
+        common = dict(description='Build a site', category=category, recruiter=recruiter,
+                      experience_level='entry', skills_required='Python')
+        Job.objects.create(title='Django site', job_type='fixed', budget_min=Decimal('1000.5'), budget_max=2000, **common)
+        Job.objects.create(title='Django support', job_type='hourly', hourly_rate_min=Decimal('40.25'), **common)
+        Job.objects.create(title='Open ended', job_type='fixed', status='closed', **common)
+
+    def assertSameJSON(self, queryset):
+        expected = JSONRenderer().render(JobListSerializer(queryset, many=True).data)
+        self.assertEqual(JSONRenderer().render(job_list_data(job_list_rows(queryset))), expected)
+
+    def test_rows_render_like_the_serializer(self):
+        queryset = Job.objects.select_related('recruiter', 'category').order_by('-created_at', '-id')
+        self.assertSameJSON(queryset)
+        with timezone.override('Asia/Kolkata'):
+            self.assertSameJSON(queryset)
+
+    def test_list_and_search_pages(self):
+        response = self.client.get('/api/jobs/jobs/', {'page_size': 2})
+        self.assertEqual(len(response.json()['results']), 2)
+        following = self.client.get(response.json()['next']).json()['results']
+        self.assertEqual(
+            json.dumps(response.json()['results'] + following),
+            json.dumps(json.loads(JSONRenderer().render(JobListSerializer(
+                Job.objects.order_by('-created_at', '-id'), many=True
+            ).data))),
+        )
+
+        response = self.client.get('/api/jobs/search/', {'q': 'django', 'page_size': 1})
+        following = self.client.get(response.json()['next']).json()['results']
+        titles = [job['title'] for job in response.json()['results'] + following]
+        self.assertEqual(sorted(titles), ['Django site', 'Django support'])
+
+
+class SkillTaxonomyTests(TestCase):
+    @classmethod
+    def setUpTestData(cls):
+        cls.recruiter = User.objects.create(username='recruiter', user_type='recruiter')
+        cls.category = Category.objects.create(name='Web Development')
+
+    def post_job(self, title, skills):
+        return Job.objects.create(
+            title=title, description='Build it', category=self.category, recruiter=self.recruiter,
+            job_type='fixed', budget_min=100, budget_max=200, experience_level='entry', skills_required=skills,
+        )
+
+    def skill_names(self, owner):
+        return set(owner.canonical_skills.values_list('name', flat=True))
+
+    def titles(self, **params):
+        response = self.client.get('/api/jobs/jobs/', params)
+        return {job['title'] for job in response.json()['results']}
+
+    def test_aliases_resolve_to_canonical_skills(self):
+        job = self.post_job('Frontend', 'JS,  reactjs , Python3, js')
+        self.assertEqual(self.skill_names(job), {'JavaScript', 'React', 'Python'})
+        self.assertEqual(self.titles(skills='javascript, react.js'), {'Frontend'})
+
+    def test_java_does_not_match_javascript(self):
+        self.post_job('Backend', 'Java, Spring')
+        self.post_job('Frontend', 'JavaScript')
+        self.assertEqual(self.titles(skills='java'), {'Backend'})
+        self.assertEqual(self.titles(skills='js'), {'Frontend'})
+        self.assertEqual(self.titles(skills='java,spring'), {'Backend'})
+        self.assertEqual(self.titles(skills='java,cobol'), set())
+
+    def test_freelancer_profiles_filter_on_skills(self):
+        freelancer = User.objects.create(username='freelancer', user_type='freelancer')
+        FreelancerProfile.objects.create(user=freelancer, skills='Python3, Django', hourly_rate=50)
+        url = '/api/accounts/freelancer-profiles/'
+        usernames = lambda skills: [profile['user']['username'] for profile in
+                                    self.client.get(url, {'skills': skills}).json()['results']]
+        self.assertEqual(usernames('python, drf'), ['freelancer'])
+        self.assertEqual(usernames('python, java'), [])
+
+    def test_long_skill_names_are_cut_to_fit(self):
+        sentence = 'Experience building ' + 'very ' * 30 + 'large systems'
+        first = self.post_job('First', sentence)
+        second = self.post_job('Second', sentence.upper() + ' and more')
+        (name,) = self.skill_names(first)
+        self.assertLessEqual(len(name), 100)
+        self.assertTrue(sentence.startswith(name))
+        self.assertEqual(self.skill_names(second), {name})
+        self.assertEqual(Skill.objects.get(name=name).normalized_name, name.lower())
+
+    def test_data_migration_parses_existing_rows(self):
+        long_name = 'x' * 150
+        # bulk_create skips the signals that would link the skills
+        (job,) = Job.objects.bulk_create([Job(
+            title='Legacy', description='Old row', category=self.category, recruiter=self.recruiter,
+            job_type='fixed', experience_level='entry', skills_required=f'ML, postgres,, Rust, {long_name}',
+        )])
+        self.assertEqual(self.skill_names(job), set())
+        migration = import_module('jobs.migrations.0004_populate_skills')
+        migration.populate_skills(apps, None)
+        self.assertEqual(self.skill_names(job), {'Machine Learning', 'PostgreSQL', 'Rust', 'x' * 100})
+
+
+@skipUnless(connection.vendor in ('sqlite', 'postgresql'), 'Needs a full-text index')
+class FullTextSearchTests(TestCase):
+    @classmethod
+    def setUpTestData(cls):
+        cls.recruiter = User.objects.create(username='recruiter', user_type='recruiter')
+        cls.category = Category.objects.create(name='Web Development')
+
+    def post_job(self, title, description='Build a product', **fields):
+        return Job.objects.create(
+            title=title, description=description, category=self.category, recruiter=self.recruiter,
+            job_type='fixed', budget_min=100, budget_max=200, experience_level='entry', **fields,
+        )
+
+    def titles(self, query):
+        return list(search.search_jobs(Job.objects.all(), query).values_list('title', flat=True))
+
+    def test_title_hits_rank_above_description_hits(self):
+        self.post_job('Landing page', description='Our stack is Django and htmx')
+        self.post_job('Django developer')
+        self.post_job('Mobile app', skills_required='Flutter')
+        self.assertEqual(self.titles('django'), ['Django developer', 'Landing page'])
+        # The last word is matched as a prefix while the user types
+        self.assertEqual(self.titles('djan'), ['Django developer', 'Landing page'])
+
+        response = self.client.get('/api/jobs/search/', {'q': 'django'})
+        self.assertEqual([job['title'] for job in response.json()['results']],
+                         ['Django developer', 'Landing page'])
+
+    def test_index_follows_saves_and_deletes(self):
+        job = self.post_job('Django developer')
+        job.title = 'Rails developer'
+        job.save()
+        self.assertEqual(self.titles('django'), [])
+        self.assertEqual(self.titles('rails'), ['Rails developer'])
+
+        job.delete()
+        self.assertEqual(self.titles('rails'), [])
+
+    def test_rebuild_index_picks_up_bulk_writes(self):
+        # bulk_create and update() skip the signals that maintain the index
+        Job.objects.bulk_create([Job(
+            title='Elixir developer', description='Phoenix app', category=self.category,
+            recruiter=self.recruiter, job_type='fixed', experience_level='entry',
+        )])
+        Job.objects.update(description='Phoenix LiveView app')
+        search.rebuild_index()
+        self.assertEqual(self.titles('liveview'), ['Elixir developer'])
+
+
+class FreelancerMatchingTests(TestCase):
+    @classmethod
+    def setUpTestData(cls):
+        cls.recruiter = User.objects.create(username='recruiter', user_type='recruiter')
+        category = Category.objects.create(name='Web Development')
+        cls.job = Job.objects.create(
+            title='Django developer', description='Build an API', category=category, recruiter=cls.recruiter,
+            job_type='hourly', hourly_rate_min=40, hourly_rate_max=60, experience_level='expert',
+            skills_required='Python, Django',
+        )
+        # Expected scores: 0.5 * skill share + 0.2 * rate fit + 0.15 * experience + 0.15 * rating
+        cls.profiles = {
+            name: FreelancerProfile.objects.create(
+                user=User.objects.create(username=name, user_type='freelancer'), **fields,
+            )
+            for name, fields in {
+                'perfect': dict(skills='Python, Django', hourly_rate=50, experience_years=6, rating=5),  # 1.0
+                'half_skills': dict(skills='Python', hourly_rate=50, experience_years=6, rating=5),  # 0.75
+                'pricey': dict(skills='python3, drf', hourly_rate=100, experience_years=0, rating=0),  # 0.62
+                'no_skills': dict(skills='', hourly_rate=None, experience_years=10, rating=4),  # 0.37
+            }.items()
+        }
+
+    def setUp(self):
+        # The pool lives for the process; start each test from the database
+        matching.pool.loaded_at = None
+        self.addCleanup(setattr, matching.pool, 'loaded_at', None)
+
+    def ranking(self, **params):
+        self.client.force_login(self.recruiter)
+        response = self.client.get(f'/api/jobs/jobs/{self.job.pk}/matches/', params)
+        self.assertEqual(response.status_code, 200)
+        return [(match['profile']['user']['username'], match['score']) for match in response.json()]
+
+    def test_ranking(self):
+        self.assertEqual(self.ranking(), [
+            ('perfect', 1.0), ('half_skills', 0.75), ('pricey', 0.62), ('no_skills', 0.37),
+        ])
+        self.assertEqual(self.ranking(limit=2), [('perfect', 1.0), ('half_skills', 0.75)])
+
+    def test_profile_edits_update_the_loaded_pool(self):
+        self.ranking()
+        with mock.patch.object(matching.pool, 'load') as load:
+            profile = self.profiles['no_skills']
+            profile.skills = 'Django, Python'
+            profile.save()
+            self.assertEqual(self.ranking()[1], ('no_skills', 0.87))
+
+            self.profiles['perfect'].delete()
+            self.assertNotIn('perfect', [name for name, _ in self.ranking()])
+        load.assert_not_called()
+
+    @override_settings(MATCHING_PROCESS_POOL_WORKERS=3, MATCHING_PROCESS_POOL_MIN_ROWS=1)
+    def test_split_scoring_matches_single_pass(self):
+        matching.pool.ensure_loaded()
+        single = matching.pool.top_matches(self.job, self.job.canonical_skills.values_list('id', flat=True), k=3)
+        # Threads stand in for the worker processes; the chunking and merge are the same
+        with ThreadPoolExecutor(3) as executor, mock.patch.object(matching, '_executor', return_value=executor):
+            split = matching.match_freelancers(self.job, k=3)
+        self.assertEqual(split, single)
+        self.assertEqual([profile_id for profile_id, _ in split],
+                         [self.profiles[name].pk for name in ('perfect', 'half_skills', 'pricey')])
+
+    def test_only_the_jobs_recruiter_sees_matches(self):
+        url = f'/api/jobs/jobs/{self.job.pk}/matches/'
+        self.assertIn(self.client.get(url).status_code, (401, 403))
+        self.client.force_login(User.objects.create(username='other', user_type='recruiter'))
+        self.assertEqual(self.client.get(url).status_code, 403)
@@ -0,0 +1,234 @@
+"""
+Resumable, content-addressed job attachment uploads.
+
+A client starts an ``AttachmentUpload`` with the file's name and size, then
+PUTs the bytes in any number of chunks, each with a
+``Content-Range: bytes <start>-<end>/<size>`` header. Chunks are streamed from
+the request straight onto ``<ATTACHMENT_UPLOAD_DIR>/<upload id>.part`` in small
+blocks, so no request ever holds a whole file in memory, and the part file's
+length is the upload's offset: after a dropped connection the client asks for
+the upload and carries on from ``received``.
+
+Once the last byte is in, the upload turns ``processing`` and a background
+task (``jobs.tasks.finish_attachment_upload``) hashes the part file in one
+streaming pass and moves it to ``job_attachments/sha256/<ab>/<digest>``, so
+the final chunk's request never reads the file back. The client polls the
+upload until it is ``complete``, with its ``attachment``, or ``failed``, with
+an ``error``. A file whose digest is
+already stored is not stored again; attachments with the same content share
+it. Stored files are never changed, so downloads carry the digest as a strong
+ETag and answer ``Range`` requests.
+"""
+import hashlib
+import mimetypes
+import os
+import re
+
+from django.conf import settings
+from django.core.files import File
+from django.core.files.storage import default_storage
+from django.db import transaction
+from django.utils import timezone
+
+from .models import AttachmentUpload, JobAttachment
+
+try:
+    import fcntl
+except ImportError:  # Windows: concurrent chunks for one upload are not guarded
+    fcntl = None
+
+STORAGE_DIR = 'job_attachments/sha256'
+
+# Bytes read from the request, and from disk when hashing, at a time
+READ_BLOCK = 64 * 1024
+HASH_BLOCK = 1024 * 1024
+
+# Leading bytes of common brief and design formats; None defers to the
+# file name (ZIP is the container of .docx, .xlsx, .sketch, ...)
+SIGNATURES = (
+    (b'%PDF-', 'application/pdf'),
+    (b'\x89PNG\r\n\x1a\n', 'image/png'),
+    (b'\xff\xd8\xff', 'image/jpeg'),
+    (b'GIF87a', 'image/gif'),
+    (b'GIF89a', 'image/gif'),
+    (b'8BPS', 'image/vnd.adobe.photoshop'),
+    (b'PK\x03\x04', None),
+)
+
+CONTENT_RANGE = re.compile(r'^bytes (\d+)-(\d+)/(\d+)$')
+RANGE = re.compile(r'^bytes=(\d*)-(\d*)$')
+
+
+class UploadConflict(Exception):
+    """
+    A chunk that does not start at the upload's offset, or that arrived while
+    another chunk of the same upload was being written.
+    """
+
+    def __init__(self, offset):
+        super().__init__(f'Upload is at byte {offset}')
+        self.offset = offset
+
+
+def part_path(upload_id):
+    return os.path.join(settings.ATTACHMENT_UPLOAD_DIR, f'{upload_id}.part')
+
+
+def parse_content_range(header, size):
+    """
+    ``(start, end)`` (inclusive) of a chunk's ``Content-Range`` header, or
+    None when it is malformed or does not fit an upload of ``size`` bytes.
+    """
+    match = CONTENT_RANGE.match(header or '')
+    if match is None:
+        return None
+    start, end, total = map(int, match.groups())
+    if total != size or start > end or end >= size:
+        return None
+    return start, end
+
+
+def write_chunk(upload, stream, start, end):
+    """
+    Append bytes ``start`` to ``end`` of the upload from ``stream`` to its part
+    file and return the new offset. A connection dropped mid-chunk keeps what
+    arrived.
+    """
+    os.makedirs(settings.ATTACHMENT_UPLOAD_DIR, exist_ok=True)
+    with open(part_path(upload.pk), 'ab') as part:
+        if fcntl is not None:
+            try:
+                fcntl.flock(part, fcntl.LOCK_EX | fcntl.LOCK_NB)
+            except BlockingIOError:
+                raise UploadConflict(upload.received) from None
+        offset = part.tell()
+        if start != offset:
+            raise UploadConflict(offset)
+        remaining = end - start + 1
+        while remaining:
+            block = stream.read(min(READ_BLOCK, remaining))
+            if not block:
+                break
+            part.write(block)
+            remaining -= len(block)
+        part.flush()
+        offset = part.tell()
+    AttachmentUpload.objects.filter(pk=upload.pk).update(received=offset, updated_at=timezone.now())
+    upload.received = offset
+    return offset
+
+
+def file_digest(path):
+    digest = hashlib.sha256()
+    with open(path, 'rb') as f:
+        for block in iter(lambda: f.read(HASH_BLOCK), b''):
+            digest.update(block)
+    return digest.hexdigest()
+
+
+def sniff_content_type(path, name):
+    with open(path, 'rb') as f:
+        head = f.read(16)
+    guessed = mimetypes.guess_type(name)[0]
+    for signature, content_type in SIGNATURES:
+        if head.startswith(signature):
+            return content_type or guessed or 'application/zip'
+    return guessed or 'application/octet-stream'
+
+
+class PartFile(File):
+    # Lets FileSystemStorage move the part file into place instead of copying
+    def temporary_file_path(self):
+        return self.name
+
+
+def store(path, digest):
+    """
+    Move the file at ``path`` to its content-addressed name, or drop it when
+    that content is stored already. Returns the storage name.
+    """
+    name = f'{STORAGE_DIR}/{digest[:2]}/{digest}'
+    if default_storage.exists(name):
+        os.remove(path)
+        return name
+    with open(path, 'rb') as f:
+        stored = default_storage.save(name, PartFile(f, name=path))
+    if os.path.exists(path):
+        os.remove(path)
+    if stored != name:
+        # Another upload of the same content got there first
+        default_storage.delete(stored)
+    return name
+
+
+class DigestMismatch(ValueError):
+    pass
+
+
+def complete(upload):
+    """
+    Turn a fully received upload into a ``JobAttachment`` and mark the upload
+    complete with it. Raises ``DigestMismatch`` (and discards the received
+    bytes) when the client's expected digest doesn't match.
+    """
+    path = part_path(upload.pk)
+    digest = file_digest(path)
+    if upload.sha256 and upload.sha256 != digest:
+        discard(upload.pk)
+        raise DigestMismatch(f'Received content has SHA-256 {digest}, not {upload.sha256}')
+    content_type = sniff_content_type(path, upload.name)
+    name = store(path, digest)
+    with transaction.atomic():
+        attachment = JobAttachment.objects.create(
+            job_id=upload.job_id, file=name, name=upload.name, size=upload.size,
+            sha256=digest, content_type=content_type,
+        )
+        AttachmentUpload.objects.filter(pk=upload.pk).update(
+            status='complete', attachment=attachment, updated_at=timezone.now(),
+        )
+    return attachment
+
+
+def discard(upload_id):
+    try:
+        os.remove(part_path(upload_id))
+    except FileNotFoundError:
+        pass
+
+
+def parse_range(header, size):
+    """
+    ``(start, end)`` (inclusive) of a single-range ``Range`` header for a
+    file of ``size`` bytes, or None to send the whole file (no header, a
+    malformed one, or several ranges). Raises ``ValueError`` when the range
+    can't be satisfied.
+    """
+    match = RANGE.match(header or '')
+    if match is None or match.groups() == ('', ''):
+        return None
+    first, last = match.groups()
+    if not first:
+        # The last N bytes
+        length = int(last)
+        if length == 0 or size == 0:
+            raise ValueError(header)
+        return max(size - length, 0), size - 1
+    start = int(first)
+    end = min(int(last), size - 1) if last else size - 1
+    if start >= size or start > end:
+        raise ValueError(header)
+    return start, end
+
+
+def iter_range(f, start, end):
+    try:
+        f.seek(start)
+        remaining = end - start + 1
+        while remaining:
+            block = f.read(min(HASH_BLOCK, remaining))
+            if not block:
+                break
+            remaining -= len(block)
+            yield block
+    finally:
+        f.close()
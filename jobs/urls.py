@@ -1,12 +1,34 @@
+from django.conf import settings
 from django.urls import path, include
 from rest_framework.routers import DefaultRouter
-from . import views
+from . import async_views, views
 
 router = DefaultRouter()
 router.register(r'categories', views.CategoryViewSet)
 router.register(r'jobs', views.JobViewSet)
+router.register(r'saved-searches', views.SavedSearchViewSet)
+router.register(r'alerts', views.JobAlertViewSet)
+router.register(r'attachment-uploads', views.AttachmentUploadViewSet)
 
 urlpatterns = [
     path('', include(router.urls)),
     path('search/', views.JobSearchView.as_view(), name='job-search'),
+    path('autocomplete/', views.JobAutocompleteView.as_view(), name='job-autocomplete'),
+    path('attachments/<int:pk>/download/', views.JobAttachmentDownloadView.as_view(),
+         name='job-attachment-download'),
 ]
+
+if settings.ASYNC_READ_VIEWS:
+    # Async GETs ahead of the router; other methods reach the same viewsets
+    urlpatterns = [
+        path('jobs/', async_views.JobListView.as_view(
+            write_view=views.JobViewSet.as_view({'get': 'list', 'post': 'create'})
+        )),
+        path('jobs/<int:pk>/', async_views.JobDetailView.as_view(
+            write_view=views.JobViewSet.as_view({
+                'get': 'retrieve', 'put': 'update', 'patch': 'partial_update', 'delete': 'destroy',
+            })
+        )),
+        path('search/', async_views.JobSearchView.as_view(write_view=views.JobSearchView.as_view()),
+             name='job-search'),
+    ] + urlpatterns
@@ -1,21 +1,136 @@
-from django.shortcuts import render
-from django.db.models import Q
-from rest_framework import viewsets, status
+import os
+from datetime import timedelta
+
+from django.conf import settings
+from django.db import transaction
+from django.http import FileResponse, Http404, HttpResponse, StreamingHttpResponse
+from django.shortcuts import get_object_or_404, render
+from django.utils import timezone
+from django.utils.cache import get_conditional_response
+from django.utils.http import content_disposition_header, quote_etag
+from rest_framework import mixins, viewsets, status
 from rest_framework.decorators import action
+from rest_framework.exceptions import PermissionDenied
 from rest_framework.response import Response
 from rest_framework.views import APIView
 from rest_framework.permissions import IsAuthenticated, AllowAny
-from .models import Category, Job, JobAttachment
-from .serializers import CategorySerializer, JobSerializer, JobListSerializer
+from accounts.models import FreelancerProfile, User
+from accounts.serializers import FreelancerProfileSerializer
+from .models import AttachmentUpload, Category, Job, JobAlert, JobAttachment, SavedSearch
+from .serializers import (
+    AttachmentUploadSerializer, CategorySerializer, JobAlertSerializer,
+    JobSerializer, JobListSerializer, SavedSearchSerializer, job_list_data, job_list_rows
+)
+from .matching import match_freelancers
+from . import autocomplete, uploads
+from .pagination import JobAlertCursorPagination, JobCursorPagination, RankedJobCursorPagination
+from .cache import cache_response
+from .conditional import conditional, list_validators, lock_if_unsafe, object_validators
+from .facets import search_facets, wants_facets, without_facet_filters
+from .search import search_jobs
+from .skills import filter_by_skills
+from .tasks import expire_attachment_upload, finish_attachment_upload
+
+
+def job_validators(view, request, pk=None, **kwargs):
+    queryset = lock_if_unsafe(request, Job.objects.filter(pk=pk))
+    return object_validators(queryset, ('updated_at', 'recruiter__updated_at'),
+                             models=(Category, JobAttachment))
+
+
+def job_list_validators(view, request, *args, **kwargs):
+    return list_validators(request, view.filter_queryset(view.get_queryset()),
+                           models=(Category, User))
+
+
+def filter_jobs(queryset, params, user):
+    """
+    Job list filters shared by JobViewSet and its async read path; the
+    ``skills`` filter needs its own lookup and is applied by each
+    """
+    # Filter by status
+    status_filter = params.get('status', None)
+    if status_filter:
+        queryset = queryset.filter(status=status_filter)
+    
+    # Filter by category
+    category = params.get('category', None)
+    if category:
+        queryset = queryset.filter(category_id=category)
+    
+    # Filter by job type
+    job_type = params.get('job_type', None)
+    if job_type:
+        queryset = queryset.filter(job_type=job_type)
+    
+    # Filter by experience level
+    experience_level = params.get('experience_level', None)
+    if experience_level:
+        queryset = queryset.filter(experience_level=experience_level)
+    
+    # Filter by recruiter (for recruiter's own jobs)
+    if params.get('my_jobs', None) == 'true':
+        queryset = queryset.filter(recruiter=user)
+    
+    return queryset
+
+
+def search_queryset(params):
+    """
+    Open jobs matching the search parameters, and the paginator that orders
+    them
+    """
+    query = params.get('q', '')
+    jobs = Job.objects.filter(status='open').select_related('recruiter', 'category')
+    
+    paginator = JobCursorPagination()
+    if query:
+        # Ranked by relevance through the full-text index
+        jobs = search_jobs(jobs, query)
+        paginator = RankedJobCursorPagination()
+    
+    # Apply filters
+    category = params.get('category')
+    if category:
+        jobs = jobs.filter(category_id=category)
+    
+    job_type = params.get('job_type')
+    if job_type:
+        jobs = jobs.filter(job_type=job_type)
+    
+    experience_level = params.get('experience_level')
+    if experience_level:
+        jobs = jobs.filter(experience_level=experience_level)
+    
+    # Budget filters: jobs whose budget (or hourly rate) range overlaps
+    # [min_budget, max_budget]
+    min_budget = params.get('min_budget')
+    max_budget = params.get('max_budget')
+    
+    if min_budget:
+        jobs = jobs.filter(effective_max__gte=min_budget)
+    if max_budget:
+        jobs = jobs.filter(effective_min__lte=max_budget)
+    
+    return jobs, paginator
 
 class CategoryViewSet(viewsets.ModelViewSet):
     queryset = Category.objects.all()
     serializer_class = CategorySerializer
     permission_classes = [AllowAny]
+    
+    @cache_response(Category)
+    def list(self, request, *args, **kwargs):
+        return super().list(request, *args, **kwargs)
+    
+    @cache_response(Category)
+    def retrieve(self, request, *args, **kwargs):
+        return super().retrieve(request, *args, **kwargs)
 
 class JobViewSet(viewsets.ModelViewSet):
     queryset = Job.objects.all()
     serializer_class = JobSerializer
+    pagination_class = JobCursorPagination
     
     def get_permissions(self):
         """
@@ -32,34 +147,41 @@ class JobViewSet(viewsets.ModelViewSet):
             return JobListSerializer
         return JobSerializer
     
+    # Authenticated users can ask for their own jobs, so only cache anonymous reads
+    @conditional(job_list_validators, use_last_modified=False)
+    @cache_response(Job, Category, User, anonymous_only=True)
+    def list(self, request, *args, **kwargs):
+        # JobListSerializer's output, built straight from the rows
+        rows = job_list_rows(self.filter_queryset(self.get_queryset()), self.paginator.ordering)
+        page = self.paginate_queryset(rows)
+        if page is None:
+            return Response(job_list_data(rows))
+        return self.get_paginated_response(job_list_data(page))
+    
+    @conditional(job_validators)
+    @cache_response(Job, Category, User, JobAttachment, anonymous_only=True)
+    def retrieve(self, request, *args, **kwargs):
+        return super().retrieve(request, *args, **kwargs)
+    
+    # partial_update goes through update, so If-Match covers PUT and PATCH
+    @conditional(job_validators)
+    def update(self, request, *args, **kwargs):
+        return super().update(request, *args, **kwargs)
+    
     def get_queryset(self):
-        queryset = Job.objects.all()
-        
-        # Filter by status
-        status_filter = self.request.query_params.get('status', None)
-        if status_filter:
-            queryset = queryset.filter(status=status_filter)
-        
-        # Filter by category
-        category = self.request.query_params.get('category', None)
-        if category:
-            queryset = queryset.filter(category_id=category)
+        queryset = Job.objects.select_related('recruiter', 'category')
+        if self.action != 'list':
+            # Only the full JobSerializer nests attachments
+            queryset = queryset.prefetch_related('attachments')
         
-        # Filter by job type
-        job_type = self.request.query_params.get('job_type', None)
-        if job_type:
-            queryset = queryset.filter(job_type=job_type)
+        queryset = filter_jobs(queryset, self.request.query_params, self.request.user)
         
-        # Filter by experience level
-        experience_level = self.request.query_params.get('experience_level', None)
-        if experience_level:
-            queryset = queryset.filter(experience_level=experience_level)
+        # Filter by canonical skills (must have all of them)
+        skills = self.request.query_params.get('skills', None)
+        if skills:
+            queryset = filter_by_skills(queryset, skills)
         
-        # Filter by recruiter (for recruiter's own jobs)
-        if self.request.query_params.get('my_jobs', None) == 'true':
-            queryset = queryset.filter(recruiter=self.request.user)
-        
-        return queryset.order_by('-created_at')
+        return queryset.order_by('-created_at', '-id')
     
     @action(detail=True, methods=['post'])
     def toggle_status(self, request, pk=None):
@@ -69,47 +191,205 @@ class JobViewSet(viewsets.ModelViewSet):
         
         new_status = request.data.get('status')
         if new_status in ['open', 'in_progress', 'completed', 'cancelled']:
-            job.status = new_status
-            job.save()
+            # Completing a job credits the accepted freelancers (applications.signals)
+            with transaction.atomic():
+                job.status = new_status
+                job.save()
             return Response({'message': f'Job status updated to {new_status}'})
         
         return Response({'error': 'Invalid status'}, status=status.HTTP_400_BAD_REQUEST)
+    
+    @action(detail=True, methods=['get'])
+    def matches(self, request, pk=None):
+        """
+        Top-k freelancers for this job, scored on skills, rate, experience and rating
+        """
+        job = self.get_object()
+        if job.recruiter != request.user:
+            return Response({'error': 'Permission denied'}, status=status.HTTP_403_FORBIDDEN)
+        
+        try:
+            limit = min(max(int(request.query_params.get('limit', 10)), 1), 100)
+        except ValueError:
+            return Response({'error': 'Invalid limit'}, status=status.HTTP_400_BAD_REQUEST)
+        
+        ranked = match_freelancers(job, k=limit)
+        profiles = FreelancerProfile.objects.select_related('user').in_bulk(
+            [profile_id for profile_id, _ in ranked]
+        )
+        return Response([
+            {
+                'score': round(score, 4),
+                'profile': FreelancerProfileSerializer(profiles[profile_id]).data,
+            }
+            for profile_id, score in ranked
+            if profile_id in profiles
+        ])
 
 class JobSearchView(APIView):
     permission_classes = [AllowAny]
     
+    @cache_response(Job, Category, User)
     def get(self, request):
-        query = request.query_params.get('q', '')
-        jobs = Job.objects.filter(status='open')
-        
-        if query:
-            jobs = jobs.filter(
-                Q(title__icontains=query) |
-                Q(description__icontains=query) |
-                Q(skills_required__icontains=query)
-            )
-        
-        # Apply filters
-        category = request.query_params.get('category')
-        if category:
-            jobs = jobs.filter(category_id=category)
-        
-        job_type = request.query_params.get('job_type')
-        if job_type:
-            jobs = jobs.filter(job_type=job_type)
+        jobs, paginator = search_queryset(request.query_params)
+        page = paginator.paginate_queryset(job_list_rows(jobs, paginator.ordering), request, view=self)
+        response = paginator.get_paginated_response(job_list_data(page))
+        if wants_facets(request.query_params):
+            facet_jobs, _ = search_queryset(without_facet_filters(request.query_params))
+            response.data['facets'] = search_facets(facet_jobs, request.query_params)
+        return response
+
+class JobAutocompleteView(APIView):
+    permission_classes = [AllowAny]
+    # Suggestions are the same for everyone; skip the session and token lookups
+    authentication_classes = []
+    
+    def get(self, request):
+        try:
+            limit = int(request.query_params.get('limit', 10))
+        except ValueError:
+            limit = 10
+        limit = min(max(limit, 1), 20)
+        return Response({'results': autocomplete.suggest(request.query_params.get('q', ''), limit)})
+
+class SavedSearchViewSet(viewsets.ModelViewSet):
+    queryset = SavedSearch.objects.all()
+    serializer_class = SavedSearchSerializer
+    permission_classes = [IsAuthenticated]
+    
+    def get_queryset(self):
+        return SavedSearch.objects.filter(user=self.request.user)
+
+class JobAlertViewSet(viewsets.ReadOnlyModelViewSet):
+    """
+    New jobs matching the user's saved searches, newest first
+    """
+    queryset = JobAlert.objects.all()
+    serializer_class = JobAlertSerializer
+    permission_classes = [IsAuthenticated]
+    pagination_class = JobAlertCursorPagination
+    
+    def get_queryset(self):
+        queryset = JobAlert.objects.filter(user=self.request.user).select_related(
+            'job__recruiter', 'job__category'
+        )
+        if self.request.query_params.get('unread') == 'true':
+            queryset = queryset.filter(is_read=False)
+        return queryset
+    
+    @action(detail=False, methods=['post'])
+    def mark_read(self, request):
+        # Every alert, or just the ids given
+        queryset = JobAlert.objects.filter(user=request.user, is_read=False)
+        ids = request.data.get('ids')
+        if ids is not None:
+            if not isinstance(ids, list) or not all(str(pk).isdigit() for pk in ids):
+                return Response({'error': 'ids must be a list of alert ids'},
+                                status=status.HTTP_400_BAD_REQUEST)
+            queryset = queryset.filter(pk__in=ids)
+        updated = queryset.update(is_read=True)
+        return Response({'message': f'{updated} alerts marked as read'})
+
+class AttachmentUploadViewSet(mixins.CreateModelMixin, mixins.RetrieveModelMixin,
+                              mixins.DestroyModelMixin, viewsets.GenericViewSet):
+    """
+    Resumable attachment uploads: create one for a job, PUT its bytes in
+    chunks with a Content-Range header, and GET it to learn where to resume
+    """
+    queryset = AttachmentUpload.objects.all()
+    serializer_class = AttachmentUploadSerializer
+    permission_classes = [IsAuthenticated]
+    
+    def get_queryset(self):
+        return AttachmentUpload.objects.filter(user=self.request.user)
+    
+    def perform_create(self, serializer):
+        if serializer.validated_data['job'].recruiter_id != self.request.user.pk:
+            raise PermissionDenied('Only the job\'s recruiter can attach files')
+        upload = serializer.save(user=self.request.user)
+        expire_attachment_upload.schedule(
+            upload.created_at + timedelta(seconds=settings.ATTACHMENT_UPLOAD_EXPIRY), upload_id=str(upload.pk)
+        )
+    
+    def perform_destroy(self, instance):
+        uploads.discard(instance.pk)
+        instance.delete()
+    
+    def update(self, request, *args, **kwargs):
+        """
+        Append a chunk, read straight from the request body; the last one
+        queues the upload's verification and answers 202
+        """
+        upload = self.get_object()
+        if upload.status != 'receiving':
+            return Response({'error': f'Upload is {upload.status}', 'received': upload.received},
+                            status=status.HTTP_409_CONFLICT)
+        chunk = uploads.parse_content_range(request.headers.get('Content-Range'), upload.size)
+        if chunk is None or request.stream is None:
+            return Response({'error': f'Send a body with Content-Range: bytes <start>-<end>/{upload.size}'},
+                            status=status.HTTP_400_BAD_REQUEST)
+        try:
+            received = uploads.write_chunk(upload, request.stream, *chunk)
+        except uploads.UploadConflict as conflict:
+            return Response({'error': str(conflict), 'received': conflict.offset}, status=status.HTTP_409_CONFLICT)
+        if received < upload.size:
+            return Response(self.get_serializer(upload).data)
         
-        experience_level = request.query_params.get('experience_level')
-        if experience_level:
-            jobs = jobs.filter(experience_level=experience_level)
+        # Hashing up to ATTACHMENT_MAX_SIZE bytes is left to the worker
+        with transaction.atomic():
+            if AttachmentUpload.objects.filter(pk=upload.pk, status='receiving').update(
+                status='processing', updated_at=timezone.now(),
+            ):
+                finish_attachment_upload.delay(upload_id=str(upload.pk))
+        upload.refresh_from_db()
+        return Response(self.get_serializer(upload).data, status=status.HTTP_202_ACCEPTED)
+
+class JobAttachmentDownloadView(APIView):
+    """
+    An attachment's file, with single-range requests and its digest as ETag
+    """
+    permission_classes = [AllowAny]
+    # Attachments are as public as the jobs listing them
+    authentication_classes = []
+    
+    def get(self, request, pk):
+        attachment = get_object_or_404(JobAttachment, pk=pk)
+        etag = quote_etag(attachment.sha256) if attachment.sha256 else None
+        response = get_conditional_response(request, etag=etag)
+        if response is not None:
+            return response
         
-        # Budget filters
-        min_budget = request.query_params.get('min_budget')
-        max_budget = request.query_params.get('max_budget')
+        storage = attachment.file.storage
+        try:
+            f = storage.open(attachment.file.name, 'rb')
+        except FileNotFoundError:
+            raise Http404('Attachment file is missing')
+        size = attachment.size if attachment.size is not None else f.size
         
-        if min_budget:
-            jobs = jobs.filter(budget_min__gte=min_budget)
-        if max_budget:
-            jobs = jobs.filter(budget_max__lte=max_budget)
+        byte_range = None
+        # A range of a different version of the file would be corrupt
+        if_range = request.headers.get('If-Range')
+        if if_range is None or (etag is not None and if_range == etag):
+            try:
+                byte_range = uploads.parse_range(request.headers.get('Range'), size)
+            except ValueError:
+                f.close()
+                response = HttpResponse(status=status.HTTP_416_REQUESTED_RANGE_NOT_SATISFIABLE)
+                response['Content-Range'] = f'bytes */{size}'
+                return response
         
-        serializer = JobListSerializer(jobs, many=True)
-        return Response(serializer.data)
+        filename = attachment.name or os.path.basename(attachment.file.name)
+        content_type = attachment.content_type or 'application/octet-stream'
+        if byte_range is None:
+            response = FileResponse(f, as_attachment=True, filename=filename, content_type=content_type)
+        else:
+            start, end = byte_range
+            response = StreamingHttpResponse(uploads.iter_range(f, start, end),
+                                             status=status.HTTP_206_PARTIAL_CONTENT, content_type=content_type)
+            response['Content-Range'] = f'bytes {start}-{end}/{size}'
+            response['Content-Length'] = end - start + 1
+            response['Content-Disposition'] = content_disposition_header(True, filename)
+        response['Accept-Ranges'] = 'bytes'
+        if etag is not None:
+            response['ETag'] = etag
+        return response
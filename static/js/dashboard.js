@@ -141,22 +141,24 @@ async function loadDashboardContent(section) {
     }
 }
 
+async function loadDashboardSummary() {
+    // Counts and recent activity for the overview in a single request
+    const response = await fetch(`${API_BASE}/dashboard/summary/`, { credentials: 'include' });
+    return response.ok ? await response.json() : {};
+}
+
 async function loadOverview() {
     const content = document.getElementById('dashboard-content');
     
     if (currentUser.user_type === 'freelancer') {
         // Load freelancer overview
-        const [applicationsRes, profileRes] = await Promise.all([
-            fetch(`${API_BASE}/applications/applications/`, { credentials: 'include' }),
-            fetch(`${API_BASE}/accounts/profile/`, { credentials: 'include' })
-        ]);
+        const summary = await loadDashboardSummary();
+        const applications = summary.recent_activity || [];
+        const counts = summary.applications || {};
         
-        const applications = applicationsRes.ok ? await applicationsRes.json() : [];
-        const profile = profileRes.ok ? await profileRes.json() : {};
-        
-        const pendingApps = applications.filter(app => app.status === 'pending').length;
-        const acceptedApps = applications.filter(app => app.status === 'accepted').length;
-        const totalApps = applications.length;
+        const pendingApps = counts.pending || 0;
+        const acceptedApps = counts.accepted || 0;
+        const totalApps = counts.total || 0;
         
         content.innerHTML = `
             <div class="stats-grid">
@@ -185,29 +187,24 @@ async function loadOverview() {
                     <div class="stat-icon info">
                         <i class="fas fa-dollar-sign"></i>
                     </div>
-                    <div class="stat-number">$${profile.profile?.hourly_rate || 0}</div>
+                    <div class="stat-number">$${summary.profile?.hourly_rate || 0}</div>
                     <div class="stat-label">Hourly Rate</div>
                 </div>
             </div>
             <div class="dashboard-content">
                 <h3 style="padding: 20px;">Recent Applications</h3>
-                ${applications.length > 0 ? generateApplicationsTable(applications.slice(0, 5)) : '<div class="empty-state"><i class="fas fa-file-alt"></i><h3>No Applications Yet</h3><p>Start applying to jobs to see your applications here.</p><button class="btn-primary" onclick="loadDashboardContent(\'jobs\')">Browse Jobs</button></div>'}
+                ${applications.length > 0 ? generateApplicationsTable(applications) : '<div class="empty-state"><i class="fas fa-file-alt"></i><h3>No Applications Yet</h3><p>Start applying to jobs to see your applications here.</p><button class="btn-primary" onclick="loadDashboardContent(\'jobs\')">Browse Jobs</button></div>'}
             </div>
         `;
     } else {
         // Load recruiter overview
-        const [jobsRes, applicationsRes] = await Promise.all([
-            fetch(`${API_BASE}/jobs/jobs/?my_jobs=true`, { credentials: 'include' }),
-            fetch(`${API_BASE}/applications/applications/`, { credentials: 'include' })
-        ]);
-        
-        const jobs = jobsRes.ok ? await jobsRes.json() : [];
-        const applications = applicationsRes.ok ? await applicationsRes.json() : [];
+        const summary = await loadDashboardSummary();
+        const applications = summary.recent_activity || [];
         
-        const activeJobs = jobs.filter(job => job.status === 'open').length;
-        const totalJobs = jobs.length;
-        const totalApplications = applications.length;
-        const pendingApps = applications.filter(app => app.status === 'pending').length;
+        const activeJobs = summary.jobs?.open || 0;
+        const totalJobs = summary.jobs?.total || 0;
+        const totalApplications = summary.applications?.total || 0;
+        const pendingApps = summary.applications?.pending || 0;
         
         content.innerHTML = `
             <div class="stats-grid">
@@ -242,7 +239,7 @@ async function loadOverview() {
             </div>
             <div class="dashboard-content">
                 <h3 style="padding: 20px;">Recent Applications</h3>
-                ${applications.length > 0 ? generateApplicationsTable(applications.slice(0, 5)) : '<div class="empty-state"><i class="fas fa-file-alt"></i><h3>No Applications Yet</h3><p>Post jobs to start receiving applications.</p><button class="btn-primary" onclick="showModal(\'job-post-modal\')">Post a Job</button></div>'}
+                ${applications.length > 0 ? generateApplicationsTable(applications) : '<div class="empty-state"><i class="fas fa-file-alt"></i><h3>No Applications Yet</h3><p>Post jobs to start receiving applications.</p><button class="btn-primary" onclick="showModal(\'job-post-modal\')">Post a Job</button></div>'}
             </div>
         `;
     }
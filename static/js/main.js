@@ -111,6 +111,8 @@ function setupEventListeners() {
     const searchInput = document.getElementById('job-search');
     if (searchInput) {
         searchInput.addEventListener('input', debounce(searchJobs, 300));
+        // Suggestions are served from memory, so ask on every keystroke
+        searchInput.addEventListener('input', suggestSearchTerms);
     }
     
     // Close modals when clicking outside
@@ -160,7 +162,8 @@ async function loadJobs() {
         showLoading('jobs-container');
         const response = await fetch(`${API_BASE}/jobs/jobs/`);
         if (response.ok) {
-            jobs = await response.json();
+            const data = await response.json();
+            jobs = data.results || data;
             displayJobs(jobs);
         } else {
             showError('jobs-container', 'Failed to load jobs');
@@ -256,7 +259,7 @@ async function loadFreelancers() {
             return `
                 <div class="freelancer-card">
                     <div class="freelancer-avatar">
-                        <i class="fas fa-user"></i>
+                        ${avatarHTML(freelancer.user, name)}
                     </div>
                     <h3 class="freelancer-name">${name}</h3>
                     <p class="freelancer-title">${primarySkill}</p>
@@ -280,6 +283,20 @@ async function loadFreelancers() {
     }
 }
 
+// Profile picture thumbnail for an 80px avatar, WebP where supported
+function avatarHTML(user, name) {
+    const variants = user?.profile_picture_variants;
+    if (!variants || !variants.small) {
+        return '<i class="fas fa-user"></i>';
+    }
+    return `
+        <picture>
+            <source type="image/webp" srcset="${variants.small.webp} 1x, ${variants.medium.webp} 2x">
+            <img src="${variants.small.jpeg}" srcset="${variants.medium.jpeg} 2x" alt="${name}" width="80" height="80" loading="lazy">
+        </picture>
+    `;
+}
+
 // Search jobs
 async function searchJobs() {
     const query = document.getElementById('job-search')?.value || '';
@@ -295,11 +312,13 @@ async function searchJobs() {
         if (category) params.append('category', category);
         if (jobType) params.append('job_type', jobType);
         if (experience) params.append('experience_level', experience);
+        params.append('facets', '1');
         
         const response = await fetch(`${API_BASE}/jobs/search/?${params.toString()}`);
         if (response.ok) {
             const searchResults = await response.json();
-            displayJobs(searchResults);
+            displayJobs(searchResults.results);
+            updateFacetCounts(searchResults.facets);
         } else {
             showError('jobs-container', 'Search failed');
         }
@@ -309,6 +328,56 @@ async function searchJobs() {
     }
 }
 
+// Fill the search box suggestions from the autocomplete endpoint
+let latestSuggestion = 0;
+async function suggestSearchTerms() {
+    const query = document.getElementById('job-search')?.value || '';
+    const datalist = document.getElementById('job-search-suggestions');
+    if (!datalist) return;
+    const requestId = ++latestSuggestion;
+    if (!query.trim()) {
+        datalist.innerHTML = '';
+        return;
+    }
+    
+    try {
+        const params = new URLSearchParams({ q: query });
+        const response = await fetch(`${API_BASE}/jobs/autocomplete/?${params.toString()}`);
+        // Ignore answers to keystrokes the user has already typed past
+        if (!response.ok || requestId !== latestSuggestion) return;
+        const suggestions = await response.json();
+        datalist.innerHTML = '';
+        suggestions.results.forEach(suggestion => {
+            const option = document.createElement('option');
+            option.value = suggestion.text;
+            option.label = `${suggestion.type} (${suggestion.count})`;
+            datalist.appendChild(option);
+        });
+    } catch (error) {
+        console.error('Error loading suggestions:', error);
+    }
+}
+
+// Show how many jobs each filter option would match
+function updateFacetCounts(facets) {
+    if (!facets) return;
+    const selects = {
+        'category': 'category-filter',
+        'job_type': 'job-type-filter',
+        'experience_level': 'experience-filter'
+    };
+    Object.entries(selects).forEach(([facet, selectId]) => {
+        const select = document.getElementById(selectId);
+        if (!select || !facets[facet]) return;
+        const counts = new Map(facets[facet].map(item => [String(item.value), item.count]));
+        Array.from(select.options).forEach(option => {
+            if (!option.value || !counts.has(option.value)) return;
+            option.dataset.label = option.dataset.label || option.textContent;
+            option.textContent = `${option.dataset.label} (${counts.get(option.value)})`;
+        });
+    });
+}
+
 // Handle login
 async function handleLogin(event) {
     event.preventDefault();
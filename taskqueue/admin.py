@@ -0,0 +1,14 @@
+from django.contrib import admin
+from django.utils import timezone
+from .models import Task
+
+@admin.register(Task)
+class TaskAdmin(admin.ModelAdmin):
+    list_display = ['name', 'status', 'run_at', 'attempts', 'max_attempts', 'claimed_by', 'created_at']
+    list_filter = ['status', 'name']
+    readonly_fields = ['claimed_by', 'claimed_at', 'finished_at', 'last_error']
+    actions = ['retry']
+    
+    @admin.action(description='Queue selected tasks again')
+    def retry(self, request, queryset):
+        queryset.update(status='queued', run_at=timezone.now(), attempts=0, claimed_by='', finished_at=None)
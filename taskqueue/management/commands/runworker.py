@@ -0,0 +1,74 @@
+import multiprocessing
+import os
+import signal
+import socket
+import time
+from concurrent.futures import FIRST_COMPLETED, ProcessPoolExecutor, ThreadPoolExecutor, wait
+
+from django.core.management.base import BaseCommand
+from django.db import close_old_connections
+from taskqueue.queue import claim
+from taskqueue.worker import run, setup_process
+
+
+class Command(BaseCommand):
+    help = 'Run queued background tasks'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--concurrency', type=int, default=4,
+                            help='Tasks run at the same time (default 4)')
+        parser.add_argument('--pool', choices=('thread', 'process'), default='thread',
+                            help='Run tasks in threads (default) or in worker processes')
+        parser.add_argument('--poll-interval', type=float, default=1.0,
+                            help='Seconds to wait when no task is due (default 1)')
+        parser.add_argument('--burst', action='store_true',
+                            help='Exit once no task is due instead of waiting for more')
+
+    def handle(self, *args, **options):
+        concurrency = max(options['concurrency'], 1)
+        if options['pool'] == 'process':
+            # Forked children would share the parent's database connections
+            executor = ProcessPoolExecutor(concurrency, mp_context=multiprocessing.get_context('spawn'),
+                                           initializer=setup_process)
+        else:
+            executor = ThreadPoolExecutor(concurrency, thread_name_prefix='task')
+        worker = f'{socket.gethostname()}:{os.getpid()}'
+
+        self.stopping = False
+        previous = {sig: signal.signal(sig, self.stop) for sig in (signal.SIGINT, signal.SIGTERM)}
+        self.stdout.write(f'Worker {worker} running up to {concurrency} tasks in a {options["pool"]} pool')
+        ran = failed = 0
+        running = set()
+        try:
+            while not self.stopping:
+                done = {future for future in running if future.done()}
+                for future in done:
+                    ran += 1
+                    failed += not future.result()
+                running -= done
+
+                close_old_connections()
+                task_ids = []
+                if len(running) < concurrency:
+                    token, task_ids = claim(concurrency - len(running), worker)
+                running.update(executor.submit(run, task_id, token) for task_id in task_ids)
+                if task_ids:
+                    continue
+                if running:
+                    wait(running, timeout=options['poll_interval'], return_when=FIRST_COMPLETED)
+                elif options['burst']:
+                    break
+                else:
+                    time.sleep(options['poll_interval'])
+        finally:
+            # Let claimed tasks finish; unclaimed ones wait for the next worker
+            executor.shutdown(wait=True)
+            for sig, handler in previous.items():
+                signal.signal(sig, handler)
+        for future in running:
+            ran += 1
+            failed += not future.result()
+        self.stdout.write(f'Worker {worker} stopped after {ran} tasks ({failed} failed)')
+
+    def stop(self, signum, frame):
+        self.stopping = True
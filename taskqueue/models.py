@@ -0,0 +1,37 @@
+from django.db import models
+from django.utils import timezone
+
+class Task(models.Model):
+    """
+    A queued call of a function registered with ``taskqueue.queue.task``.
+    Finished tasks are deleted; failed ones stay for inspection.
+    """
+    STATUS_CHOICES = (
+        ('queued', 'Queued'),
+        ('running', 'Running'),
+        ('failed', 'Failed'),
+    )
+    
+    name = models.CharField(max_length=200)
+    kwargs = models.JSONField(default=dict, blank=True)
+    status = models.CharField(max_length=20, choices=STATUS_CHOICES, default='queued')
+    run_at = models.DateTimeField(default=timezone.now)
+    attempts = models.PositiveIntegerField(default=0)
+    max_attempts = models.PositiveIntegerField(default=3)
+    last_error = models.TextField(blank=True)
+    claimed_by = models.CharField(max_length=64, blank=True)
+    claimed_at = models.DateTimeField(null=True, blank=True)
+    created_at = models.DateTimeField(default=timezone.now)
+    finished_at = models.DateTimeField(null=True, blank=True)
+    
+    class Meta:
+        ordering = ['run_at', 'id']
+        indexes = [
+            # Due tasks, in the order workers claim them
+            models.Index(fields=['run_at', 'id'], name='task_queued_idx', condition=models.Q(status='queued')),
+            # Claims abandoned by a worker that died
+            models.Index(fields=['claimed_at'], name='task_running_idx', condition=models.Q(status='running')),
+        ]
+    
+    def __str__(self):
+        return f"{self.name} ({self.status})"
@@ -0,0 +1,142 @@
+"""
+Database-backed background tasks.
+
+Functions decorated with ``@task`` are queued with ``func.delay(**kwargs)``
+(or ``func.schedule(run_at, **kwargs)``) as ``Task`` rows in the default
+database, in the same transaction as the write that caused them, so a
+rolled-back request never leaves work behind. ``manage.py runworker`` claims
+due tasks and runs them in a thread or process pool.
+
+Claiming uses ``SELECT ... FOR UPDATE SKIP LOCKED`` where the database has
+it (PostgreSQL), so concurrent workers never wait on each other's rows. Every
+claim is also a conditional UPDATE tagged with a per-claim token, which keeps
+claims exclusive on SQLite, where writers are serialized instead.
+
+A task's function and the deletion of its row commit together. A failing
+task rolls back, and is queued again after ``retry_delay * 2 ** (attempts - 1)``
+seconds until it has been tried ``max_attempts`` times, then marked failed.
+Tasks claimed by a worker that died are picked up again once their claim is
+older than ``TASKS_CLAIM_TIMEOUT`` seconds.
+
+With ``TASKS_EAGER`` on, ``delay`` runs the function inline instead.
+"""
+import logging
+import traceback
+import uuid
+from datetime import timedelta
+
+from django.conf import settings
+from django.db import connection, transaction
+from django.db.models import F, Q
+from django.utils import timezone
+
+from freelance_platform.db_routing import primary
+from .models import Task
+
+logger = logging.getLogger(__name__)
+
+registry = {}
+
+
+def task(func=None, *, max_attempts=3, retry_delay=10):
+    """
+    Register ``func`` as a task, adding ``func.delay`` and ``func.schedule``.
+    Arguments are passed as keywords and must be JSON-serializable.
+    """
+    def register(func):
+        func.task_name = f'{func.__module__}.{func.__name__}'
+        func.max_attempts = max_attempts
+        func.retry_delay = retry_delay
+        func.delay = lambda **kwargs: enqueue(func, **kwargs)
+        func.schedule = lambda run_at, **kwargs: enqueue(func, run_at=run_at, **kwargs)
+        registry[func.task_name] = func
+        return func
+    return register(func) if func is not None else register
+
+
+def enqueue(func, run_at=None, **kwargs):
+    if settings.TASKS_EAGER:
+        func(**kwargs)
+        return None
+    return Task.objects.create(
+        name=func.task_name,
+        kwargs=kwargs,
+        run_at=run_at or timezone.now(),
+        max_attempts=func.max_attempts,
+    )
+
+
+def _due(now):
+    stale = now - timedelta(seconds=settings.TASKS_CLAIM_TIMEOUT)
+    return Q(status='queued', run_at__lte=now) | Q(status='running', claimed_at__lt=stale)
+
+
+def claim(limit, worker=''):
+    """
+    Mark up to ``limit`` due tasks as running. Returns the claim's token and
+    the claimed ids, oldest first; pass both to ``execute``.
+    """
+    now = timezone.now()
+    token = f'{worker}:{uuid.uuid4().hex}'[-64:]
+    with primary(), transaction.atomic():
+        due = Task.objects.filter(_due(now)).order_by('run_at', 'id')
+        if connection.features.has_select_for_update_skip_locked:
+            due = due.select_for_update(skip_locked=True)
+        ids = list(due.values_list('id', flat=True)[:limit])
+        if not ids:
+            return token, []
+        # Still due: another worker may have claimed some in the meantime
+        Task.objects.filter(_due(now), pk__in=ids).update(
+            status='running', claimed_by=token, claimed_at=now, attempts=F('attempts') + 1,
+        )
+        return token, list(Task.objects.filter(claimed_by=token).order_by('run_at', 'id').values_list('id', flat=True))
+
+
+def execute(task_id, token):
+    """
+    Run one task claimed with ``token``. Returns whether it succeeded; a task
+    whose claim timed out and was taken over by another worker is left to
+    that worker, and its writes here are rolled back.
+    """
+    with primary():
+        claimed = Task.objects.filter(pk=task_id, status='running', claimed_by=token)
+        task = claimed.first()
+        if task is None:
+            return False
+        func = registry.get(task.name)
+        try:
+            if func is None:
+                raise LookupError(f'Unknown task {task.name}')
+            with transaction.atomic():
+                func(**task.kwargs)
+                if not claimed.delete()[0]:
+                    transaction.set_rollback(True)
+                    return False
+        except Exception:
+            logger.exception('Task %s (%s) failed', task.pk, task.name)
+            error = traceback.format_exc()
+            now = timezone.now()
+            if func is not None and task.attempts < task.max_attempts:
+                delay = timedelta(seconds=func.retry_delay * 2 ** (task.attempts - 1))
+                claimed.update(
+                    status='queued', run_at=now + delay, last_error=error, claimed_by='', claimed_at=None,
+                )
+            else:
+                claimed.update(status='failed', last_error=error, finished_at=now)
+            return False
+        return True
+
+
+def run_pending(limit=100):
+    """
+    Claim and run due tasks in this thread until none are left. Returns how
+    many ran, successful or not.
+    """
+    ran = 0
+    while True:
+        token, ids = claim(limit, worker='inline')
+        if not ids:
+            return ran
+        for task_id in ids:
+            execute(task_id, token)
+        ran += len(ids)
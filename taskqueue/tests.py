@@ -0,0 +1,135 @@
+from datetime import timedelta
+from io import StringIO
+from unittest import mock
+from django.core.management import call_command
+from django.test import TestCase, TransactionTestCase, override_settings
+from django.utils import timezone
+from accounts.models import User, RecruiterProfile
+from applications.models import Application
+from jobs.models import Category, Job
+from .models import Task
+from .queue import claim, execute, run_pending, task
+
+calls = []
+
+
+@task(max_attempts=2, retry_delay=60)
+def record(value):
+    calls.append(value)
+
+
+@task(max_attempts=2, retry_delay=60)
+def explode():
+    User.objects.create(username='rolled-back')
+    raise RuntimeError('boom')
+
+
+class TaskQueueTests(TestCase):
+    def setUp(self):
+        calls.clear()
+
+    def test_tasks_run_once_and_are_deleted(self):
+        record.delay(value=1)
+        record.schedule(timezone.now() + timedelta(hours=1), value=2)
+        self.assertEqual(calls, [])
+        self.assertEqual(run_pending(), 1)
+        self.assertEqual(calls, [1])
+        # Only the scheduled task is left, and it isn't due yet
+        self.assertEqual(list(Task.objects.values_list('kwargs', flat=True)), [{'value': 2}])
+        self.assertEqual(claim(10)[1], [])
+
+    def test_failures_roll_back_and_retry_with_backoff(self):
+        queued = explode.delay()
+        before = timezone.now()
+        with self.assertLogs('taskqueue.queue', 'ERROR'):
+            self.assertEqual(run_pending(), 1)
+        queued.refresh_from_db()
+        self.assertFalse(User.objects.filter(username='rolled-back').exists())
+        self.assertEqual((queued.status, queued.attempts), ('queued', 1))
+        self.assertIn('RuntimeError: boom', queued.last_error)
+        self.assertGreaterEqual(queued.run_at, before + timedelta(seconds=60))
+
+        Task.objects.filter(pk=queued.pk).update(run_at=timezone.now())
+        with self.assertLogs('taskqueue.queue', 'ERROR'):
+            run_pending()
+        queued.refresh_from_db()
+        self.assertEqual((queued.status, queued.attempts), ('failed', 2))
+
+    def test_claims_are_exclusive_until_they_time_out(self):
+        queued = record.delay(value=1)
+        first, ids = claim(10, 'a')
+        self.assertEqual(ids, [queued.pk])
+        self.assertEqual(claim(10, 'b')[1], [])
+        # The first worker stalled; its claim is taken over
+        Task.objects.filter(pk=queued.pk).update(claimed_at=timezone.now() - timedelta(hours=1))
+        second, ids = claim(10, 'b')
+        self.assertEqual(ids, [queued.pk])
+        # The stalled worker must not run or finish the task under the new claim
+        self.assertFalse(execute(queued.pk, first))
+        self.assertEqual(calls, [])
+        self.assertTrue(execute(queued.pk, second))
+        self.assertFalse(execute(queued.pk, second))
+        self.assertEqual(calls, [1])
+
+    def test_lost_claims_do_not_finish_the_task(self):
+        queued = record.delay(value=1)
+        token, ids = claim(10, 'a')
+
+        def take_over(value):
+            calls.append(value)
+            # Another worker takes the claim over while this one is running
+            Task.objects.filter(pk=queued.pk).update(claimed_by='b:takeover')
+            User.objects.create(username='rolled-back')
+
+        with mock.patch.dict('taskqueue.queue.registry', {record.task_name: take_over}):
+            self.assertFalse(execute(queued.pk, token))
+        self.assertFalse(User.objects.filter(username='rolled-back').exists())
+        self.assertEqual(Task.objects.get(pk=queued.pk).status, 'running')
+
+    @override_settings(TASKS_EAGER=True)
+    def test_eager_mode_runs_inline(self):
+        self.assertIsNone(record.delay(value=3))
+        self.assertEqual(calls, [3])
+        self.assertFalse(Task.objects.exists())
+
+    def test_side_effects_are_queued(self):
+        response = self.client.post('/api/accounts/register/', {
+            'username': 'new', 'email': 'new@example.com', 'password': 'a-Strong-pass-1',
+            'password_confirm': 'a-Strong-pass-1', 'user_type': 'recruiter',
+        }, content_type='application/json')
+        self.assertEqual(response.status_code, 201)
+        # The profile is part of registration itself, not queued
+        self.assertTrue(RecruiterProfile.objects.filter(user__username='new', company_name='').exists())
+
+        recruiter = User.objects.get(username='new')
+        freelancer = User.objects.create(username='freelancer', user_type='freelancer')
+        job = Job.objects.create(title='Logo', description='A logo', recruiter=recruiter, job_type='fixed',
+                                 category=Category.objects.create(name='Design'),
+                                 experience_level='entry', skills_required='Illustrator')
+        application = Application.objects.create(job=job, freelancer=freelancer, cover_letter='Hi')
+        self.client.force_login(recruiter)
+        response = self.client.post(f'/api/applications/applications/{application.pk}/update_status/',
+                                    {'status': 'accepted'})
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(Job.objects.get(pk=job.pk).status, 'open')
+
+        run_pending()
+        self.assertEqual(Job.objects.get(pk=job.pk).status, 'in_progress')
+        self.assertFalse(Task.objects.exists())
+
+
+class RunWorkerTests(TransactionTestCase):
+    def setUp(self):
+        calls.clear()
+
+    def test_burst_runs_due_tasks_in_a_pool(self):
+        for value in range(5):
+            record.delay(value=value)
+        explode.delay()
+        out = StringIO()
+        # One pool thread: the in-memory test database can't take concurrent writers
+        with self.assertLogs('taskqueue.queue', 'ERROR'):
+            call_command('runworker', burst=True, concurrency=1, poll_interval=0.01, stdout=out)
+        self.assertEqual(sorted(calls), [0, 1, 2, 3, 4])
+        self.assertIn('after 6 tasks (1 failed)', out.getvalue())
+        self.assertEqual(list(Task.objects.values_list('status', flat=True)), ['queued'])
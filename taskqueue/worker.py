@@ -0,0 +1,22 @@
+"""
+Entry points for ``runworker``'s pool. Spawned worker processes import this
+module before Django is set up, so it must not import models at load time.
+"""
+import django
+
+
+def setup_process():
+    django.setup()
+
+
+def run(task_id, token):
+    from django.db import close_old_connections
+    from .queue import execute
+
+    # Pool threads and processes hold their own connections; recycle them
+    # the way request handling does
+    close_old_connections()
+    try:
+        return execute(task_id, token)
+    finally:
+        close_old_connections()